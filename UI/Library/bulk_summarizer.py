@@ -0,0 +1,214 @@
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import threading
+import subprocess
+import aiohttp
+import openai
+
+try:
+    from Library.snapshot_store import DATA_DIR, snapshot_lock, list_entries, read_entry_comments, comment_video_ids
+    from Library.summary_cache import SummaryStore, summary_db_path, summary_key
+    from Library.comments_summarizer import (SUMMARY_MODEL, PROMPT_VERSION, pick_comments,
+                                             build_prompt, parse_summary)
+    from Library.openai_client import openai_client
+except ImportError:
+    from snapshot_store import DATA_DIR, snapshot_lock, list_entries, read_entry_comments, comment_video_ids
+    from summary_cache import SummaryStore, summary_db_path, summary_key
+    from comments_summarizer import (SUMMARY_MODEL, PROMPT_VERSION, pick_comments,
+                                     build_prompt, parse_summary)
+    from openai_client import openai_client
+
+# 동시에 보내는 요청 수 / 초당 요청 수 / 재시도 횟수 기본값
+CONCURRENCY = 8
+REQUESTS_PER_SEC = 3.0
+MAX_RETRIES = 5
+BACKOFF_BASE_SEC = 1.0
+BACKOFF_MAX_SEC = 30.0
+REQUEST_TIMEOUT_SEC = 60
+
+# 잠시 뒤 다시 보내면 성공할 수 있는 오류 (인증/요청 형식 오류는 재시도하지 않음)
+RETRYABLE_ERRORS = (
+    openai.error.RateLimitError,
+    openai.error.APIError,
+    openai.error.APIConnectionError,
+    openai.error.ServiceUnavailableError,
+    openai.error.Timeout,
+    openai.error.TryAgain,
+    asyncio.TimeoutError,
+)
+
+_lock = threading.Lock()
+# 실행 중인 일괄 요약 프로세스
+_presummarize = {'process': None}
+
+
+class TokenBucket:
+    """
+    초당 rate 개씩 토큰이 차는 버킷 (한 이벤트 루프 안에서만 사용)
+
+    Parameters:
+        rate (float): 초당 허용 요청 수
+        capacity (float): 한 번에 몰아 보낼 수 있는 최대 요청 수 (기본값 rate)
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+async def openai_acomplete(video_id, model, comments):
+    """비동기 OpenAI ChatCompletion 으로 요약 생성 (presummarize_snapshot 의 기본 complete 함수)"""
+    response = await openai.ChatCompletion.acreate(
+        model=model,
+        messages=[{"role": "user", "content": build_prompt(video_id, comments)}],
+        temperature=0.3,
+        request_timeout=REQUEST_TIMEOUT_SEC,
+        **openai_client.request_kwargs()
+    )
+    return parse_summary(response['choices'][0]['message']['content'])
+
+
+def collect_jobs(store, model=SUMMARY_MODEL, data_dir=DATA_DIR):
+    """
+    스냅샷의 댓글 테이블에서 아직 저장된 요약이 없는 영상 목록 수집
+
+    같은 영상이 여러 카테고리에 있어도 요약에 넣을 댓글이 같으면 한 번만 요약
+
+    Returns:
+        Tuple[List[Tuple[tuple, str, List[str]]], int]: (키, video_id, 댓글) 목록, 이미 저장된 영상 수
+    """
+    jobs = {}
+    cached = set()
+    for entry in list_entries('comments', data_dir):
+        for video_id in comment_video_ids(entry, data_dir):
+            comments, _ = pick_comments(read_entry_comments(entry, video_id, data_dir), video_id)
+            if comments is None:
+                continue
+            key = summary_key(video_id, comments, model, PROMPT_VERSION)
+            if key in jobs or key in cached:
+                continue
+            if store.get(key) is not None:
+                cached.add(key)
+            else:
+                jobs[key] = (key, video_id, comments)
+    return list(jobs.values()), len(cached)
+
+
+async def _summarize_all(jobs, store, model, complete, concurrency, rate, max_retries):
+    semaphore = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(rate)
+    counts = {'summarized': 0, 'failed': 0, 'retries': 0}
+
+    async def run(key, video_id, comments):
+        async with semaphore:
+            for attempt in range(max_retries + 1):
+                await bucket.acquire()
+                try:
+                    result = await complete(video_id, model, comments)
+                except RETRYABLE_ERRORS as e:
+                    if attempt == max_retries:
+                        print(f"[presummarize] {video_id} 실패 ({attempt + 1}회 시도): {e}")
+                        counts['failed'] += 1
+                        return
+                    counts['retries'] += 1
+                    # 지수 백오프 + 지터 (동시에 실패한 요청들이 같은 순간에 몰리지 않게 함)
+                    await asyncio.sleep(min(BACKOFF_MAX_SEC, BACKOFF_BASE_SEC * 2 ** attempt) * random.uniform(0.5, 1.0))
+                    continue
+                except Exception as e:
+                    print(f"[presummarize] {video_id} 실패: {e}")
+                    counts['failed'] += 1
+                    return
+                store.put(key, tuple(result))
+                counts['summarized'] += 1
+                return
+
+    # 요청마다 세션을 새로 만들지 않도록 openai 비동기 요청이 쓸 세션을 하나로 고정
+    async with aiohttp.ClientSession() as session:
+        openai.aiosession.set(session)
+        await asyncio.gather(*(run(*job) for job in jobs))
+    return counts
+
+
+def presummarize_snapshot(data_dir=DATA_DIR, model=SUMMARY_MODEL, concurrency=CONCURRENCY, rate=REQUESTS_PER_SEC,
+                          max_retries=MAX_RETRIES, complete=None, store=None):
+    """
+    현재 스냅샷의 모든 영상 댓글을 미리 요약해서 요약 저장소에 기록 (대시보드는 저장된 요약만 읽으면 됨)
+
+    Parameters:
+        data_dir (str): 데이터 폴더
+        model (str): 요약 모델
+        concurrency (int): 동시에 보내는 요청 수 상한
+        rate (float): 초당 요청 수 상한 (토큰 버킷, 재시도 포함)
+        max_retries (int): 재시도 가능한 오류의 최대 재시도 횟수
+        complete (Callable[[str, str, List[str]], Awaitable[Tuple[str, int, int]]]): 비동기 요약 함수 (기본값 OpenAI)
+        store (SummaryStore): 요약 저장소 (기본값 스냅샷 폴더의 파일)
+
+    Returns:
+        dict: 처리 결과와 처리량 (videos_per_min)
+    """
+    store = store or SummaryStore(summary_db_path(data_dir))
+    start = time.perf_counter()
+    jobs, cached = collect_jobs(store, model, data_dir)
+    collect_sec = time.perf_counter() - start
+    print(f"[presummarize] {len(jobs)} videos to summarize ({cached} already stored)")
+
+    start = time.perf_counter()
+    counts = asyncio.run(_summarize_all(jobs, store, model, complete or openai_acomplete,
+                                        concurrency, rate, max_retries)) if jobs else {'summarized': 0, 'failed': 0, 'retries': 0}
+    elapsed = time.perf_counter() - start
+
+    report = dict(counts, videos=len(jobs) + cached, cached=cached,
+                  collect_sec=round(collect_sec, 3), elapsed_sec=round(elapsed, 3),
+                  videos_per_min=round(counts['summarized'] / elapsed * 60, 1) if elapsed > 0 else 0.0)
+    print(f"[presummarize] {report}")
+    return report
+
+
+def presummarize_async(data_dir=DATA_DIR):
+    """
+    일괄 요약을 별도 프로세스로 시작하고 바로 반환
+
+    Returns:
+        bool: 새로 시작했으면 True, 이미 실행 중이면 False
+    """
+    with _lock:
+        process = _presummarize['process']
+        if process is not None and process.poll() is None:
+            return False
+        _presummarize['process'] = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--data-dir', data_dir])
+    return True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='현재 스냅샷의 영상별 댓글 요약을 미리 생성')
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--model', default=SUMMARY_MODEL)
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=REQUESTS_PER_SEC, help='초당 요청 수 상한')
+    parser.add_argument('--max-retries', type=int, default=MAX_RETRIES)
+    parser.add_argument('--api-base', default=None, help='completion 서버 주소 (예: 로컬 모의 서버)')
+    parser.add_argument('--api-key', default=None)
+    args = parser.parse_args()
+
+    openai_client.configure(api_key=args.api_key, api_base=args.api_base)
+    openai_client.api_key()
+    # 다른 워커가 시작한 일괄 요약이 있으면 끝난 뒤 저장되지 않은 영상만 요약
+    with snapshot_lock('summaries', args.data_dir):
+        presummarize_snapshot(args.data_dir, args.model, args.concurrency, args.rate, args.max_retries)
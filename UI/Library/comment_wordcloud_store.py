@@ -0,0 +1,249 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from Library.snapshot_store import (DATA_DIR, snapshot_dir, snapshot_lock, find_entry, list_entries,
+                                        read_entry_comments, comment_video_ids)
+    from Library.word_visualization import comment_word_frequencies, render_word_cloud_png, png_data_url
+    from Library.wordcloud_cache import frequencies_digest
+except ImportError:
+    from snapshot_store import (DATA_DIR, snapshot_dir, snapshot_lock, find_entry, list_entries,
+                                read_entry_comments, comment_video_ids)
+    from word_visualization import comment_word_frequencies, render_word_cloud_png, png_data_url
+    from wordcloud_cache import frequencies_digest
+
+# 스냅샷 디렉터리 아래 댓글 워드클라우드 저장 위치
+WORDCLOUD_DIRNAME = 'wordclouds'
+# 새 탭에서 보여주는 댓글 워드클라우드 크기/단어 수 (generate_Comments_WC 기본값과 같음)
+COMMENT_WC_SIZE = (800, 800)
+COMMENT_WC_MAX_WORDS = 200
+# 렌더링 방식이 바뀌면 올려서 이전 이미지를 재사용하지 않게 함
+RENDER_VERSION = 1
+# 프로세스 풀에 한 번에 넘기는 영상 수
+VIDEOS_PER_TASK = 16
+
+_lock = threading.Lock()
+# 실행 중인 미리 렌더링 프로세스와, 실행 중에 새 스냅샷이 발행됐는지 여부
+_prerender = {'process': None, 'rerun': False}
+_map_cache = {}
+
+
+def _reset_after_fork():
+    # fork 한 워커에는 부모의 감시 스레드가 없고 부모가 띄운 프로세스는 기다릴 수 없으므로 상태를 새로 시작
+    global _lock
+    _lock = threading.Lock()
+    _prerender.update(process=None, rerun=False)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def store_dir(data_dir=DATA_DIR):
+    return os.path.join(snapshot_dir(data_dir), WORDCLOUD_DIRNAME)
+
+
+def image_key(word_freq, image_Size=COMMENT_WC_SIZE, Max_words=COMMENT_WC_MAX_WORDS):
+    """이미지 내용 주소: 토큰 가중치 + 렌더링 옵션이 같으면 같은 키"""
+    options = f"{image_Size[0]}x{image_Size[1]}:{Max_words}:{RENDER_VERSION}"
+    return hashlib.sha1(f"{frequencies_digest(word_freq)}:{options}".encode('utf-8')).hexdigest()
+
+
+def _image_path(key, data_dir=DATA_DIR):
+    return os.path.join(store_dir(data_dir), key[:2], f"{key}.png")
+
+
+def _map_path(entry, data_dir=DATA_DIR):
+    """댓글 테이블(Arrow 파일명에 내용 해시 포함)별 video_id -> 이미지 키 목록"""
+    return os.path.join(store_dir(data_dir), f"{os.path.splitext(entry['file'])[0]}.json")
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _render_videos(entry, video_ids, image_Size, Max_words, data_dir):
+    """
+    (워커 프로세스) 영상별 댓글 워드클라우드를 렌더링해 저장
+
+    Returns:
+        Tuple[str, dict]: 댓글 테이블 파일명, video_id -> 이미지 키 (단어가 없으면 None)
+    """
+    keys = {}
+    for video_id in video_ids:
+        try:
+            word_freq = comment_word_frequencies(read_entry_comments(entry, video_id, data_dir), video_id)
+            if not word_freq:
+                keys[video_id] = None
+                continue
+            key = image_key(word_freq, image_Size, Max_words)
+            path = _image_path(key, data_dir)
+            # 내용이 같은 이미지가 이미 있으면 (이전 배치와 댓글이 같은 영상) 다시 그리지 않음
+            if not os.path.exists(path):
+                _write_atomic(path, render_word_cloud_png(word_freq, image_Size, Max_words))
+            keys[video_id] = key
+        except Exception as e:
+            print(f"[wordcloud] {entry['file']} {video_id} 렌더링 실패: {str(e)}")
+            keys[video_id] = None
+    return entry['file'], keys
+
+
+def prerender_comment_clouds(data_dir=DATA_DIR, workers=None, image_Size=COMMENT_WC_SIZE,
+                             Max_words=COMMENT_WC_MAX_WORDS):
+    """
+    현재 스냅샷의 모든 영상 댓글 워드클라우드를 프로세스 풀로 미리 렌더링
+
+    이미 목록 파일이 있는 댓글 테이블(내용이 바뀌지 않은 테이블)은 건너뜀
+
+    Parameters:
+        workers (int): 워커 프로세스 수 (기본값: CPU 코어 수)
+
+    Returns:
+        dict: 렌더링한 테이블/영상 수와 소요 시간
+    """
+    start = time.time()
+    entries = {entry['file']: entry for entry in list_entries('comments', data_dir)
+               if not os.path.exists(_map_path(entry, data_dir))}
+    tasks = []
+    for entry in entries.values():
+        video_ids = comment_video_ids(entry, data_dir)
+        for i in range(0, len(video_ids), VIDEOS_PER_TASK):
+            tasks.append((entry, video_ids[i:i + VIDEOS_PER_TASK], image_Size, Max_words, data_dir))
+
+    results = {name: {} for name in entries}
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            for name, keys in pool.map(_render_videos, *zip(*tasks)):
+                results[name].update(keys)
+
+    for name, keys in results.items():
+        _write_atomic(_map_path(entries[name], data_dir), json.dumps(keys).encode('utf-8'))
+    _remove_stale_images(data_dir)
+
+    stats = {
+        'tables': len(results),
+        'videos': sum(len(keys) for keys in results.values()),
+        'elapsed_sec': round(time.time() - start, 3),
+    }
+    print(f"[wordcloud] comment word clouds pre-rendered: {stats}")
+    return stats
+
+
+def _remove_stale_images(data_dir=DATA_DIR):
+    """현재 댓글 테이블 목록에서 참조하지 않는 목록 파일과 이미지를 삭제"""
+    live_maps = {_map_path(entry, data_dir) for entry in list_entries('comments', data_dir)}
+    referenced = set()
+    os.makedirs(store_dir(data_dir), exist_ok=True)
+    for name in os.listdir(store_dir(data_dir)):
+        path = os.path.join(store_dir(data_dir), name)
+        if not name.endswith('.json'):
+            continue
+        if path not in live_maps:
+            os.remove(path)
+            _map_cache.pop(path, None)
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            referenced.update(key for key in json.load(f).values() if key)
+
+    for root, _, files in os.walk(store_dir(data_dir)):
+        for name in files:
+            if name.endswith('.png') and name[:-len('.png')] not in referenced:
+                os.remove(os.path.join(root, name))
+
+
+def prerender_async(data_dir=DATA_DIR, workers=None):
+    """
+    미리 렌더링 단계를 별도 프로세스로 시작하고 바로 반환
+
+    대시보드 프로세스(스레드 다수)에서 워커를 fork 하지 않도록 새 인터프리터에서 프로세스 풀을 띄우며,
+    앱 종료도 막지 않음. 실행 중에 새 스냅샷이 발행되면 끝난 뒤 한 번 더 실행
+    (이미 렌더링한 테이블은 건너뛰므로 다시 실행해도 바뀐 테이블만 그림)
+
+    Returns:
+        bool: 새로 시작했으면 True, 실행 중이라 재실행으로 예약했으면 False
+    """
+    with _lock:
+        if _prerender['process'] is not None:
+            _prerender['rerun'] = True
+            return False
+        _prerender['process'] = _start_prerender(data_dir, workers)
+    threading.Thread(target=_watch_prerender, args=(data_dir, workers), daemon=True,
+                     name='comment-wordcloud').start()
+    return True
+
+
+def _start_prerender(data_dir, workers):
+    command = [sys.executable, os.path.abspath(__file__), '--data-dir', data_dir]
+    if workers:
+        command += ['--workers', str(workers)]
+    return subprocess.Popen(command)
+
+
+def _watch_prerender(data_dir, workers):
+    while True:
+        returncode = _prerender['process'].wait()
+        if returncode != 0:
+            print(f"[wordcloud] pre-render process exited with {returncode}")
+        with _lock:
+            if not _prerender['rerun']:
+                _prerender['process'] = None
+                return
+            _prerender['rerun'] = False
+            _prerender['process'] = _start_prerender(data_dir, workers)
+
+
+def _load_map(entry, data_dir=DATA_DIR):
+    path = _map_path(entry, data_dir)
+    keys = _map_cache.get(path)
+    if keys is None:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                keys = json.load(f)
+        except FileNotFoundError:
+            return None
+        _map_cache[path] = keys
+    return keys
+
+
+def load_comment_cloud(country, category, video_id, data_dir=DATA_DIR):
+    """
+    미리 렌더링된 댓글 워드클라우드 반환
+
+    Returns:
+        Tuple[bool, str | None]: (미리 렌더링 여부, base64 PNG data URL)
+            렌더링 전이면 (False, None), 댓글에 단어가 없으면 (True, None)
+    """
+    entry = find_entry(country, category, 'comments', data_dir)
+    if entry is None:
+        return False, None
+    keys = _load_map(entry, data_dir)
+    if keys is None or video_id not in keys:
+        return False, None
+    if keys[video_id] is None:
+        return True, None
+    try:
+        with open(_image_path(keys[video_id], data_dir), 'rb') as f:
+            return True, png_data_url(f.read())
+    except OSError:
+        return False, None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='현재 스냅샷의 영상별 댓글 워드클라우드 미리 렌더링')
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    # 워커마다 띄운 렌더링 프로세스는 차례로 실행 (앞 프로세스가 그린 테이블은 건너뜀)
+    with snapshot_lock('wordclouds', args.data_dir):
+        prerender_comment_clouds(args.data_dir, args.workers)
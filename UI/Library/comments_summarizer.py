@@ -1,72 +1,78 @@
-import pandas as pd
 import openai
 import re
 try:
-    from Library.word_visualization import read_file 
+    from Library.snapshot_store import read_comments
+    from Library.summary_cache import SummaryCache
+    from Library.summary_jobs import SummaryJobQueue
+    from Library.openai_client import openai_client, ApiKeyError
 except ImportError:
-    from word_visualization import read_file
+    from snapshot_store import read_comments
+    from summary_cache import SummaryCache
+    from summary_jobs import SummaryJobQueue
+    from openai_client import openai_client, ApiKeyError
 
 def load_api_key():
-    try:
-        path = "./../../../LG_bootcamp_openai_api_key.txt"
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read().strip()
-    except:
-        path = "./../../../../LG_bootcamp_openai_api_key.txt"
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read().strip()
+    """API key (환경변수 OPENAI_API_KEY 또는 key 파일, 처음 한 번만 읽음)"""
+    return openai_client.api_key()
 
 
+SUMMARY_MODEL = "gpt-3.5-turbo"
+# 프롬프트나 점수 파싱 방식을 바꾸면 올려서 저장된 요약을 무효화
+PROMPT_VERSION = 1
+MAX_SUMMARY_COMMENTS = 10
 
-def summarize_youtube_comments_by_id(video_id, country = "KR", category = "all"):
-    """
-    특정 YouTube video_id에 대한 댓글 요약 및 감정 점수 추정 함수
+SCORE_PATTERN = re.compile(r'긍정\s*[:：]\s*(\d+)\s*/\s*부정\s*[:：]\s*(\d+)')
+SCORE_TEXT_PATTERN = re.compile(r'\(?\s*긍정\s*[:：]\s*\d+\s*/\s*부정\s*[:：]\s*\d+\s*\)?')
 
-    Parameters:
-        csv_path (str): 댓글이 저장된 CSV 파일 경로
-        target_video_id (str): 요약할 YouTube 영상의 video_id
+
+def select_comments(video_id, country="KR", category="all"):
+    """
+    요약에 넣을 댓글 선택 (10자 넘는 댓글 앞에서부터 최대 10개)
 
     Returns:
-        Tuple[str, int, int]: 요약 텍스트, 긍정 점수, 부정 점수
+        Tuple[List[str] | None, str | None]: 댓글 목록, 실패 시 (None, 오류 메시지)
     """
     try:
-        openai.api_key = load_api_key()
-        # openai.api_key = "경로 지정이 힘들면 그냥 여기서 API key를 입력"
-
+        df = read_comments(country, category, video_id)
     except Exception as e:
-        print(f"api key가 없는거 같습니다 :{e}")
-        return "gpt api Key가 없습니다", -1, -1
+        return None, f"- CSV 파일 로딩 실패: {str(e)}"
 
-    csv_path, _ = read_file(country, category, type = "comments")
-    try:
-        df = pd.read_csv(csv_path,
-            engine='python',
-            encoding='utf-8',
-            on_bad_lines='skip'
-            )
+    return pick_comments(df, video_id)
 
-        if "comment_text" not in df.columns or "video_id" not in df.columns:
-            print("CSV에 'comment_text', 'video_id' 열이 필요합니다.")
-            return None, -1, -1
 
-        df = df[['video_id', 'comment_text']].dropna()
+def pick_comments(df, video_id):
+    """
+    영상 댓글 테이블에서 요약에 넣을 댓글 선택 (select_comments 참고)
 
-    except Exception as e:
-        return f"- CSV 파일 로딩 실패: {str(e)}", -1, -1
+    Parameters:
+        df (pd.DataFrame | None): 해당 영상의 댓글 (read_comments / read_entry_comments 결과)
+        video_id (str): 영상 id
+    """
+    if df is None:
+        return None, "- 댓글 데이터가 없습니다."
+
+    if "comment_text" not in df.columns or "video_id" not in df.columns:
+        print("CSV에 'comment_text', 'video_id' 열이 필요합니다.")
+        return None, None
 
+    df = df[['video_id', 'comment_text']].dropna()
     filtered_df = df[df['video_id'] == video_id]
 
     if filtered_df.empty:
-        return "- 해당 video_id에 대한 댓글이 없습니다.", -1, -1
+        return None, "- 해당 video_id에 대한 댓글이 없습니다."
 
-    comments = [c.strip() for c in filtered_df['comment_text'].values if isinstance(c, str) and len(c.strip()) > 10][:10]
+    comments = [c.strip() for c in filtered_df['comment_text'].values if isinstance(c, str) and len(c.strip()) > 10][:MAX_SUMMARY_COMMENTS]
 
     if not comments:
-        return "- 요약할 충분한 댓글이 없습니다.", -1, -1
+        return None, "- 요약할 충분한 댓글이 없습니다."
 
+    return comments, None
+
+
+def build_prompt(video_id, comments):
     comment_block = "\n".join(comments)
 
-    prompt = f"""
+    return f"""
 아래는 YouTube 영상 하나에 달린 여러 댓글입니다. 이 댓글들을 참고하여 시청자들의 반응을 3줄 이내로 요약해 주세요.
 
 또한 전체 댓글의 분위기를 감안하여 긍정/부정 점수를 100점 만점 기준으로 추산해 주세요.
@@ -79,33 +85,88 @@ def summarize_youtube_comments_by_id(video_id, country = "KR", category = "all")
 요약:
 -
 """
-    try:
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
-        )
-        content = response['choices'][0]['message']['content'].strip()
 
-        # 정규식으로 점수 추출
-        match = re.search(r'긍정\s*[:：]\s*(\d+)\s*/\s*부정\s*[:：]\s*(\d+)', content)
 
-        # 추출한 내용 content에서 제거
-        if match:
-            content_cleaned = re.sub(r'\(?\s*긍정\s*[:：]\s*\d+\s*/\s*부정\s*[:：]\s*\d+\s*\)?', '', content).strip()
-        else:
-            content_cleaned = content
+def parse_summary(content):
+    """
+    응답 본문에서 점수를 뽑고 본문에서는 점수 표기를 제거
+
+    Returns:
+        Tuple[str, int, int]: 요약 텍스트, 긍정 점수, 부정 점수 (점수 추출 실패 시 -1, -1)
+    """
+    content = content.strip()
+
+    # 정규식으로 점수 추출
+    match = SCORE_PATTERN.search(content)
+    if not match:
+        return content, -1, -1
+
+    # 추출한 내용 content에서 제거
+    content_cleaned = SCORE_TEXT_PATTERN.sub('', content).strip()
+    return content_cleaned, int(match.group(1)), int(match.group(2))
 
-        if match:
-            pos_score, neg_score = int(match.group(1)), int(match.group(2))
-        else:
-            pos_score, neg_score = -1, -1  # 점수 추출 실패
 
-        return content_cleaned, pos_score, neg_score
+def openai_complete(video_id, model, comments):
+    """OpenAI ChatCompletion 으로 요약 생성 (SummaryCache 의 기본 complete 함수)"""
+    # 인증 정보와 연결 풀은 openai_client 가 한 번만 준비 (API key 는 OPENAI_API_KEY 환경변수로도 지정 가능)
+    response = openai.ChatCompletion.create(
+        model=model,
+        messages=[{"role": "user", "content": build_prompt(video_id, comments)}],
+        temperature=0.3,
+        **openai_client.request_kwargs()
+    )
+    return parse_summary(response['choices'][0]['message']['content'])
+
+
+# 요약은 영상/댓글/모델/프롬프트 버전 단위로 스냅샷 폴더의 SQLite 에 저장되어 사용자와 재시작 사이에 재사용됨
+summary_cache = SummaryCache(complete=openai_complete, prompt_version=PROMPT_VERSION)
+
+
+def summarize_youtube_comments_by_id(video_id, country = "KR", category = "all", model = SUMMARY_MODEL):
+    """
+    특정 YouTube video_id에 대한 댓글 요약 및 감정 점수 추정 함수 (저장된 요약이 있으면 API 를 호출하지 않음)
+
+    Parameters:
+        video_id (str): 요약할 YouTube 영상의 video_id
+        country (str): 국가 코드
+        category (str): 카테고리
+        model (str): 요약에 쓸 모델
+
+    Returns:
+        Tuple[str, int, int]: 요약 텍스트, 긍정 점수, 부정 점수
+    """
+    comments, error = select_comments(video_id, country, category)
+    if comments is None:
+        return error, -1, -1
+
+    try:
+        return summary_cache.summarize(video_id, comments, model)
+
+    except ApiKeyError as e:
+        print(f"api key가 없는거 같습니다 :{e}")
+        return "gpt api Key가 없습니다", -1, -1
 
     except Exception as e:
         return f"- 요약 실패: {str(e)}", -1, -1
 
+
+def cached_summary(video_id, country = "KR", category = "all", model = SUMMARY_MODEL):
+    """
+    API 를 호출하지 않고 바로 돌려줄 수 있는 결과 조회 (저장된 요약 또는 댓글이 없다는 안내)
+
+    Returns:
+        Tuple[str, int, int] | None: 요약 텍스트, 긍정 점수, 부정 점수 (API 호출이 필요하면 None)
+    """
+    comments, error = select_comments(video_id, country, category)
+    if comments is None:
+        return error, -1, -1
+    return summary_cache.cached(video_id, comments, model)
+
+
+# 요약 버튼 클릭은 여기에 작업만 등록하고, 실제 API 호출은 작업 스레드에서 수행
+# 작업 상태는 요약 저장소(SQLite)에도 기록해서 gunicorn 워커 어디로 폴링이 가도 조회됨
+summary_jobs = SummaryJobQueue(summarize_youtube_comments_by_id, job_store=lambda: summary_cache.store)
+
 if __name__ == '__main__':
     result = summarize_youtube_comments_by_id("Qhz2L8WzgIw", country = "KR", category = "all")
     print(result)
\ No newline at end of file
@@ -0,0 +1,320 @@
+import os
+import json
+import time
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# /refresh/status 로 조회할 수 있는 최근 세대 상태 수
+STATUS_HISTORY = 20
+# 원본(스냅샷) 버전 확인 간격(초)
+VERSION_CHECK_SEC = 2.0
+# 아직 버전을 모르는 (빌드가 끝나지 않은) refresh 요청의 상태 키
+PENDING_KEY = 'pending'
+
+
+class DatasetGeneration:
+    """
+    한 번 발행되면 바뀌지 않는 데이터셋 세대
+
+    콜백은 시작할 때 holder.current() 로 세대를 하나 잡고 끝까지 그 세대만 읽음
+    """
+
+    def __init__(self, generation_id, **parts):
+        object.__setattr__(self, 'generation_id', generation_id)
+        object.__setattr__(self, 'created_at', time.time())
+        for name, value in parts.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DatasetGeneration은 읽기 전용입니다.")
+
+
+class MemoryStatusStore:
+    """
+    refresh 상태를 프로세스 메모리에만 두는 저장소 (기본값)
+
+    상태는 {'latest': 키, 'statuses': {키: 상태}} 형식이고, 키는 세대를 만든 원본 버전
+    (버전 함수가 없으면 홀더의 세대 id) 또는 빌드 중인 요청의 PENDING_KEY
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {'latest': None, 'statuses': {}}
+
+    def update(self, change):
+        with self._lock:
+            change(self._data)
+
+    def read(self):
+        with self._lock:
+            return json.loads(json.dumps(self._data))
+
+
+class FileStatusStore:
+    """
+    refresh 상태를 JSON 파일로 공유하는 저장소 (gunicorn 워커 어디서 조회해도 같은 상태를 돌려줌)
+
+    Parameters:
+        path (str): 상태 파일 경로
+        lock (Callable[[], ContextManager]): 파일을 고치는 동안 잡을 프로세스 간 락
+    """
+
+    def __init__(self, path, lock):
+        self.path = path
+        self._file_lock = lock
+
+    def update(self, change):
+        with self._file_lock():
+            data = self.read()
+            change(data)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {'latest': None, 'statuses': {}}
+
+
+class DatasetHolder:
+    """
+    백그라운드에서 새 세대를 만들고 검증한 뒤 포인터 교체 한 번으로 발행하는 홀더
+
+    /refresh 상태는 세대를 만든 원본 버전(스냅샷 manifest generation)을 키로 status_store 에 기록하므로
+    FileStatusStore 를 쓰면 빌드하지 않은 프로세스도 같은 상태를 조회할 수 있음
+
+    Parameters:
+        builder (Callable[[], dict]): 세대를 구성할 데이터(이름 -> 값)를 만드는 함수
+        validator (Callable[[DatasetGeneration], None]): 발행 전 검증, 실패 시 예외
+        on_publish (Callable[[DatasetGeneration], None]): 발행 직후 호출되는 훅 (프로세스마다 세대를 발행할 때마다 호출)
+        on_refresh (Callable[[DatasetGeneration], None]): refresh_async() 요청으로 만든 세대가 발행된 직후에만 호출되는 훅
+            (시작 시 load 와 refresh_if_changed 가 다른 프로세스를 따라 만든 세대에서는 호출하지 않으므로
+            프로세스 하나에서만 돌면 되는 작업에 사용)
+        version (Callable[[], object]): 원본 데이터 버전 (다른 프로세스가 원본을 갱신했는지 확인할 때 사용)
+        check_interval (float): refresh_if_changed 가 버전을 다시 확인하는 최소 간격(초)
+        status_store (MemoryStatusStore): refresh 상태 저장소 (기본값 프로세스 메모리)
+    """
+
+    def __init__(self, builder, validator=None, on_publish=None, version=None, check_interval=VERSION_CHECK_SEC,
+                 status_store=None, on_refresh=None):
+        self._builder = builder
+        self._validator = validator
+        self._on_publish = on_publish
+        self._on_refresh = on_refresh
+        self._version = version
+        self.check_interval = check_interval
+        self._status_store = status_store or MemoryStatusStore()
+        self._next_check = 0.0
+        self._requested_version = None
+        self._current = None
+        self._lock = threading.Lock()
+        self._executor = None
+        self._next_id = 0
+        self._pending_id = None
+        self._rerun_id = None
+        # 홀더 안의 빌드 요청 상태 (세대 id -> 상태), 대기/재실행 판단에만 사용
+        self._status = {}
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self):
+        # 발행된 세대는 그대로 물려받고, 부모의 빌드 스레드/락 상태는 버림 (스레드 풀은 처음 refresh 때 새로 만듦)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending_id = None
+        self._rerun_id = None
+
+    def current(self):
+        return self._current
+
+    def load(self):
+        """시작 시 첫 세대를 동기로 만들어 발행"""
+        with self._lock:
+            self._next_id += 1
+            generation_id = self._next_id
+            self._remember(generation_id, 'building', shared=True)
+        if not self._build_and_publish(generation_id, requested=False):
+            raise ValueError(self._status[generation_id].get('error', 'dataset load failed'))
+        return self._current
+
+    def refresh_async(self, shared=True):
+        """
+        새 세대 빌드를 예약하고 바로 반환
+
+        이미 빌드 대기 중인 세대가 있으면 그 세대 id 를 돌려주고, 빌드 중이면
+        끝난 뒤 빌드할 다음 세대를 하나 예약해서 그 사이에 떨어진 데이터도 반영함
+
+        Parameters:
+            shared (bool): 상태를 status_store 에 기록할지 여부 (refresh_if_changed 가 따라 만드는 세대는 기록하지 않음)
+
+        Returns:
+            int: 홀더 안의 세대 id
+        """
+        with self._lock:
+            if self._pending_id is not None:
+                if self._status[self._pending_id]['state'] == 'queued':
+                    return self._mark_shared(self._pending_id, shared)
+                if self._rerun_id is None:
+                    self._next_id += 1
+                    self._rerun_id = self._next_id
+                    self._remember(self._rerun_id, 'queued', shared)
+                return self._mark_shared(self._rerun_id, shared)
+
+            self._next_id += 1
+            generation_id = self._next_id
+            self._pending_id = generation_id
+            self._remember(generation_id, 'queued', shared)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dataset-refresh')
+            self._executor.submit(self._run_refresh, generation_id)
+            return generation_id
+
+    def refresh_if_changed(self):
+        """
+        원본 버전이 현재 세대를 만들 때와 달라졌으면 새 세대 빌드를 예약
+
+        gunicorn 워커처럼 프로세스가 여러 개일 때 /refresh 를 받지 않은 프로세스도
+        다른 프로세스가 갱신한 스냅샷을 따라가도록 요청마다 호출 (check_interval 초에 한 번만 확인)
+
+        Returns:
+            int | None: 예약한 세대 id, 바뀌지 않았으면 None
+        """
+        now = time.monotonic()
+        if self._version is None or now < self._next_check:
+            return None
+        self._next_check = now + self.check_interval
+        current = self._current
+        if current is None or self._pending_id is not None:
+            return None
+        # 같은 버전으로 빌드가 실패했으면 원본이 다시 바뀔 때까지 재시도하지 않음
+        version = self._version()
+        if version in (current.source_version, self._requested_version):
+            return None
+        self._requested_version = version
+        print(f"[dataset] source changed since generation {current.generation_id}, refreshing")
+        return self.refresh_async(shared=False)
+
+    def status(self, generation=None):
+        """
+        refresh 상태 조회
+
+        Parameters:
+            generation: 원본 버전 (생략하면 빌드 중인 요청, 없으면 가장 최근에 끝난 요청)
+
+        Returns:
+            dict: state ('queued' | 'building' | 'published' | 'failed' | 'unknown'), generation (원본 버전),
+                current_generation (이 프로세스가 발행한 세대의 원본 버전) 등
+        """
+        data = self._status_store.read()
+        if generation is None:
+            key = PENDING_KEY if PENDING_KEY in data['statuses'] else data['latest']
+        else:
+            key = str(generation)
+        status = dict(data['statuses'].get(key, {'state': 'unknown', 'generation': generation}))
+        status.setdefault('generation', None)
+        current = self._current
+        status['current_generation'] = self._generation_key(current) if current else None
+        return status
+
+    def _generation_key(self, generation):
+        # 원본 버전을 모르면 (버전 함수가 없는 홀더) 홀더의 세대 id 를 대신 사용
+        version = generation.source_version
+        return version if version is not None else generation.generation_id
+
+    def _remember(self, generation_id, state, shared):
+        self._status[generation_id] = {'state': state, 'requested_at': time.time(), 'shared': shared}
+        for old_id in sorted(self._status)[:-STATUS_HISTORY]:
+            del self._status[old_id]
+        if shared:
+            self._share_pending(generation_id)
+
+    def _mark_shared(self, generation_id, shared):
+        status = self._status[generation_id]
+        if shared and not status['shared']:
+            status['shared'] = True
+            self._share_pending(generation_id)
+        return generation_id
+
+    def _share_pending(self, generation_id):
+        status = self._status[generation_id]
+        pending = {'state': status['state'], 'requested_at': status['requested_at'], 'generation': None}
+        self._status_store.update(lambda data: data['statuses'].__setitem__(PENDING_KEY, pending))
+
+    def _share_finished(self, status, key):
+        finished = {name: value for name, value in status.items() if name != 'shared'}
+        finished['generation'] = key
+
+        def change(data):
+            statuses = data['statuses']
+            statuses.pop(PENDING_KEY, None)
+            statuses.pop(str(key), None)
+            statuses[str(key)] = finished
+            for old_key in list(statuses)[:-STATUS_HISTORY]:
+                del statuses[old_key]
+            data['latest'] = str(key)
+        self._status_store.update(change)
+
+    def _run_refresh(self, generation_id):
+        while True:
+            self._build_and_publish(generation_id)
+            with self._lock:
+                if self._rerun_id is None:
+                    self._pending_id = None
+                    return
+                # 빌드 중에 다시 요청이 들어온 경우 예약된 세대로 한 번 더 빌드
+                generation_id = self._rerun_id
+                self._pending_id = generation_id
+                self._rerun_id = None
+
+    def _build_and_publish(self, generation_id, requested=True):
+        with self._lock:
+            status = self._status[generation_id]
+            status['state'] = 'building'
+        if status['shared']:
+            self._share_pending(generation_id)
+        start = time.time()
+        version = None
+        try:
+            parts = self._builder()
+            # 빌드가 원본을 갱신할 수 있으므로 (스냅샷 인제스트) 빌드가 끝난 뒤의 버전을 기록
+            version = self._version() if self._version is not None else None
+            generation = DatasetGeneration(generation_id, source_version=version, **parts)
+            if self._validator is not None:
+                self._validator(generation)
+        except Exception as e:
+            traceback.print_exc()
+            if version is None and self._version is not None:
+                try:
+                    version = self._version()
+                except Exception:
+                    pass
+            status.update(state='failed', error=str(e), finished_at=time.time())
+            print(f"[dataset] generation {generation_id} failed: {str(e)}")
+            if status['shared']:
+                self._share_finished(status, version if version is not None else generation_id)
+            return False
+
+        # 발행은 참조 교체 한 번 (진행 중인 콜백은 이전 세대를 계속 사용)
+        self._current = generation
+        status.update(state='published', build_sec=round(time.time() - start, 3), finished_at=time.time())
+        print(f"[dataset] generation {generation_id} published ({status['build_sec']} sec)")
+        if status['shared']:
+            self._share_finished(status, self._generation_key(generation))
+
+        hooks = [self._on_publish]
+        # refresh_async(shared=True) 로 요청된 세대만 (따라 만든 세대는 shared=False)
+        if requested and status['shared']:
+            hooks.append(self._on_refresh)
+        for hook in hooks:
+            if hook is None:
+                continue
+            try:
+                hook(generation)
+            except Exception:
+                traceback.print_exc()
+        return True
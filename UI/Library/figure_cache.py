@@ -0,0 +1,74 @@
+import json
+import time
+import threading
+
+try:
+    from Library.lru_cache import LRUCache
+except ImportError:
+    from lru_cache import LRUCache
+
+
+class FigureCache:
+    """
+    차트 이름 + 입력값(세대, 국가, 카테고리 등)을 키로 직렬화된 Plotly figure JSON 을 보관하는 캐시
+
+    Parameters:
+        max_entries (int): 보관할 최대 figure 수
+        max_bytes (int): 보관할 figure JSON 의 최대 총 크기
+    """
+
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024):
+        self._cache = LRUCache(max_entries=max_entries, max_bytes=max_bytes,
+                               sizeof=lambda entry: len(entry[0]))
+        self._lock = threading.Lock()
+        self._chart_stats = {}
+
+    def get_or_build(self, chart, key, build):
+        """
+        캐시에 있으면 저장된 figure 를, 없으면 build() 로 만든 figure 를 dict 로 반환
+
+        Parameters:
+            chart (str): 차트 이름 (통계 집계 단위)
+            key (tuple): 차트 입력값
+            build (Callable[[], go.Figure]): figure 생성 함수
+        """
+        start = time.perf_counter()
+        entry = self._cache.get((chart, key))
+        if entry is not None:
+            figure_json, build_sec = entry
+            figure = json.loads(figure_json)
+            self._record(chart, hit=True, saved_sec=build_sec - (time.perf_counter() - start))
+            return figure
+
+        figure_json = build().to_json()
+        build_sec = time.perf_counter() - start
+        self._cache.put((chart, key), (figure_json, build_sec))
+        self._record(chart, hit=False, build_sec=build_sec)
+        return json.loads(figure_json)
+
+    def _record(self, chart, hit, saved_sec=0.0, build_sec=0.0):
+        with self._lock:
+            stats = self._chart_stats.setdefault(chart, {'hits': 0, 'misses': 0, 'build_sec': 0.0, 'saved_sec': 0.0})
+            if hit:
+                stats['hits'] += 1
+                stats['saved_sec'] += max(saved_sec, 0.0)
+            else:
+                stats['misses'] += 1
+                stats['build_sec'] += build_sec
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        with self._lock:
+            charts = {}
+            for chart, stats in self._chart_stats.items():
+                total = stats['hits'] + stats['misses']
+                charts[chart] = {
+                    'hits': stats['hits'],
+                    'misses': stats['misses'],
+                    'hit_ratio': round(stats['hits'] / total, 4) if total else 0.0,
+                    'build_sec': round(stats['build_sec'], 4),
+                    'saved_sec': round(stats['saved_sec'], 4),
+                }
+        return {'cache': self._cache.stats(), 'charts': charts}
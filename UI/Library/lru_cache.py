@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    스레드 안전한 LRU 캐시
+
+    Parameters:
+        max_entries (int): 보관할 최대 항목 수 (넘치면 가장 오래 안 쓴 항목부터 제거)
+        max_bytes (int): 보관할 최대 크기 (sizeof 와 함께 지정)
+        sizeof (Callable[[Any], int]): 값의 크기(byte) 계산 함수
+    """
+
+    def __init__(self, max_entries=128, max_bytes=None, sizeof=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key, value):
+        size = self._sizeof(value) if self._sizeof else 0
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = value
+            self._sizes[key] = size
+            self.bytes += size
+            while len(self._data) > self.max_entries or (
+                    self.max_bytes is not None and self.bytes > self.max_bytes and len(self._data) > 1):
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        del self._data[key]
+        self.bytes -= self._sizes.pop(key)
+
+    def get_or_create(self, key, factory):
+        """캐시에 없으면 factory() 로 만들어 넣음 (계산은 락 밖에서 수행)"""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def discard_where(self, predicate):
+        """predicate(key) 가 참인 항목을 모두 제거"""
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'bytes': self.bytes,
+                'evictions': self.evictions,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            }
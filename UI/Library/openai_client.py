@@ -0,0 +1,129 @@
+import os
+import threading
+import requests
+import openai
+
+# API key 를 찾는 순서: 환경변수 -> 환경변수로 지정한 파일 -> 기존 위치의 key 파일 (작업 디렉터리 기준)
+API_KEY_ENV = 'OPENAI_API_KEY'
+API_KEY_FILE_ENV = 'OPENAI_API_KEY_FILE'
+API_BASE_ENV = 'OPENAI_API_BASE'
+API_KEY_PATHS = (
+    "./../../../LG_bootcamp_openai_api_key.txt",
+    "./../../../../LG_bootcamp_openai_api_key.txt",
+)
+# 연결 풀 크기 (요약 작업 스레드 수 이상)
+POOL_SIZE = 16
+CONNECTION_RETRIES = 2
+
+
+class ApiKeyError(Exception):
+    """API key 를 찾을 수 없음"""
+
+
+class SharedSession(requests.Session):
+    """
+    여러 스레드가 같이 쓰는 세션 (openai 가 부르는 close() 는 무시)
+
+    openai 0.28 은 스레드마다 세션을 만든 시각을 기억했다가 MAX_SESSION_LIFETIME_SECS(180초)가 지나면
+    그 스레드의 세션에 close() 를 부르는데, 공유 세션이면 다른 요약 스레드의 연결 풀까지 비워짐.
+    연결 풀을 실제로 닫을 때는 close_pool() 사용
+    """
+
+    def close(self):
+        pass
+
+    def close_pool(self):
+        super().close()
+
+
+class OpenAIClientProvider:
+    """
+    OpenAI 요청에 쓸 인증 정보와 HTTP 세션을 한 번만 준비해서 여러 스레드가 같이 쓰도록 하는 객체
+
+    - API key 는 처음 요청할 때 한 번 찾아서 보관 (찾지 못하면 다음 요청에서 다시 찾음)
+    - 요청마다 api_key / api_base 를 인자로 넘기므로 전역 openai.api_key 를 바꾸지 않음
+    - 연결 풀이 있는 SharedSession 하나를 openai.requestssession 으로 등록해서 keep-alive 연결을 재사용
+      (openai 가 스레드별 세션 수명(180초)이 지날 때 부르는 close() 는 무시하므로 연결 풀이 주기적으로 비워지지 않음)
+
+    Parameters:
+        api_key (str): 지정하면 환경변수/파일을 찾지 않고 이 값을 사용
+        api_base (str): completion 서버 주소 (기본값 OPENAI_API_BASE 환경변수, 없으면 openai 기본 주소)
+        pool_size (int): 서버당 유지할 최대 연결 수
+    """
+
+    def __init__(self, api_key=None, api_base=None, pool_size=POOL_SIZE):
+        self._api_key = api_key
+        self._api_base = api_base
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._session = None
+
+    def configure(self, api_key=None, api_base=None):
+        """인증 정보/서버 주소를 직접 지정 (CLI 인자, 로컬 모의 서버 등)"""
+        with self._lock:
+            if api_key is not None:
+                self._api_key = api_key
+            if api_base is not None:
+                self._api_base = api_base
+
+    @property
+    def api_base(self):
+        return self._api_base or os.environ.get(API_BASE_ENV) or None
+
+    def api_key(self):
+        """
+        Raises:
+            ApiKeyError: 환경변수와 key 파일 모두에서 찾지 못했을 때
+        """
+        if self._api_key is None:
+            with self._lock:
+                if self._api_key is None:
+                    self._api_key = _resolve_api_key()
+        return self._api_key
+
+    def session(self):
+        """모든 스레드가 같이 쓰는 연결 풀 세션 (처음 호출할 때 만들고 openai 에 등록)"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = SharedSession()
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size,
+                                                            max_retries=CONNECTION_RETRIES)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    openai.requestssession = session
+                    self._session = session
+        return self._session
+
+    def request_kwargs(self):
+        """
+        openai.ChatCompletion.create / acreate 에 그대로 넘길 인증 인자
+
+        Returns:
+            dict: {'api_key': ..., 'api_base': ...} (api_base 는 지정된 경우만)
+        """
+        self.session()
+        kwargs = {'api_key': self.api_key()}
+        if self.api_base:
+            kwargs['api_base'] = self.api_base
+        return kwargs
+
+
+def _resolve_api_key():
+    api_key = os.environ.get(API_KEY_ENV, '').strip()
+    if api_key:
+        return api_key
+
+    key_file = os.environ.get(API_KEY_FILE_ENV)
+    paths = (key_file,) if key_file else API_KEY_PATHS
+    for path in paths:
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                api_key = f.read().strip()
+            if api_key:
+                return api_key
+    raise ApiKeyError(f"{API_KEY_ENV} 환경변수나 key 파일({', '.join(paths)})이 없습니다")
+
+
+# 대시보드/일괄 요약이 같이 쓰는 기본 provider
+openai_client = OpenAIClientProvider()
@@ -0,0 +1,37 @@
+import os
+import psutil
+
+MB = 1024 * 1024
+
+
+def process_memory(pid=None):
+    """
+    프로세스 메모리 사용량 (MB)
+
+    rss 에는 preload 한 부모와 copy-on-write 로 같이 쓰는 페이지도 들어가므로,
+    워커 여러 개의 실제 사용량은 pss(공유 페이지를 나눠 가진 크기)의 합으로 보고
+    uss 는 그 프로세스만 가진 페이지 크기로 봄 (pss 는 리눅스에서만 제공)
+
+    Parameters:
+        pid (int): 프로세스 id (기본값 현재 프로세스)
+
+    Returns:
+        dict: pid, rss_mb, shared_mb, pss_mb, uss_mb (제공되지 않는 값은 None)
+    """
+    process = psutil.Process(pid or os.getpid())
+    try:
+        info = process.memory_full_info()
+    except psutil.AccessDenied:
+        info = process.memory_info()
+
+    def mb(name):
+        value = getattr(info, name, None)
+        return None if value is None else round(value / MB, 1)
+
+    return {
+        'pid': process.pid,
+        'rss_mb': mb('rss'),
+        'shared_mb': mb('shared'),
+        'pss_mb': mb('pss'),
+        'uss_mb': mb('uss'),
+    }
@@ -1,8 +1,15 @@
-from better_profanity import profanity
+from better_profanity import Profanity
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import multiprocessing
+import os
+import pandas as pd
+import pyarrow as pa
 import re
 
-# 영어 욕설 사전 초기화
-profanity.load_censor_words()
+# 영어 욕설 사전 초기화 (better_profanity 기본 단어 목록)
+profanity = Profanity()
 
 # 추가적으로 삭제하고 싶은 특정 단어
 BANWORD_SET = set([
@@ -23,10 +30,146 @@ BADWORD_PATTERNS = [
     r"c\s*8"
 ]
 
+# 패턴 10개를 하나의 정규식으로 합쳐 문자열을 한 번만 훑음
+BADWORD_REGEX = re.compile("|".join(f"(?:{pattern})" for pattern in BADWORD_PATTERNS))
+
+# 단어(공백 기준) 하나 안에서만 매치되는 같은 패턴 (공백 허용 부분을 빼서 매치가 단어 경계를 넘지 않음)
+# 문장 전체를 한 번 훑어 나온 매치가 곧 욕설 단어의 위치가 되고, 단어마다 BADWORD_REGEX 로 판정한 결과와 같음
+BADWORD_WORD_REGEX = re.compile("|".join(
+    "(?:{})".format(pattern.replace(r"\s*", "").replace("[^가-힣a-zA-Z0-9]", r"[^가-힣a-zA-Z0-9\s]"))
+    for pattern in BADWORD_PATTERNS
+))
+
+# 공백이 아닌 연속 문자열 = str.split() 의 단어
+_WORD_PATTERN = re.compile(r"\S+")
+_SPACE_PATTERN = re.compile(r"\s")
+
+# 단어 단위 판정 결과 캐시 크기 (댓글에는 같은 단어가 반복해서 나옴)
+WORD_CACHE_SIZE = 65536
+
+# filter_comments_batch(workers > 1) 가 프로세스 풀 워커 하나에 넘기는 댓글 수 (이보다 적으면 현재 프로세스에서 처리)
+BATCH_CHUNK_SIZE = 2000
+
+
+class CompiledWordSet:
+    """
+    better_profanity 의 CENSOR_WORDSET(VaryingString 리스트) 대체
+
+    `word in CENSOR_WORDSET` 은 단어마다 900여 개 VaryingString 과 하나씩 비교하므로,
+    같은 치환 규칙(글자마다 허용 문자 집합)을 길이별로 묶은 정규식 하나로 컴파일해서 판정
+    """
+
+    def __init__(self, words, char_map):
+        by_length = {}
+        for word in words:
+            word = str(word)
+            classes = "".join(
+                "[" + "".join(re.escape(char) for char in char_map.get(letter, (letter,))) + "]"
+                for letter in word
+            )
+            by_length.setdefault(len(word), []).append(classes)
+        self._regex_by_length = {length: re.compile("|".join(patterns)) for length, patterns in by_length.items()}
+        self._size = len(words)
+
+    def __contains__(self, text):
+        regex = self._regex_by_length.get(len(text)) if text.__class__ == str else None
+        return regex is not None and regex.fullmatch(text) is not None
+
+    def __len__(self):
+        return self._size
+
+
+# 치환 문자는 모두 한 글자이므로 VaryingString 비교 = 같은 길이 + 글자마다 허용 문자 집합 포함 여부
+profanity.CENSOR_WORDSET = CompiledWordSet(profanity.CENSOR_WORDSET, profanity.CHARS_MAPPING)
+
+
+class AhoCorasick:
+    """
+    여러 금칙어를 문자열 한 번 훑기로 찾는 Aho-Corasick 오토마톤
+
+    Parameters:
+        words (Iterable[str]): 찾을 단어 목록
+    """
+
+    def __init__(self, words):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [False]
+        # 상태에서 끝나는 (실패 링크로 이어진 것 포함) 가장 짧은 단어의 길이, 없으면 0
+        self._shortest = [0]
+        for word in words:
+            if not word:
+                continue
+            state = 0
+            for char in word:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(False)
+                    self._shortest.append(0)
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state] = True
+            self._shortest[state] = len(word)
+
+        # 너비 우선으로 실패 링크 계산 (루트의 자식은 루트로 실패)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] or self._output[self._fail[next_state]]
+                fail_shortest = self._shortest[self._fail[next_state]]
+                if fail_shortest and (not self._shortest[next_state] or fail_shortest < self._shortest[next_state]):
+                    self._shortest[next_state] = fail_shortest
+
+    def __bool__(self):
+        return len(self._goto) > 1
+
+    def match_spans(self, text):
+        """
+        text 안에서 단어가 끝나는 위치마다 그 위치에서 끝나는 가장 짧은 단어의 (시작, 끝) 위치를 반환
+
+        가장 짧은 단어가 들어가지 않는 구간에는 같은 위치에서 끝나는 더 긴 단어도 들어가지 않음
+        """
+        if len(self._goto) == 1:
+            return []
+        goto, fail, shortest = self._goto, self._fail, self._shortest
+        spans = []
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if shortest[state]:
+                spans.append((index + 1 - shortest[state], index + 1))
+        return spans
+
+    def contains_any(self, text):
+        """text 안에 단어 중 하나라도 부분 문자열로 들어 있으면 True"""
+        if len(self._goto) == 1:
+            return False
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                return True
+        return False
+
+
+BANWORD_MATCHER = AhoCorasick(BANWORD_SET)
+
 # 한글 욕설 탐지
 def is_korean_profane(text: str) -> bool:
     lowered = text.lower()
-    return any(re.search(pat, lowered) for pat in BADWORD_PATTERNS)
+    return BADWORD_REGEX.search(lowered) is not None
 
 # 통합 욕설 필터 함수 (한글 + 영어 + 커스텀 단어)
 def is_abusive_comment(text: str) -> bool:
@@ -34,17 +177,117 @@ def is_abusive_comment(text: str) -> bool:
     return (
         profanity.contains_profanity(lowered) or
         is_korean_profane(lowered) or
-        any(bad in lowered for bad in BANWORD_SET)
+        BANWORD_MATCHER.contains_any(lowered)
     )
 
+# 영어 욕설 단어 판정 (better_profanity 의 단어 분리/조합 규칙은 그대로 쓰고, 같은 단어는 한 번만 계산)
+_is_english_profane_word = lru_cache(maxsize=WORD_CACHE_SIZE)(profanity.contains_profanity)
+
+def _abusive_word_indices(lowered: str):
+    """
+    소문자로 바꾼 문장을 한 번 훑어 욕설 단어의 번호(str.split() 순서) 집합 반환
+
+    단어마다 is_abusive_comment 를 부른 결과와 같음
+    - 한글: BADWORD_WORD_REGEX 를 문장 전체에 한 번 적용 (매치가 단어 경계를 넘지 않음)
+    - 금칙어: Aho-Corasick 으로 문장 전체를 한 번 훑고 단어 안에 들어가는 매치만 사용
+    - 영어: better_profanity 는 마지막 글자 앞에 허용 문자가 없는 단어를 검사하지 않으므로
+      그런 단어(한글만 있는 단어 등)는 건너뛰고 나머지만 단어 판정 캐시로 확인
+    """
+    # 매치 시작 글자는 공백이 아니므로 그 글자까지 자른 문장의 마지막 단어가 매치가 들어 있는 단어
+    abusive = {len(lowered[:match.start() + 1].split()) - 1 for match in BADWORD_WORD_REGEX.finditer(lowered)}
+    for start, end in BANWORD_MATCHER.match_spans(lowered):
+        if _SPACE_PATTERN.search(lowered, start, end) is None:
+            abusive.add(len(lowered[:start + 1].split()) - 1)
+
+    allowed = profanity.ALLOWED_CHARACTERS
+    for index, word in enumerate(lowered.split()):
+        if index in abusive or allowed.isdisjoint(word[:-1]):
+            continue
+        if _is_english_profane_word(word):
+            abusive.add(index)
+    return abusive
+
+def abusive_word_spans(sentence: str):
+    """
+    문장을 한 번 훑어 욕설로 판정된 단어(공백 기준)의 위치 목록 반환
+
+    Returns:
+        List[Tuple[int, int]]: 욕설 단어의 (시작, 끝) 위치 (문장 순서)
+    """
+    abusive = _abusive_word_indices(sentence.lower())
+    return [match.span() for index, match in enumerate(_WORD_PATTERN.finditer(sentence)) if index in abusive]
+
+# 욕설 제거 + 욕설 여부를 함께 반환 (문장 판정 한 번 + 욕설 문장만 단어 위치 한 번 훑기)
+def filter_comment(sentence: str):
+    if not is_abusive_comment(sentence):  # 욕설이 없다면 그대로 반환
+        return sentence, False
+    # lower() 는 공백을 만들거나 없애지 않으므로 소문자 문장의 단어 번호가 원래 문장의 split() 번호와 같음
+    abusive = _abusive_word_indices(sentence.lower())
+    cleaned = ["" if index in abusive else word for index, word in enumerate(sentence.split())]
+    return " ".join(cleaned).strip(), True
 
 # 욕설 제거용 Clean 함수
 def clean_abusive_words(sentence: str) -> str:
-    if not is_abusive_comment(sentence):  # 욕설이 없다면 그대로 반환
-        return sentence
-    words = sentence.split()
-    cleaned = [word if not is_abusive_comment(word) else "" for word in words]
-    return " ".join(cleaned).strip()
+    return filter_comment(sentence)[0]
+
+
+def _map_batch(function, texts):
+    # 같은 문장은 한 번만 계산하고, 입력이 Series 면 Series(같은 index)로 반환
+    results = {}
+    values = [results[text] if text in results else results.setdefault(text, function(text)) for text in texts]
+    if isinstance(texts, pd.Series):
+        return pd.Series(values, index=texts.index, dtype=object)
+    return values
+
+def is_abusive_batch(texts):
+    """문장 목록(list 또는 Series)의 욕설 여부를 한 번에 판정"""
+    return _map_batch(is_abusive_comment, texts)
+
+def clean_abusive_words_batch(texts):
+    """문장 목록(list 또는 Series)에서 욕설 단어를 한 번에 제거"""
+    return _map_batch(clean_abusive_words, texts)
+
+def _filter_chunk(texts):
+    results = _map_batch(filter_comment, texts)
+    return [cleaned for cleaned, _ in results], [flag for _, flag in results]
+
+def filter_comments_batch(texts, workers=1, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    댓글 묶음의 욕설 제거 결과와 욕설 여부를 함께 계산
+
+    기본값은 현재 프로세스에서 처리. 대시보드의 refresh 스레드에서 불리므로 다른 스레드가 락을 잡은 채로
+    fork 되지 않게 함 (워드클라우드 미리 렌더링을 별도 프로세스로 돌리는 것과 같은 이유).
+    workers 를 2 이상으로 주면 (스레드가 없는 스크립트/벤치마크용) 입력을 chunk_size 조각으로 나눠
+    fork 프로세스 풀에서 처리하고, 조각 결과는 순서대로 이어 붙임 (fork 가 없는 환경에서는 현재 프로세스에서 처리)
+
+    Parameters:
+        texts (list | pd.Series | pa.Array | pa.ChunkedArray): 댓글 (str)
+        workers (int): 워커 프로세스 수 (기본값 1: 현재 프로세스에서 처리, None 이면 CPU 코어 수)
+
+    Returns:
+        Tuple: (정제된 댓글, 욕설 여부) - 입력이 Series 면 같은 index 의 Series, Arrow 배열이면 Arrow 배열, 그 외에는 list
+    """
+    if isinstance(texts, (pa.Array, pa.ChunkedArray)):
+        cleaned, flags = filter_comments_batch(texts.to_pylist(), workers, chunk_size)
+        return pa.array(cleaned, type=pa.string()), pa.array(flags, type=pa.bool_())
+    if isinstance(texts, pd.Series):
+        cleaned, flags = filter_comments_batch(texts.tolist(), workers, chunk_size)
+        return (pd.Series(cleaned, index=texts.index, dtype=object),
+                pd.Series(flags, index=texts.index, dtype=bool))
+
+    texts = list(texts)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(texts) <= chunk_size or 'fork' not in multiprocessing.get_all_start_methods():
+        return _filter_chunk(texts)
+
+    cleaned, flags = [], []
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                             mp_context=multiprocessing.get_context('fork')) as pool:
+        for chunk_cleaned, chunk_flags in pool.map(_filter_chunk, chunks):
+            cleaned.extend(chunk_cleaned)
+            flags.extend(chunk_flags)
+    return cleaned, flags
 
 
 
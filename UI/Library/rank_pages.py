@@ -0,0 +1,76 @@
+import numpy as np
+
+PAGE_SIZE = 10
+
+# 테이블로 내보내는 컬럼
+PAGE_COLUMNS = ['rank', 'title', 'channel', 'views', 'likes', 'category', 'video_id']
+
+
+class RankPartition:
+    """
+    (조회수 내림차순, video_id 오름차순)으로 정렬된 순위 프레임과 keyset 검색용 키 배열
+
+    커서는 페이지 경계 행의 (views, video_id) 이며, 다음/이전 페이지 위치는
+    이진 탐색으로 찾으므로 페이지 이동 비용은 O(log n + page_size)
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        # 조회수가 없는 행은 -1 로 취급해 정렬 순서(맨 뒤)와 맞춤
+        self.neg_views = -frame['views'].fillna(-1).to_numpy(dtype='float64')
+        self.video_ids = frame['video_id'].to_numpy(dtype=object)
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def total_pages(self):
+        return (len(self.frame) + PAGE_SIZE - 1) // PAGE_SIZE
+
+    def position_after(self, cursor):
+        """커서 행 바로 다음 행의 위치 (커서가 없으면 0)"""
+        if not cursor:
+            return 0
+        views, video_id = cursor
+        key = -(views if views is not None else -1)
+        lo = int(np.searchsorted(self.neg_views, key, side='left'))
+        hi = int(np.searchsorted(self.neg_views, key, side='right'))
+        return lo + int(np.searchsorted(self.video_ids[lo:hi], video_id, side='right'))
+
+    def position_before(self, cursor):
+        """커서 행의 위치 (커서 바로 앞까지가 이전 페이지)"""
+        views, video_id = cursor
+        key = -(views if views is not None else -1)
+        lo = int(np.searchsorted(self.neg_views, key, side='left'))
+        hi = int(np.searchsorted(self.neg_views, key, side='right'))
+        return lo + int(np.searchsorted(self.video_ids[lo:hi], video_id, side='left'))
+
+    def page(self, after=None, before=None, limit=PAGE_SIZE):
+        """
+        keyset 커서 기준으로 한 페이지만 잘라서 반환
+
+        Parameters:
+            after ((views, video_id)): 이 행 다음부터 limit 개
+            before ((views, video_id)): 이 행 바로 앞까지 limit 개
+
+        Returns:
+            Tuple[list, int]: 페이지 행 목록, 페이지 첫 행의 위치
+        """
+        if before:
+            stop = self.position_before(before)
+            start = max(stop - limit, 0)
+        else:
+            start = self.position_after(after)
+            stop = min(start + limit, len(self.frame))
+        page_frame = self.frame.iloc[start:stop][PAGE_COLUMNS]
+        # NaN 은 JSON 으로 보낼 수 없으므로 None 으로 변환
+        rows = page_frame.astype(object).where(page_frame.notna(), None).to_dict('records')
+        return rows, start
+
+
+def row_cursor(row):
+    """테이블 행에서 keyset 커서 (views, video_id) 추출"""
+    views = row.get('views')
+    if views is not None and views != views:  # NaN
+        views = None
+    return [views, row.get('video_id')]
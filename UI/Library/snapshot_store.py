@@ -0,0 +1,490 @@
+import os
+import glob
+import json
+import time
+import hashlib
+import threading
+import contextlib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+try:
+    from Library.profanity_filter import filter_comments_batch
+except ImportError:
+    from profanity_filter import filter_comments_batch
+
+try:
+    import fcntl
+except ImportError:
+    # 윈도우에는 fcntl 이 없음 (개발 서버는 프로세스 하나이므로 스레드 락만 사용)
+    fcntl = None
+
+# 배치 서버가 떨어뜨리는 CSV 디렉토리와 스냅샷(Arrow IPC) 디렉토리
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'youtube_data')
+SNAPSHOT_DIRNAME = '.snapshot'
+MANIFEST_NAME = 'manifest.json'
+# 스냅샷 파일 구조가 바뀌면 올려서 기존 Arrow 파일을 다시 만들게 함
+SNAPSHOT_FORMAT = 4
+
+TABLE_KINDS = ('video', 'comments', 'youtuber')
+
+# 종류별 CSV 파서 옵션 (기존 소비 코드에서 쓰던 설정 그대로, 인제스트 시 한 번만 사용)
+CSV_READ_OPTIONS = {
+    'video': dict(encoding='utf-8-sig'),
+    'comments': dict(sep=None, engine='python', encoding='utf-8', on_bad_lines='skip'),
+    'youtuber': dict(encoding='utf-8-sig'),
+}
+
+# 종류별 숫자 컬럼 (파싱 실패 값은 NaN 으로 저장)
+NUMERIC_COLUMNS = {
+    'video': ['categoryId', 'commentCount', 'likeCount', 'viewCount'],
+    'comments': ['comment_likes'],
+    'youtuber': ['rank'],
+}
+
+_INGEST_LOCK = threading.Lock()
+_CACHE_LOCK = threading.Lock()
+
+# Arrow 파일 경로 -> mmap 으로 연 pa.Table / 변환된 DataFrame / video_id 인덱스
+# 파일명에 fingerprint 가 들어가므로 같은 경로의 내용은 바뀌지 않음
+_TABLE_CACHE = {}
+_FRAME_CACHE = {}
+_INDEX_CACHE = {}
+
+# manifest 파싱 결과 캐시 (manifest 파일의 mtime 이 바뀔 때만 다시 읽음)
+_manifest_cache = {'path': None, 'mtime_ns': None, 'manifest': None}
+
+
+def snapshot_dir(data_dir=DATA_DIR):
+    return os.path.join(data_dir, SNAPSHOT_DIRNAME)
+
+
+def snapshot_path(name, data_dir=DATA_DIR):
+    """스냅샷 디렉터리 안의 파일 경로"""
+    return os.path.join(snapshot_dir(data_dir), name)
+
+
+@contextlib.contextmanager
+def snapshot_lock(name, data_dir=DATA_DIR):
+    """
+    스냅샷 디렉터리의 lock 파일로 잡는 프로세스 간 배타 락
+
+    gunicorn 워커 여러 개나 미리 렌더링/요약 프로세스가 같은 스냅샷 파일을 동시에 쓰지 않게 함
+
+    Parameters:
+        name (str): 락 이름 (lock 파일명 '.{name}.lock')
+    """
+    os.makedirs(snapshot_dir(data_dir), exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(snapshot_dir(data_dir), f".{name}.lock"), 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def parse_table_name(file_name):
+    """
+    '{country}_{category}_{kind}.csv' 파일명을 (country, category, kind) 로 분해
+
+    category 에는 '_' 가 들어갈 수 있음 (예: people_blogs)
+    """
+    stem = os.path.splitext(os.path.basename(file_name))[0]
+    parts = stem.split('_')
+    if len(parts) < 3 or parts[-1] not in TABLE_KINDS:
+        return None
+    return parts[0], '_'.join(parts[1:-1]), parts[-1]
+
+
+def _source_fingerprint(csv_path):
+    stat = os.stat(csv_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _content_hash(csv_path):
+    digest = hashlib.sha1()
+    with open(csv_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_csv_typed(csv_path, kind):
+    df = pd.read_csv(csv_path, **CSV_READ_OPTIONS[kind])
+
+    for column in NUMERIC_COLUMNS[kind]:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+
+    # 나머지 object 컬럼은 문자열(null 유지)로 고정해 Arrow 스키마를 안정화
+    for column in df.columns:
+        if df[column].dtype == object:
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+
+    return df
+
+
+def _sort_comments(df):
+    """
+    댓글을 video_id 기준으로 정렬하고 video_id -> [start, stop) 행 범위 인덱스를 생성
+
+    안정 정렬이므로 같은 영상의 댓글은 원본 CSV 순서를 유지함
+    """
+    df = df.sort_values('video_id', kind='stable', na_position='last').reset_index(drop=True)
+    n_valid = int(df['video_id'].notna().sum())
+    ids = df['video_id'].to_numpy()[:n_valid]
+    if n_valid == 0:
+        return df, {}
+
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    stops = np.r_[starts[1:], n_valid]
+    index = {ids[start]: [int(start), int(stop)] for start, stop in zip(starts, stops)}
+    return df, index
+
+
+def _add_filter_columns(df):
+    """
+    댓글 욕설 제거 결과(comment_text_clean)와 욕설 여부(is_abusive)를 스냅샷마다 한 번만 계산해 컬럼으로 저장
+
+    comment_text 가 null 인 행은 두 컬럼도 null
+    """
+    present = df['comment_text'].notna()
+    cleaned, flags = filter_comments_batch(df.loc[present, 'comment_text'].astype(str))
+    return df.assign(comment_text_clean=cleaned, is_abusive=flags.astype('boolean'))
+
+
+def _write_index(index, index_path):
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp_path, index_path)
+
+
+def _write_arrow(df, arrow_path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = arrow_path + '.tmp'
+    # 압축 없이 저장해야 memory_map 으로 zero-copy 로딩 가능
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, arrow_path)
+    return table.num_rows
+
+
+def _write_manifest(manifest, manifest_path):
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def load_manifest(data_dir=DATA_DIR):
+    manifest_path = os.path.join(snapshot_dir(data_dir), MANIFEST_NAME)
+    try:
+        mtime_ns = os.stat(manifest_path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    if _manifest_cache['path'] == manifest_path and _manifest_cache['mtime_ns'] == mtime_ns:
+        return _manifest_cache['manifest']
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    _manifest_cache.update(path=manifest_path, mtime_ns=mtime_ns, manifest=manifest)
+    return manifest
+
+
+def manifest_generation(data_dir=DATA_DIR):
+    """
+    Returns:
+        int | None: 현재 manifest 의 generation (내용이 바뀐 인제스트마다 1씩 증가), 스냅샷이 없으면 None
+            다른 프로세스(워커)가 스냅샷을 갱신했는지 확인할 때 사용 (manifest 를 다시 읽는 것은 mtime 이 바뀔 때만)
+    """
+    manifest = load_manifest(data_dir)
+    return None if manifest is None else manifest['generation']
+
+
+def ingest_snapshot(data_dir=DATA_DIR):
+    """
+    youtube_data 의 CSV 를 Arrow IPC 스냅샷으로 변환하고 manifest 를 갱신
+
+    원본 CSV 의 (mtime, size) 가 manifest 와 같으면 해시 없이 기존 Arrow 파일을 재사용하고,
+    달라졌으면 내용 해시(sha1)를 비교해 실제로 바뀐 파일만 다시 파싱함
+    (배치가 내용은 같은 파일을 다시 쓰기만 한 경우에는 generation 이 올라가지 않음)
+
+    Returns:
+        dict: 갱신된 manifest
+    """
+    with _INGEST_LOCK, snapshot_lock('ingest', data_dir):
+        out_dir = snapshot_dir(data_dir)
+        os.makedirs(out_dir, exist_ok=True)
+
+        previous = load_manifest(data_dir) or {'generation': 0, 'tables': {}}
+        if previous.get('format') != SNAPSHOT_FORMAT:
+            # 포맷이 바뀌면 fingerprint 가 같아도 전부 다시 변환
+            previous = {'generation': previous['generation'], 'tables': {}}
+        tables = {}
+        changed = []
+        touched = []
+
+        for csv_path in sorted(glob.glob(os.path.join(data_dir, '*.csv'))):
+            parsed = parse_table_name(csv_path)
+            if parsed is None:
+                continue
+            country, category, kind = parsed
+            name = os.path.splitext(os.path.basename(csv_path))[0]
+            mtime_ns, size = _source_fingerprint(csv_path)
+
+            entry = previous['tables'].get(name)
+            if (entry and entry['mtime_ns'] == mtime_ns and entry['size'] == size
+                    and os.path.exists(os.path.join(out_dir, entry['file']))):
+                tables[name] = entry
+                continue
+
+            sha1 = _content_hash(csv_path)
+            if (entry and entry['sha1'] == sha1
+                    and os.path.exists(os.path.join(out_dir, entry['file']))):
+                tables[name] = dict(entry, mtime_ns=mtime_ns, size=size)
+                touched.append(name)
+                continue
+
+            fingerprint = hashlib.sha1(f"{sha1}:{SNAPSHOT_FORMAT}".encode('utf-8')).hexdigest()[:12]
+            arrow_name = f"{name}-{fingerprint}.arrow"
+            index_name = None
+            try:
+                df = _read_csv_typed(csv_path, kind)
+                if kind == 'comments' and 'comment_text' in df.columns:
+                    df = _add_filter_columns(df)
+                if kind == 'comments' and 'video_id' in df.columns:
+                    df, index = _sort_comments(df)
+                    index_name = f"{name}-{fingerprint}.index.json"
+                    _write_index(index, os.path.join(out_dir, index_name))
+                rows = _write_arrow(df, os.path.join(out_dir, arrow_name))
+            except Exception as e:
+                print(f"[snapshot] 변환 실패 {csv_path}: {str(e)}")
+                if entry:
+                    tables[name] = entry
+                continue
+
+            tables[name] = {
+                'country': country,
+                'category': category,
+                'kind': kind,
+                'source': os.path.basename(csv_path),
+                'mtime_ns': mtime_ns,
+                'size': size,
+                'sha1': sha1,
+                'file': arrow_name,
+                'index': index_name,
+                'rows': rows,
+            }
+            changed.append(name)
+            print(f"[snapshot] {os.path.basename(csv_path)} -> {arrow_name} ({rows} rows)")
+
+        removed = set(previous['tables']) - set(tables)
+        if not changed and not removed and not touched and previous.get('tables'):
+            # 다른 프로세스(워커)가 이미 인제스트한 경우에도 이 프로세스 캐시의 이전 파일은 버림
+            _prune_caches(out_dir, tables)
+            return previous
+
+        # 내용이 바뀐 테이블이 있을 때만 generation 을 올림
+        content_changed = bool(changed or removed or not previous.get('tables'))
+        manifest = {
+            'format': SNAPSHOT_FORMAT,
+            'generation': previous['generation'] + (1 if content_changed else 0),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'tables': tables,
+        }
+        manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+        _write_manifest(manifest, manifest_path)
+        _manifest_cache.update(path=manifest_path, mtime_ns=os.stat(manifest_path).st_mtime_ns, manifest=manifest)
+        _prune_caches(out_dir, tables)
+        _remove_stale_files(out_dir, tables)
+        print(f"[snapshot] generation {manifest['generation']}: {len(changed)} changed, {len(removed)} removed, {len(touched)} touched")
+        return manifest
+
+
+def _prune_caches(out_dir, tables):
+    """현재 manifest 에 없는 파일의 mmap 테이블/프레임/인덱스를 프로세스 캐시에서 제거"""
+    live = {os.path.join(out_dir, entry['file']) for entry in tables.values()}
+    live.update(os.path.join(out_dir, entry['index']) for entry in tables.values() if entry.get('index'))
+    with _CACHE_LOCK:
+        for cache in (_TABLE_CACHE, _FRAME_CACHE, _INDEX_CACHE):
+            for path in [path for path in cache if os.path.dirname(path) == out_dir and path not in live]:
+                del cache[path]
+
+
+def _remove_stale_files(out_dir, tables):
+    live = {entry['file'] for entry in tables.values()}
+    live.update(entry['index'] for entry in tables.values() if entry.get('index'))
+    stale = glob.glob(os.path.join(out_dir, '*.arrow')) + glob.glob(os.path.join(out_dir, '*.index.json'))
+    for path in stale:
+        if os.path.basename(path) in live:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            # 윈도우에서는 mmap 중인 파일을 지울 수 없으므로 다음 인제스트 때 다시 시도
+            pass
+
+
+def _ensure_manifest(data_dir=DATA_DIR):
+    manifest = load_manifest(data_dir)
+    if manifest is None:
+        manifest = ingest_snapshot(data_dir)
+    return manifest
+
+
+def find_entry(country, category, kind, data_dir=DATA_DIR):
+    manifest = _ensure_manifest(data_dir)
+    return manifest['tables'].get(f"{country}_{category}_{kind}")
+
+
+def list_entries(kind, data_dir=DATA_DIR):
+    manifest = _ensure_manifest(data_dir)
+    return [entry for _, entry in sorted(manifest['tables'].items()) if entry['kind'] == kind]
+
+
+def open_arrow(entry, data_dir=DATA_DIR):
+    """manifest 항목의 Arrow 파일을 memory-map 으로 연 pa.Table (프로세스 내 공유)"""
+    path = os.path.join(snapshot_dir(data_dir), entry['file'])
+    table = _TABLE_CACHE.get(path)
+    if table is None:
+        with _CACHE_LOCK:
+            table = _TABLE_CACHE.get(path)
+            if table is None:
+                table = ipc.open_file(pa.memory_map(path, 'r')).read_all()
+                _TABLE_CACHE[path] = table
+    return table
+
+
+def read_entry(entry, data_dir=DATA_DIR):
+    """manifest 항목을 DataFrame 으로 반환 (공유 객체이므로 읽기 전용으로 사용)"""
+    path = os.path.join(snapshot_dir(data_dir), entry['file'])
+    df = _FRAME_CACHE.get(path)
+    if df is None:
+        table = open_arrow(entry, data_dir)
+        with _CACHE_LOCK:
+            df = _FRAME_CACHE.get(path)
+            if df is None:
+                df = table.to_pandas()
+                _FRAME_CACHE[path] = df
+    return df
+
+
+def read_table(country, category, kind, data_dir=DATA_DIR):
+    """
+    {country}_{category}_{kind} 스냅샷 테이블을 DataFrame 으로 반환
+
+    Returns:
+        pd.DataFrame | None: 해당 테이블이 없으면 None
+    """
+    entry = find_entry(country, category, kind, data_dir)
+    if entry is None:
+        print(f"[snapshot] 테이블 없음: {country}_{category}_{kind}")
+        return None
+    return read_entry(entry, data_dir)
+
+
+def _load_index(entry, data_dir=DATA_DIR):
+    path = os.path.join(snapshot_dir(data_dir), entry['index'])
+    index = _INDEX_CACHE.get(path)
+    if index is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        with _CACHE_LOCK:
+            _INDEX_CACHE[path] = index
+    return index
+
+
+def read_comments(country, category, video_id, data_dir=DATA_DIR):
+    """
+    한 영상의 댓글만 반환 (video_id 정렬 테이블에서 인덱스 범위만 잘라옴)
+
+    비용은 전체 댓글 수가 아니라 해당 영상의 댓글 수에 비례함
+
+    Returns:
+        pd.DataFrame | None: 댓글 테이블이 없으면 None, 댓글이 없으면 빈 DataFrame
+    """
+    entry = find_entry(country, category, 'comments', data_dir)
+    if entry is None:
+        print(f"[snapshot] 테이블 없음: {country}_{category}_comments")
+        return None
+    return read_entry_comments(entry, video_id, data_dir)
+
+
+def read_entry_comments(entry, video_id, data_dir=DATA_DIR):
+    """manifest 의 댓글 항목에서 한 영상의 댓글만 반환 (manifest 가 바뀌어도 넘겨받은 항목 기준)"""
+    table = open_arrow(entry, data_dir)
+    if not entry.get('index'):
+        # video_id 컬럼이 없는 테이블
+        return table.slice(0, 0).to_pandas()
+
+    start, stop = _load_index(entry, data_dir).get(str(video_id), (0, 0))
+    return table.slice(start, stop - start).to_pandas()
+
+
+def comment_video_ids(entry, data_dir=DATA_DIR):
+    """댓글 항목에 댓글이 있는 video_id 목록 (테이블 정렬 순서)"""
+    if not entry.get('index'):
+        return []
+    return list(_load_index(entry, data_dir))
+
+
+def _write_synthetic_comments(csv_path, n_comments, n_videos):
+    rng = np.random.default_rng(0)
+    words = np.array(['정말', '재밌어요', '최고', 'great', 'video', 'love', '노래', '좋아요', 'music', 'awesome'])
+    video_ids = np.array([f"vid{i:07d}" for i in range(n_videos)])
+    texts = [' '.join(row) for row in words[rng.integers(0, len(words), size=(n_comments, 6))]]
+    pd.DataFrame({
+        'comment_author': [f"@user{i}" for i in range(n_comments)],
+        'comment_likes': rng.integers(0, 500, size=n_comments),
+        'comment_text': texts,
+        'video_id': video_ids[rng.integers(0, n_videos, size=n_comments)],
+    }).to_csv(csv_path, index=False, encoding='utf-8')
+
+
+if __name__ == '__main__':
+    # 100만 건 합성 댓글로 CSV 파싱 vs 스냅샷(mmap) 로딩 시간 비교
+    import sys
+    import tempfile
+
+    n_comments = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'KR_all_comments.csv')
+        _write_synthetic_comments(csv_path, n_comments, n_videos=2000)
+        target = 'vid0000042'
+
+        start = time.time()
+        df = pd.read_csv(csv_path, **CSV_READ_OPTIONS['comments'])
+        before = df[df['video_id'] == target]
+        csv_sec = time.time() - start
+        print(f"[before] CSV 파싱 + 필터: {csv_sec:.5f} sec ({len(df)} rows, {len(before)} matched)")
+
+        start = time.time()
+        ingest_snapshot(tmp_dir)
+        print(f"[ingest] 1회 변환: {time.time() - start:.5f} sec")
+
+        start = time.time()
+        df = read_table('KR', 'all', 'comments', data_dir=tmp_dir)
+        after = df[df['video_id'] == target]
+        first_sec = time.time() - start
+        print(f"[after] 스냅샷 첫 로딩 + 필터: {first_sec:.5f} sec ({len(after)} matched)")
+
+        start = time.time()
+        df = read_table('KR', 'all', 'comments', data_dir=tmp_dir)
+        after = df[df['video_id'] == target]
+        warm_sec = time.time() - start
+        print(f"[after] 스냅샷 재사용 + 필터: {warm_sec:.5f} sec")
+
+        start = time.time()
+        indexed = read_comments('KR', 'all', target, data_dir=tmp_dir)
+        index_sec = time.time() - start
+        print(f"[after] video_id 인덱스 조회: {index_sec:.5f} sec ({len(indexed)} matched)")
+        print(f"speedup: first {csv_sec / first_sec:.1f}x, warm {csv_sec / warm_sec:.1f}x, indexed {csv_sec / index_sec:.1f}x")
@@ -0,0 +1,218 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from concurrent.futures import Future
+
+try:
+    from Library.snapshot_store import DATA_DIR, snapshot_dir
+except ImportError:
+    from snapshot_store import DATA_DIR, snapshot_dir
+
+SUMMARY_DB_NAME = 'summaries.sqlite'
+# 요약 작업 상태 보관 기간 (클라이언트 폴링이 끝난 뒤에는 필요 없음)
+JOB_TTL_SEC = 24 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    video_id       TEXT NOT NULL,
+    comments_hash  TEXT NOT NULL,
+    model          TEXT NOT NULL,
+    prompt_version INTEGER NOT NULL,
+    summary        TEXT NOT NULL,
+    pos_score      INTEGER NOT NULL,
+    neg_score      INTEGER NOT NULL,
+    created_at     REAL NOT NULL,
+    PRIMARY KEY (video_id, comments_hash, model, prompt_version)
+);
+CREATE TABLE IF NOT EXISTS summary_jobs (
+    job_id     TEXT PRIMARY KEY,
+    status     TEXT NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+def summary_db_path(data_dir=DATA_DIR):
+    return os.path.join(snapshot_dir(data_dir), SUMMARY_DB_NAME)
+
+
+def comments_hash(comments):
+    """요약에 넣은 댓글 목록의 내용 해시 (댓글이 바뀌면 다른 키가 됨)"""
+    digest = hashlib.sha1()
+    for comment in comments:
+        digest.update(comment.encode('utf-8'))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def summary_key(video_id, comments, model, prompt_version):
+    """저장소 키 (video_id, 댓글 해시, 모델, 프롬프트 버전)"""
+    return (video_id, comments_hash(comments), model, prompt_version)
+
+
+class SummaryStore:
+    """
+    (video_id, 댓글 해시, 모델, 프롬프트 버전) -> (요약, 긍정 점수, 부정 점수) 를 보관하는 SQLite 저장소
+
+    연결은 스레드마다 하나씩 열어 재사용하고, WAL 모드라 읽기는 쓰기와 서로 막지 않음
+
+    Parameters:
+        path (str): SQLite 파일 경로 (없으면 생성)
+    """
+
+    def __init__(self, path=None):
+        self.path = path or summary_db_path()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """
+        Returns:
+            Tuple[str, int, int] | None: 저장된 요약 (없으면 None)
+        """
+        row = self._connect().execute(
+            "SELECT summary, pos_score, neg_score FROM summaries"
+            " WHERE video_id = ? AND comments_hash = ? AND model = ? AND prompt_version = ?",
+            key).fetchone()
+        return None if row is None else tuple(row)
+
+    def put(self, key, result):
+        summary, pos_score, neg_score = result
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, summary, pos_score, neg_score, time.time()))
+
+    def put_job(self, job_id, status):
+        """
+        요약 작업 상태 기록 (gunicorn 워커 여러 개일 때 폴링이 다른 워커로 가도 상태를 찾을 수 있게 함)
+
+        Parameters:
+            status (dict): SummaryJobQueue.status() 형식 ({'state': ..., 'result' | 'error': ...})
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO summary_jobs VALUES (?, ?, ?)",
+                         (job_id, json.dumps(status, ensure_ascii=False), now))
+            if status['state'] in ('done', 'failed'):
+                conn.execute("DELETE FROM summary_jobs WHERE updated_at < ?", (now - JOB_TTL_SEC,))
+
+    def get_job(self, job_id):
+        """
+        Returns:
+            dict | None: 기록된 작업 상태 (없으면 None)
+        """
+        row = self._connect().execute("SELECT status FROM summary_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+
+class SummaryCache:
+    """
+    댓글 요약 캐시 (SQLite 저장 + 같은 키로 동시에 들어온 요청은 한 번만 호출)
+
+    Parameters:
+        complete (Callable[[str, str, List[str]], Tuple[str, int, int]]):
+            (video_id, model, comments) 를 받아 (요약, 긍정 점수, 부정 점수) 를 돌려주는 함수.
+            실패하면 예외를 던짐 (실패 결과는 저장하지 않음). 테스트에서는 로컬 스텁을 넣음
+        prompt_version (int): 프롬프트/파싱 방식이 바뀌면 올려서 이전 요약을 무효화
+        store (SummaryStore): 저장소 (None 이면 스냅샷 폴더의 기본 파일)
+    """
+
+    def __init__(self, complete, prompt_version, store=None):
+        self.complete = complete
+        self.prompt_version = prompt_version
+        self._store = store
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'failures': 0, 'complete_sec': 0.0}
+
+    @property
+    def store(self):
+        # 저장소는 처음 쓸 때 열어서 import 만으로 파일이 생기지 않게 함
+        if self._store is None:
+            with self._lock:
+                if self._store is None:
+                    self._store = SummaryStore()
+        return self._store
+
+    def key(self, video_id, comments, model):
+        return summary_key(video_id, comments, model, self.prompt_version)
+
+    def cached(self, video_id, comments, model):
+        """
+        Returns:
+            Tuple[str, int, int] | None: 저장된 요약 (없으면 None, 요청은 보내지 않음)
+        """
+        return self.store.get(self.key(video_id, comments, model))
+
+    def summarize(self, video_id, comments, model):
+        """
+        저장된 요약이 있으면 바로, 없으면 complete() 로 만들어 저장한 뒤 반환
+
+        같은 키의 요청이 이미 진행 중이면 새로 호출하지 않고 그 결과를 기다림 (예외도 그대로 전달)
+        """
+        key = self.key(video_id, comments, model)
+        result = self.store.get(key)
+        if result is not None:
+            self._record('hits')
+            return result
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+        if not owner:
+            self._record('coalesced')
+            return future.result()
+
+        try:
+            # 락을 잡기 직전에 다른 요청이 저장을 끝냈을 수 있으므로 한 번 더 확인
+            result = self.store.get(key)
+            if result is None:
+                self._record('misses')
+                start = time.perf_counter()
+                try:
+                    result = tuple(self.complete(video_id, model, comments))
+                finally:
+                    self._record('complete_sec', time.perf_counter() - start)
+                self.store.put(key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            self._record('failures')
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _record(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, in_flight=len(self._in_flight))
+        total = stats['hits'] + stats['misses'] + stats['coalesced']
+        stats['complete_sec'] = round(stats['complete_sec'], 4)
+        stats['hit_ratio'] = round((stats['hits'] + stats['coalesced']) / total, 4) if total else 0.0
+        return stats
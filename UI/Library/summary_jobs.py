@@ -0,0 +1,139 @@
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from Library.lru_cache import LRUCache
+except ImportError:
+    from lru_cache import LRUCache
+
+SUMMARY_WORKERS = 4
+SUMMARY_MAX_QUEUE = 64
+
+
+class QueueFullError(Exception):
+    """대기 중인 작업 수가 상한에 도달함"""
+
+
+class SummaryJobQueue:
+    """
+    댓글 요약을 서버 요청 스레드 밖에서 실행하는 작업 큐
+
+    클릭 콜백은 submit() 으로 작업 id 만 받고 바로 반환하며, 클라이언트가 status() 를 주기적으로 조회함.
+    같은 인자의 작업이 이미 대기/실행 중이면 새로 만들지 않고 그 작업 id 를 돌려줌.
+    job_store 를 주면 상태 변화를 거기에도 기록해서 다른 프로세스(워커)의 status() 도 같은 상태를 돌려줌
+
+    Parameters:
+        run (Callable[..., Any]): 작업 함수 (submit 인자를 그대로 받음)
+        max_workers (int): 동시에 실행할 작업 수 (API 동시 호출 상한)
+        max_queue (int): 대기 + 실행 중 작업 수 상한 (넘으면 QueueFullError)
+        max_finished (int): 결과를 보관할 완료 작업 수
+        job_store (Callable[[], SummaryStore]): 프로세스끼리 공유하는 작업 상태 저장소를 돌려주는 함수
+    """
+
+    def __init__(self, run, max_workers=SUMMARY_WORKERS, max_queue=SUMMARY_MAX_QUEUE, max_finished=1024,
+                 job_store=None):
+        self.run = run
+        self.job_store = job_store
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = {}
+        self._pending_by_args = {}
+        self._finished = LRUCache(max_entries=max_finished)
+        self._stats = {'submitted': 0, 'deduplicated': 0, 'rejected': 0, 'done': 0, 'failed': 0,
+                       'wait_sec': 0.0, 'run_sec': 0.0}
+
+    def _get_executor(self):
+        # 처음 작업이 들어올 때 스레드 풀 생성
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="summary-job")
+        return self._executor
+
+    def submit(self, *args):
+        """
+        작업 등록
+
+        Returns:
+            str: 작업 id
+
+        Raises:
+            QueueFullError: 대기 중인 작업이 max_queue 개 이상일 때
+        """
+        with self._lock:
+            job_id = self._pending_by_args.get(args)
+            if job_id is not None:
+                self._stats['deduplicated'] += 1
+                return job_id
+            if len(self._pending) >= self.max_queue:
+                self._stats['rejected'] += 1
+                raise QueueFullError(f"요약 대기 작업이 {self.max_queue}개를 넘었습니다")
+
+            job_id = uuid.uuid4().hex
+            self._pending[job_id] = {'args': args, 'state': 'queued', 'submitted_at': time.time()}
+            self._pending_by_args[args] = job_id
+            self._stats['submitted'] += 1
+            self._get_executor().submit(self._run_job, job_id)
+        self._share(job_id, {'state': 'queued'})
+        return job_id
+
+    def _share(self, job_id, status):
+        if self.job_store is None:
+            return
+        try:
+            self.job_store().put_job(job_id, status)
+        except Exception as e:
+            print(f"[summary job] {job_id} 상태 기록 실패: {e}")
+
+    def _run_job(self, job_id):
+        with self._lock:
+            job = self._pending[job_id]
+            job['state'] = 'running'
+            started_at = time.time()
+            self._stats['wait_sec'] += started_at - job['submitted_at']
+        self._share(job_id, {'state': 'running'})
+
+        try:
+            finished = {'state': 'done', 'result': self.run(*job['args'])}
+        except Exception as e:
+            print(f"[summary job] {job_id} 실패: {e}")
+            finished = {'state': 'failed', 'error': str(e)}
+
+        with self._lock:
+            self._finished.put(job_id, finished)
+            del self._pending[job_id]
+            del self._pending_by_args[job['args']]
+            self._stats[finished['state']] += 1
+            self._stats['run_sec'] += time.time() - started_at
+        self._share(job_id, finished)
+
+    def status(self, job_id):
+        """
+        Returns:
+            dict: {'state': 'queued' | 'running' | 'done' | 'failed' | 'unknown', 'result' | 'error': ...}
+        """
+        with self._lock:
+            job = self._pending.get(job_id)
+            if job is not None:
+                return {'state': job['state']}
+        finished = self._finished.get(job_id)
+        if finished is not None:
+            return finished
+        # 다른 워커가 등록한 작업
+        shared = self.job_store().get_job(job_id) if self.job_store is not None else None
+        return shared if shared is not None else {'state': 'unknown'}
+
+    def stats(self):
+        with self._lock:
+            states = [job['state'] for job in self._pending.values()]
+            stats = dict(self._stats)
+        finished = stats['done'] + stats['failed']
+        stats['queued'] = states.count('queued')
+        stats['running'] = states.count('running')
+        stats['max_workers'] = self.max_workers
+        stats['max_queue'] = self.max_queue
+        stats['avg_wait_sec'] = round(stats.pop('wait_sec') / finished, 4) if finished else 0.0
+        stats['avg_run_sec'] = round(stats.pop('run_sec') / finished, 4) if finished else 0.0
+        return stats
@@ -0,0 +1,86 @@
+import threading
+from collections import namedtuple
+
+try:
+    from Library.snapshot_store import DATA_DIR, list_entries, open_arrow
+except ImportError:
+    from snapshot_store import DATA_DIR, list_entries, open_arrow
+
+# 영상 한 건의 위치 (스냅샷 video 테이블의 국가 코드, 카테고리, 행 번호)
+VideoRecord = namedtuple('VideoRecord', ['country', 'category', 'row'])
+
+_lock = threading.Lock()
+# (video 테이블 구성, 인덱스) 를 한 번에 교체해서 읽는 쪽이 짝이 안 맞는 값을 보지 않게 함
+_index_cache = {'current': (None, None)}
+
+
+class VideoIndex:
+    """
+    스냅샷 video 테이블 전체에 대한 video_id 해시 인덱스
+
+    새 탭 열기와 영상 화면 표시는 파일을 읽거나 열을 훑지 않고 dict 조회 한 번 + 한 행 읽기로 끝남
+
+    Parameters:
+        entries (List[dict]): manifest 의 video 항목
+        data_dir (str): 데이터 폴더
+    """
+
+    def __init__(self, entries, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        self._entries = {}
+        self._by_id = {}
+        for entry in entries:
+            table = open_arrow(entry, data_dir)
+            if 'id' not in table.column_names:
+                print(f"'id' 컬럼이 없음: {entry['country']}_{entry['category']}_video")
+                continue
+            self._entries[(entry['country'], entry['category'])] = entry
+
+            video_ids = table.column('id').to_pylist()
+            for row, video_id in enumerate(video_ids):
+                record = VideoRecord(entry['country'], entry['category'], row)
+                self._by_id[video_id] = self._by_id.get(video_id, ()) + (record,)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def has_table(self, country, category):
+        return (country, category) in self._entries
+
+    def find(self, video_id, country=None, category=None):
+        """
+        video_id 의 위치 (국가/카테고리를 지정하면 그 테이블에 있는 것만)
+
+        Returns:
+            VideoRecord | None
+        """
+        for record in self._by_id.get(video_id, ()):
+            if (country is None or record.country == country) and (category is None or record.category == category):
+                return record
+        return None
+
+    def fetch(self, record):
+        """
+        Returns:
+            pd.DataFrame: 해당 영상 한 행 (video 테이블과 같은 열)
+        """
+        entry = self._entries[(record.country, record.category)]
+        return open_arrow(entry, self.data_dir).slice(record.row, 1).to_pandas()
+
+
+def get_video_index(data_dir=DATA_DIR):
+    """
+    현재 스냅샷의 영상 인덱스 (프로세스 안의 두 앱이 같이 씀)
+
+    video 테이블 구성(파일명에 내용 해시 포함)이 바뀌었을 때만 다시 만듦
+    """
+    entries = list_entries('video', data_dir)
+    key = (data_dir, tuple(entry['file'] for entry in entries))
+    cached_key, index = _index_cache['current']
+    if cached_key != key:
+        with _lock:
+            cached_key, index = _index_cache['current']
+            if cached_key != key:
+                index = VideoIndex(entries, data_dir)
+                _index_cache['current'] = (key, index)
+    return index
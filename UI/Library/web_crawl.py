@@ -140,57 +140,103 @@
 #     for contents in ranking_dict:
 #         print(f"{contents} \n")
 
-import pandas as pd
-import os
-
-def get_youtuber_Ranking(country, category):
-    #print("크롤링 체크", country, category)
-    COUNTRY_TYPE = {
-        "전체": "US",
-        "한국": "KR",
-        "미국": "US",
-    }
-
-    # 'all'이면 US 데이터를 기반으로 처리 (예시)
+try:
+    from Library.snapshot_store import DATA_DIR, read_table, read_entry, list_entries
+except ImportError:
+    from snapshot_store import DATA_DIR, read_table, read_entry, list_entries
+
+# 대시보드 국가 선택값 -> 유튜버 순위 테이블 국가 ('전체'는 US 데이터를 기반으로 처리)
+COUNTRY_TYPE = {
+    "전체": "US",
+    "한국": "KR",
+    "미국": "US",
+}
+
+# 유튜버 순위 스냅샷 열 이름 -> 대시보드에서 쓰는 열 이름
+YOUTUBER_COLUMNS = {
+    'rank': 'rank',
+    'channelName': 'channel_name',
+    'channelLink': 'channel_link',
+    'channelImage': 'channel_image',
+    'videoLink': 'video_link',
+    'thumbnailUrl': 'thumbnail_url',
+}
+
+
+def ranking_table_key(country, category):
+    """대시보드 (국가, 카테고리) 선택값 -> 순위 테이블 (국가 코드, 카테고리)"""
     csv_country = COUNTRY_TYPE[country]
     
     if category == 'lge':
         csv_category = 'all'
     else:
         csv_category = category
-
-    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    csv_dir = os.path.join(current_dir, "youtube_data")
-    try:
-        csv_path = os.path.join(csv_dir, f"{csv_country}_{csv_category}_youtuber.csv")
-    except Exception as e:
-        print(f"크롤링 중 path error: {str(e)}")
-        return None
-    df = pd.read_csv(csv_path)
+    return csv_country, csv_category
+
+
+def build_ranking_table(df):
+    """
+    유튜버 순위 스냅샷 테이블을 순위 순으로 정렬하고 순위(rank)를 인덱스로 둔 프레임으로 변환
+
+    Returns:
+        pd.DataFrame: rank(int32), channel_name, channel_link, channel_image, video_link, thumbnail_url
+    """
+    table = df[list(YOUTUBER_COLUMNS)].rename(columns=YOUTUBER_COLUMNS)
+    table = table.astype({'rank': 'int32'}).sort_values('rank', kind='stable')
+    table.index = table['rank'].to_numpy()
+    return table
+
+
+def load_ranking_tables(data_dir=DATA_DIR):
+    """
+    스냅샷의 모든 유튜버 순위 테이블을 한 번에 로드 (데이터셋 세대마다 한 번 호출)
+
+    Returns:
+        dict: (국가 코드, 카테고리) -> build_ranking_table 결과 (공유 객체이므로 읽기 전용으로 사용)
+    """
+    tables = {}
+    for entry in list_entries('youtuber', data_dir):
+        # 깨진 테이블(열 누락, 비어 있는 순위 등) 하나 때문에 세대 전체가 실패하지 않도록 해당 테이블만 건너뜀
+        # (건너뛴 (국가, 카테고리)는 get_youtuber_Ranking 에서 FileNotFoundError)
+        try:
+            tables[(entry['country'], entry['category'])] = build_ranking_table(read_entry(entry, data_dir))
+        except Exception as e:
+            print(f"Error processing youtuber table {entry['file']}: {str(e)}")
+    return tables
+
+
+def get_youtuber_Ranking(country, category, tables=None):
+    """
+    (국가, 카테고리) 유튜버 순위 테이블 반환
+
+    Parameters:
+        country (str): '전체' / '한국' / '미국'
+        category (str): 카테고리 ('lge'는 전체 순위 사용)
+        tables (dict): load_ranking_tables 결과. 지정하면 디스크를 읽지 않고 그 안의 테이블을 그대로 반환
+
+    Returns:
+        pd.DataFrame: build_ranking_table 형식의 순위 테이블
+    """
+    #print("크롤링 체크", country, category)
+    key = ranking_table_key(country, category)
+    if tables is not None:
+        table = tables.get(key)
+    else:
+        df = read_table(*key, "youtuber")
+        table = None if df is None else build_ranking_table(df)
+    if table is None:
+        raise FileNotFoundError(f"{key[0]}_{key[1]}_youtuber 스냅샷이 없습니다.")
 
     # country가 'all'인 경우 전체 데이터를 반환하고,
     # 다른 특정 국가가 지정된 경우 country 컬럼이 있다면 필터링 (필요 시)
     # if country.lower() != 'all' and 'country' in df.columns:
     #     df = df[df['country'] == country]
 
-    results = []
-
-    for _, row in df.iterrows():
-        item = {
-            'rank': row['rank'],
-            'channel_name': row['channelName'],
-            'channel_link': row['channelLink'],
-            'channel_image': row['channelImage'],
-            'video_link': row['videoLink'],
-            'thumbnail_url': row['thumbnailUrl']
-        }
-        results.append(item)
-
-    return results
+    return table
 
 
 # 사용 예시
 if __name__ == '__main__':    
-    ranking_dict = get_youtuber_Ranking('KR', 'all')
-    for contents in ranking_dict[:5]:  # 예시로 상위 5개만 출력
+    ranking_table = get_youtuber_Ranking('한국', 'all')
+    for contents in ranking_table.head(5).to_dict('records'):  # 예시로 상위 5개만 출력
         print(contents)
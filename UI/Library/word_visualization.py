@@ -1,16 +1,20 @@
 import io
 import base64
+import numpy as np
 import pandas as pd
 from wordcloud import WordCloud
-import re
 from collections import Counter
-import glob
 import os
+import re
 
 try:
-    from Library.profanity_filter import clean_abusive_words
+    from Library.profanity_filter import clean_abusive_words_batch
+    from Library.snapshot_store import read_table, read_comments
 except ImportError:
-    from profanity_filter import clean_abusive_words
+    from profanity_filter import clean_abusive_words_batch
+    from snapshot_store import read_table, read_comments
+
+FONT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Font", "LGEITextTTF-Bold.ttf")
 
 
 KOREAN_STOPWORDS = set([
@@ -30,57 +34,150 @@ ENGLISH_STOPWORDS = set([
     "omg", "lol", "wow", "yes", "no", "okay", "ok", "uh", "oh", "hi", "hey", "haha", "hahaha", "wa", "yea", "yeah", "yup", "huh", "eh"
 ])
 
-def generate_Title_WC(country="KR", category="all", image_Size = (800, 400), Max_words = 200):
-
-    csv_path, font_path = read_file(country, category, type = "video")
-    try:
-        df = pd.read_csv(csv_path,
-                    engine='python',
-                    encoding='utf-8',
-                    on_bad_lines='skip'
-                    )
-
-        if "title" not in df.columns or "viewCount" not in df.columns:
-            print("CSV에 'title'과 'viewCount' 열이 필요합니다.")
-            return None
-
-        stopwords = KOREAN_STOPWORDS.union(ENGLISH_STOPWORDS)
-
-        word_freq = Counter()
-
-        for _, row in df.iterrows():
-            title = str(row["title"])
-            try:
-                view = int(row["viewCount"])
-            except ValueError:
-                continue
-
-            cleaned = re.sub(r"[^가-힣a-zA-Z\s]", " ", title).lower()
-            tokens = cleaned.split()
+STOPWORDS = KOREAN_STOPWORDS.union(ENGLISH_STOPWORDS)
+
+# 한글/영문/공백 외 문자는 공백으로 치환 (행 구분자 \x00 은 남김)
+NON_WORD_PATTERN = re.compile(r"[^가-힣a-zA-Z\s\x00]")
+# 문장들을 한 문자열로 이어 붙일 때 쓰는 행 구분자 (split() 하면 독립된 토큰 "\x00" 이 됨)
+ROW_SEPARATOR = " \x00 "
+
+def int_values(values):
+    """
+    행마다 int(value) 를 적용한 값 (int() 가 ValueError 를 내는 값은 NaN)
+
+    숫자 열은 벡터 연산으로 소수점 이하를 버리고, 문자열 열만 값마다 int() 를 호출
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        numbers = values.to_numpy(dtype='float64')
+        if np.isinf(numbers).any():
+            raise OverflowError("cannot convert float infinity to integer")
+        return pd.Series(np.trunc(numbers), index=values.index)
+
+    converted = []
+    for value in values:
+        try:
+            converted.append(float(int(value)))
+        except ValueError:
+            converted.append(np.nan)
+    return pd.Series(converted, index=values.index, dtype='float64')
+
+def weighted_token_frequencies(texts, weights):
+    """
+    문장 묶음을 한 번에 토큰화해서 토큰별 가중치 합계 계산
+
+    문장마다 re.sub/split 을 부르는 대신 전체를 한 문자열로 이어 붙여 치환/소문자화/분리를 한 번씩만 수행하고,
+    토큰을 정수 코드로 바꾼 뒤 불용어 판정은 고유 토큰에만, 합계는 코드 기준 groupby 로 계산
+
+    Parameters:
+        texts (pd.Series): 문장 (str)
+        weights (pd.Series): 문장별 가중치 (정수, 같은 순서)
+
+    Returns:
+        Counter: 토큰 -> 가중치 합 (처음 나온 순서, 가중치 0 인 토큰도 포함)
+    """
+    texts = texts.tolist()
+    if not texts:
+        return Counter()
+
+    joined = ROW_SEPARATOR.join(texts)
+    if joined.count("\x00") != len(texts) - 1:
+        # 문장 안의 \x00 은 원래도 공백으로 치환되는 문자이므로 미리 공백으로 바꿔 구분자와 겹치지 않게 함
+        joined = ROW_SEPARATOR.join(text.replace("\x00", " ") for text in texts)
+    tokens = np.array(NON_WORD_PATTERN.sub(" ", joined).lower().split(), dtype=object)
+
+    codes, uniques = pd.factorize(tokens)
+    # numpy 문자열 비교는 끝의 \x00 을 잘라내므로 고유 토큰마다 파이썬 비교로 판정
+    is_separator = np.array([token == "\x00" for token in uniques], dtype=bool)
+    # 각 토큰이 속한 문장 번호 = 앞에 나온 구분자 수
+    row_ids = np.cumsum(is_separator[codes])
+    keep = np.array([len(token) > 1 and token not in STOPWORDS for token in uniques], dtype=bool) & ~is_separator
+
+    selected = keep[codes]
+    totals = pd.Series(weights.to_numpy(dtype='int64')[row_ids[selected]]).groupby(codes[selected]).sum()
+    return Counter(dict(zip(uniques[totals.index.to_numpy()].tolist(), totals.tolist())))
+
+def title_word_frequencies(country="KR", category="all", df=None):
+    """
+    동영상 제목 토큰별 가중치(조회수 * 0.001) 집계
+
+    Parameters:
+        df (pd.DataFrame): 집계할 동영상 테이블 (생략하면 현재 manifest 의 {country}_{category}_video 테이블)
+
+    Returns:
+        Counter | None: 테이블이나 필요한 열이 없으면 None
+    """
+    if df is None:
+        df = read_table(country, category, "video")
+    if df is None:
+        return None
 
-            for token in tokens:
-                if token not in stopwords and len(token) > 1:
-                    word_freq[token] += int(view * 0.001)
+    if "title" not in df.columns or "viewCount" not in df.columns:
+        print("CSV에 'title'과 'viewCount' 열이 필요합니다.")
+        return None
 
-        wc = WordCloud(
-            font_path=font_path,
-            width=image_Size[0],
-            height=image_Size[1],
-            background_color="white",
-            colormap="coolwarm",
-            contour_width=2,
-            contour_color='black',
-            max_words=Max_words
-        ).generate_from_frequencies(word_freq)
+    # int() 변환이 안 되는 조회수 행은 제외
+    views = int_values(df["viewCount"])
+    valid = views.notna()
+    weights = np.trunc(views[valid] * 0.001)
+    # Arrow 에서 읽은 null 은 None 이므로 CSV 로 읽던 때(NaN -> 'nan')와 같은 토큰이 되도록 맞춤
+    return weighted_token_frequencies(df.loc[valid, "title"].fillna("nan").astype(str), weights)
+
+def comment_word_frequencies(df, video_ID):
+    """
+    댓글 토큰별 가중치(1 + 좋아요 수 * 0.01) 집계 (욕설 제거 후 빈 댓글은 제외)
+
+    Returns:
+        Counter: 토큰 -> 가중치 합
+    """
+    df = df[df["video_id"].astype(str) == video_ID]
+    # 인제스트 때 계산해 둔 욕설 제거 결과를 쓰고, 없는 행(null 댓글, 이전 스냅샷)만 여기서 계산
+    if "comment_text_clean" in df.columns:
+        texts = df["comment_text_clean"]
+    else:
+        texts = pd.Series(None, index=df.index, dtype=object)
+    missing = texts.isna()
+    if missing.any():
+        # null 댓글은 CSV 로 읽던 때와 같이 'nan' 문자열로 처리 (Arrow 의 None 이 'none' 토큰이 되지 않게)
+        texts = texts.mask(missing, clean_abusive_words_batch(df.loc[missing, "comment_text"].fillna("nan").astype(str)))
+    likes = int_values(df["comment_likes"])
+    valid = (texts.str.len() > 0) & likes.notna()
+    weights = np.trunc(1 + likes[valid] * 0.01)
+    return weighted_token_frequencies(texts[valid], weights)
+
+def render_word_cloud_png(word_freq, image_Size=(800, 400), Max_words=200):
+    """토큰 가중치로 워드클라우드를 그려 PNG 바이트로 반환"""
+    wc = WordCloud(
+        font_path=FONT_PATH,
+        width=image_Size[0],
+        height=image_Size[1],
+        background_color="white",
+        colormap="coolwarm",
+        contour_width=2,
+        contour_color='black',
+        max_words=Max_words
+    ).generate_from_frequencies(word_freq)
+
+    # 메모리에 이미지 저장
+    img_io = io.BytesIO()
+    wc.to_image().save(img_io, format='PNG')
+    return img_io.getvalue()
+
+def png_data_url(png_bytes):
+    """PNG 바이트를 <img src> 용 base64 data URL 로 변환"""
+    img_base64 = base64.b64encode(png_bytes).decode('utf-8')
+    return f"data:image/png;base64,{img_base64}"
+
+def render_word_cloud(word_freq, image_Size=(800, 400), Max_words=200):
+    """토큰 가중치로 워드클라우드를 그려 base64 PNG data URL 로 반환"""
+    return png_data_url(render_word_cloud_png(word_freq, image_Size, Max_words))
 
-        # 메모리에 이미지 저장
-        img_io = io.BytesIO()
-        wc.to_image().save(img_io, format='PNG')
-        img_io.seek(0)
+def generate_Title_WC(country="KR", category="all", image_Size = (800, 400), Max_words = 200):
 
-        # base64 인코딩
-        img_base64 = base64.b64encode(img_io.read()).decode('utf-8')
-        return f"data:image/png;base64,{img_base64}"
+    try:
+        word_freq = title_word_frequencies(country, category)
+        if word_freq is None:
+            return None
+        return render_word_cloud(word_freq, image_Size, Max_words)
 
     except Exception as e:
         print(f"에러 발생: {e}")
@@ -88,92 +185,21 @@ def generate_Title_WC(country="KR", category="all", image_Size = (800, 400), Max
 
 def generate_Comments_WC(video_ID, country="KR", category="all", image_Size = (800, 800), Max_words = 200):
     
-    csv_path, font_path = read_file(country, category, type = "comments")
-
     try:
-        df = pd.read_csv(csv_path,
-                    engine='python',
-                    encoding='utf-8',
-                    on_bad_lines='skip'
-                    )
+        df = read_comments(country, category, video_ID)
+        if df is None:
+            return None
 
         if "comment_text" not in df.columns or "comment_likes" not in df.columns or "video_id" not in df.columns:
             print("CSV에 'comment_text','comment_likes', 'video_id' 열이 필요합니다.")
             return None
 
-        stopwords = KOREAN_STOPWORDS.union(ENGLISH_STOPWORDS)
-        word_freq = Counter()
-
-        for _, row in df.iterrows():
-            if str(row["video_id"]) != video_ID:
-                continue
-            text = clean_abusive_words(str(row["comment_text"]))
-            if len(text) == 0:
-                continue
-            try:
-                like = int(row["comment_likes"])
-            except ValueError:
-                continue
-            cleaned = re.sub(r"[^가-힣a-zA-Z\s]", " ", text).lower()
-            tokens = cleaned.split()
-
-            for token in tokens:
-                if token not in stopwords and len(token) > 1:
-                    word_freq[token] += int(1+ like * 0.01)
-
-        wc = WordCloud(
-            font_path=font_path,
-            width=image_Size[0],
-            height=image_Size[1],
-            background_color="white",
-            colormap="coolwarm",
-            contour_width=2,
-            contour_color='black',
-            max_words=Max_words
-        ).generate_from_frequencies(word_freq)
-
-        # 메모리에 이미지 저장
-        img_io = io.BytesIO()
-        wc.to_image().save(img_io, format='PNG')
-        img_io.seek(0)
-        # base64 인코딩
-        img_base64 = base64.b64encode(img_io.read()).decode('utf-8')
-        return f"data:image/png;base64,{img_base64}"
+        return render_word_cloud(comment_word_frequencies(df, video_ID), image_Size, Max_words)
 
     except Exception as e:
         print(f"에러 발생: {e}")
         return None
 
-def read_file(country, category, type = "video"):
-    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    csv_dir = os.path.join(current_dir, "youtube_data")
-    font_path = os.path.join(current_dir, "Font", "LGEITextTTF-Bold.ttf")
-    
-    print(f"현재 디렉토리: {current_dir}")
-    print(f"CSV 디렉토리: {csv_dir}")
-    print(f"폰트 경로: {font_path}")
-
-    # 파일명 패턴 수정
-    if type == "video":
-        pattern = os.path.join(csv_dir, f"{country}_{category}_video.csv")
-    else:
-        pattern = os.path.join(csv_dir, f"{country}_{category}_comments.csv")
-    
-    print(f"검색 패턴: {pattern}")
-    matched_files = glob.glob(pattern)
-
-    if not matched_files:
-        print(f"해당 국가({country}), 카테고리({category})에 맞는 CSV 파일이 없습니다.")
-        return None, None
-
-    csv_path = matched_files[0]  # 첫 번째 매칭된 파일 사용
-    print(f"선택된 CSV 파일: {csv_path}")
-
-    return csv_path, font_path
-
-
-
-
 if __name__ == '__main__':
     from PIL import Image
     import matplotlib.pyplot as plt
@@ -0,0 +1,115 @@
+import os
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from Library.lru_cache import LRUCache
+    from Library.word_visualization import title_word_frequencies, render_word_cloud
+except ImportError:
+    from lru_cache import LRUCache
+    from word_visualization import title_word_frequencies, render_word_cloud
+
+
+def frequencies_digest(word_freq):
+    """토큰 가중치 내용으로 만든 키 (내용이 같으면 세대가 달라도 같은 이미지를 재사용)"""
+    digest = hashlib.sha1()
+    for token, weight in sorted(word_freq.items()):
+        digest.update(f"{token}\t{weight}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class WordCloudCache:
+    """
+    제목 워드클라우드 2단계 캐시
+
+    1단계: (세대, 국가, 카테고리) -> (토큰 가중치 Counter, 내용 해시)
+    2단계: (내용 해시, 이미지 크기, 최대 단어 수) -> base64 PNG data URL
+
+    렌더링에 실패한 이미지는 캐시하지 않으므로 다음 요청에서 다시 생성함
+
+    Parameters:
+        max_frequencies (int): 1단계 최대 항목 수
+        max_images (int): 2단계 최대 항목 수
+    """
+
+    def __init__(self, max_frequencies=64, max_images=128):
+        self._frequencies = LRUCache(max_entries=max_frequencies)
+        self._images = LRUCache(max_entries=max_images)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._warming = None
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self):
+        # 부모의 스레드 풀은 fork 한 프로세스에서 동작하지 않으므로 다음 warm_async 때 새로 만듦
+        self._lock = threading.Lock()
+        self._executor = None
+        self._warming = None
+
+    def frequencies(self, generation_id, country, category, tables=None):
+        """
+        Parameters:
+            tables (dict): 세대의 동영상 테이블 ((국가 코드, 카테고리) -> DataFrame).
+                지정하면 현재 manifest 대신 그 세대를 만들 때 읽은 테이블로 집계
+
+        Returns:
+            Tuple[Counter, str] | None: 토큰 가중치와 내용 해시 (테이블이 없으면 None)
+        """
+        def build():
+            if tables is None:
+                word_freq = title_word_frequencies(country, category)
+            else:
+                df = tables.get((country, category))
+                word_freq = None if df is None else title_word_frequencies(country, category, df)
+            return None if word_freq is None else (word_freq, frequencies_digest(word_freq))
+        return self._frequencies.get_or_create((generation_id, country, category), build)
+
+    def title_cloud(self, generation_id, country, category, image_Size=(800, 400), Max_words=200, tables=None):
+        """
+        캐시된 제목 워드클라우드 이미지 반환 (없으면 생성 후 저장)
+
+        Returns:
+            str | None: base64 PNG data URL, 생성 실패 시 None
+        """
+        entry = self.frequencies(generation_id, country, category, tables)
+        if entry is None:
+            return None
+        word_freq, digest = entry
+
+        # 렌더링 예외는 get_or_create 밖으로 전달되어 캐시에 들어가지 않음
+        try:
+            return self._images.get_or_create((digest, tuple(image_Size), Max_words),
+                                              lambda: render_word_cloud(word_freq, image_Size, Max_words))
+        except Exception as e:
+            print(f"[wordcloud] {country}_{category} 렌더링 실패: {str(e)}")
+            return None
+
+    def warm_async(self, generation_id, targets, image_Size=(800, 400), Max_words=200, tables=None):
+        """
+        새 세대의 (국가, 카테고리) 워드클라우드를 백그라운드에서 미리 생성
+
+        이전 세대의 가중치는 버리고, 이미지는 내용 해시가 같으면 그대로 재사용됨
+        """
+        self._frequencies.discard_where(lambda key: key[0] != generation_id)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='wordcloud-warm')
+            self._warming = self._executor.submit(self._warm, generation_id, list(targets), image_Size, Max_words,
+                                                 tables)
+            return self._warming
+
+    def wait(self, timeout=None):
+        """마지막으로 예약한 미리 생성이 끝날 때까지 대기 (preload 후 워커를 fork 하기 전에 사용)"""
+        warming = self._warming
+        if warming is not None:
+            warming.result(timeout)
+
+    def _warm(self, generation_id, targets, image_Size, Max_words, tables):
+        for country, category in targets:
+            self.title_cloud(generation_id, country, category, image_Size, Max_words, tables)
+        print(f"[wordcloud] generation {generation_id}: {len(targets)} word clouds warmed")
+
+    def stats(self):
+        return {'frequencies': self._frequencies.stats(), 'images': self._images.stats()}
@@ -0,0 +1,56 @@
+"""
+시간대 x 카테고리 히트맵 생성 시간 비교 (칸 수를 늘려가며 측정)
+
+before: 칸마다 fig.add_annotation() 을 호출하던 기존 방식
+after : build_time_category_heatmap (주석을 한 번에 설정)
+
+실행: python benchmarks/heatmap_bench.py [반복 횟수]
+"""
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+
+
+def synthetic_heatmap(slots, categories, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.integers(0, 50, size=(slots, categories)),
+                        index=[f"slot{i:02d}" for i in range(slots)],
+                        columns=[f"category{j:02d}" for j in range(categories)])
+
+
+def build_before(heatmap_data):
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(z=heatmap_data.values, x=heatmap_data.columns, y=heatmap_data.index,
+                             text=heatmap_data.values, texttemplate='%{text}', textfont={'size': 12}))
+    max_val = heatmap_data.values.max()
+    normalized_data = heatmap_data.values / max_val if max_val > 0 else heatmap_data.values
+    for i in range(len(heatmap_data.index)):
+        for j in range(len(heatmap_data.columns)):
+            color = 'black' if normalized_data[i][j] > 0.6 else 'white'
+            fig.add_annotation(x=j, y=i, text=str(int(heatmap_data.values[i][j])), showarrow=False,
+                               font=dict(color=color, size=12))
+    return fig
+
+
+def measure(build, heatmap_data, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        build(heatmap_data)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == '__main__':
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    # (시간대 수, 카테고리 수): 현재 8x7 에서 1시간/30분 단위, 카테고리 추가까지
+    for slots, categories in [(8, 7), (16, 7), (24, 7), (24, 14)]:
+        heatmap_data = synthetic_heatmap(slots, categories)
+        before_ms = measure(build_before, heatmap_data, repeat)
+        after_ms = measure(main.build_time_category_heatmap, heatmap_data, repeat)
+        print(f"[{slots:>2} slots x {categories:>2} categories = {slots * categories:>4} cells]"
+              f" before {before_ms:9.1f} ms -> after {after_ms:7.1f} ms ({before_ms / after_ms:.1f}x faster)")
@@ -0,0 +1,93 @@
+"""
+드롭다운 동시 변경 시 최대 RSS 비교
+
+20개 요청이 동시에 국가를 바꿨을 때 차트 4개(히트맵, 카테고리 통계, 시간대별 조회수, 주간 동영상)를
+만드는 동안 늘어난 최대 RSS 를 측정 (figure 캐시는 거치지 않음)
+
+before: copy-on-write 끄고 기존 콜백처럼 매 요청마다 전체 프레임을 df.copy() 한 뒤 필터링
+after : copy-on-write 켜고 공유 프레임을 마스크/컬럼 선택으로만 읽음
+
+각 모드는 별도 프로세스에서 실행 (최대 RSS 가 섞이지 않도록)
+실행: python benchmarks/memory_bench.py [행 배수]
+"""
+import os
+import sys
+import json
+import resource
+import subprocess
+import threading
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CONCURRENCY = 20
+COUNTRIES = ['전체', '한국', '미국']
+
+
+def current_rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_mode(mode, scale):
+    import main
+    pd.set_option('mode.copy_on_write', mode == 'after')
+
+    data = main.dataset.current()
+    # 실제 데이터는 작으므로 행을 복제해 운영 규모로 키움
+    df = pd.concat([data.df] * scale, ignore_index=True)
+    weekly_df = pd.concat([data.weekly_df] * scale, ignore_index=True)
+    prepare = (lambda frame: frame.copy()) if mode == 'before' else (lambda frame: frame)
+
+    def weekly_rows(frame, selected_country):
+        frame = prepare(frame)
+        if mode == 'before':
+            frame = frame[frame['country_name'] == selected_country] if selected_country != '전체' else frame
+            return len(list(frame.iterrows()))
+        filtered = frame[['url', 'video_id', 'title', 'channel']]
+        if selected_country != '전체':
+            filtered = filtered[frame['country_name'] == selected_country]
+        return len(filtered.to_dict('records'))
+
+    def change_dropdown(index):
+        selected_country = COUNTRIES[index % len(COUNTRIES)]
+        main.build_pie_chart(prepare(df), selected_country)
+        main.build_category_stats_chart(prepare(df), selected_country)
+        main.build_hourly_views_chart(prepare(df), selected_country)
+        weekly_rows(weekly_df, selected_country)
+
+    baseline = current_rss_mb()
+    barrier = threading.Barrier(CONCURRENCY)
+
+    def worker(index):
+        barrier.wait()
+        change_dropdown(index)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(CONCURRENCY)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(json.dumps({'mode': mode, 'rows': len(df), 'baseline_mb': round(baseline, 1),
+                      'peak_mb': round(peak_rss_mb(), 1), 'growth_mb': round(peak_rss_mb() - baseline, 1)}))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2 and sys.argv[1] in ('before', 'after'):
+        run_mode(sys.argv[1], int(sys.argv[2]))
+        sys.exit(0)
+
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    results = {}
+    for mode in ('before', 'after'):
+        output = subprocess.run([sys.executable, __file__, mode, str(scale)],
+                                capture_output=True, text=True, check=True).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+        print(f"[{mode}] rows {results[mode]['rows']:,}, baseline {results[mode]['baseline_mb']} MB,"
+              f" peak {results[mode]['peak_mb']} MB (+{results[mode]['growth_mb']} MB)")
+    print(f"peak RSS growth: {results['before']['growth_mb']} MB -> {results['after']['growth_mb']} MB")
@@ -0,0 +1,117 @@
+"""
+OpenAI /v1/chat/completions 를 흉내 내는 로컬 모의 서버
+
+요청마다 delay 초 기다린 뒤 고정 형식의 요약을 돌려주고, 초당 허용량(rate_limit)을 넘거나
+fail_rate 확률에 걸리면 429 를 돌려준다 (재시도/속도 제한 확인용)
+
+실행: python benchmarks/mock_completion_server.py [--port 8001] [--delay 1.0] [--rate-limit 10] [--fail-rate 0.05]
+      python Library/bulk_summarizer.py --api-base http://127.0.0.1:8001/v1 --api-key mock
+"""
+import re
+import json
+import time
+import random
+import socket
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+VIDEO_ID_PATTERN = re.compile(r'\[Video ID: ([^\]]+)\]')
+
+
+class MockCompletionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, delay=1.0, rate_limit=None, fail_rate=0.0):
+        super().__init__(address, MockCompletionHandler)
+        self.delay = delay
+        self.rate_limit = rate_limit
+        self.fail_rate = fail_rate
+        self.lock = threading.Lock()
+        self.window = (0, 0)
+        self.counts = {'connections': 0, 'requests': 0, 'completed': 0, 'rate_limited': 0}
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.counts['connections'] += 1
+        super().process_request(request, client_address)
+
+    def admit(self):
+        """이번 1초 구간 요청 수가 rate_limit 이하이면 True"""
+        with self.lock:
+            self.counts['requests'] += 1
+            second = int(time.monotonic())
+            window_second, used = self.window
+            used = used + 1 if window_second == second else 1
+            self.window = (second, used)
+            if (self.rate_limit and used > self.rate_limit) or random.random() < self.fail_rate:
+                self.counts['rate_limited'] += 1
+                return False
+            return True
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class MockCompletionHandler(BaseHTTPRequestHandler):
+    # keep-alive 연결 재사용이 되도록 HTTP/1.1 로 응답
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        # 헤더와 본문을 따로 쓰므로 Nagle 지연이 keep-alive 연결 응답에 끼지 않게 함
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        if not self.server.admit():
+            self._reply(429, {'error': {'message': 'Rate limit reached', 'type': 'requests', 'code': 'rate_limit_exceeded'}})
+            return
+
+        time.sleep(self.server.delay)
+        prompt = body['messages'][-1]['content']
+        match = VIDEO_ID_PATTERN.search(prompt)
+        positive = random.randint(0, 100)
+        content = f"- {match.group(1) if match else '?'} 모의 요약입니다.\n(긍정: {positive} / 부정: {100 - positive})"
+        with self.server.lock:
+            self.server.counts['completed'] += 1
+        self._reply(200, {
+            'id': f"chatcmpl-mock-{random.getrandbits(32):08x}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': len(prompt), 'completion_tokens': len(content), 'total_tokens': len(prompt) + len(content)},
+        })
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(port=0, delay=1.0, rate_limit=None, fail_rate=0.0):
+    """모의 서버를 백그라운드 스레드에서 시작하고 서버 객체 반환 (주소는 server.base_url)"""
+    server = MockCompletionServer(('127.0.0.1', port), delay, rate_limit, fail_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='OpenAI chat completion 모의 서버')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--delay', type=float, default=1.0)
+    parser.add_argument('--rate-limit', type=int, default=None, help='초당 허용 요청 수 (넘으면 429)')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='무작위 429 확률')
+    args = parser.parse_args()
+
+    server = MockCompletionServer(('127.0.0.1', args.port), args.delay, args.rate_limit, args.fail_rate)
+    print(f"mock completion server: {server.base_url}")
+    server.serve_forever()
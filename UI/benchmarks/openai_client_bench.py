@@ -0,0 +1,82 @@
+"""
+요약 요청 1건당 클라이언트 준비 비용 비교 (로컬 모의 completion 서버 사용)
+
+before: 요청마다 key 파일을 다시 읽고 전역 openai.api_key 를 바꾸며, 요청 스레드마다 새 세션(새 연결)을 만들던 방식
+after : openai_client 가 key 를 한 번만 찾고, 모든 스레드가 연결 풀 세션 하나를 같이 쓰는 현재 방식
+
+서버 요청처럼 요청마다 새 스레드에서 호출한다. 로컬 HTTP 라 연결 비용이 작으므로
+실제 API(TLS) 에서는 연결 재사용 효과가 이 결과보다 크다
+
+실행: python benchmarks/openai_client_bench.py [요청 수]
+"""
+import os
+import sys
+import time
+import tempfile
+import threading
+import openai
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Library import comments_summarizer
+from Library.openai_client import openai_client, API_KEY_FILE_ENV
+from benchmarks.mock_completion_server import start_mock_server
+
+KEY_FILE_NAME = "LG_bootcamp_openai_api_key.txt"
+COMMENTS = [f"모의 요청용 댓글 {i} 입니다." for i in range(10)]
+
+
+def complete_before(video_id, model, comments):
+    # 기존 summarize_youtube_comments_by_id 의 key 로딩 + 전역 설정 + 요청
+    try:
+        with open(f"./../../../{KEY_FILE_NAME}", "r", encoding="utf-8") as f:
+            openai.api_key = f.read().strip()
+    except:
+        with open(f"./../../../../{KEY_FILE_NAME}", "r", encoding="utf-8") as f:
+            openai.api_key = f.read().strip()
+    response = openai.ChatCompletion.create(
+        model=model,
+        messages=[{"role": "user", "content": comments_summarizer.build_prompt(video_id, comments)}],
+        temperature=0.3
+    )
+    return comments_summarizer.parse_summary(response['choices'][0]['message']['content'])
+
+
+def run(complete, count, server):
+    connections = server.counts['connections']
+    elapsed = []
+
+    def one(i):
+        start = time.perf_counter()
+        complete(f"video{i}", comments_summarizer.SUMMARY_MODEL, COMMENTS)
+        elapsed.append((time.perf_counter() - start) * 1000)
+
+    for i in range(count):
+        thread = threading.Thread(target=one, args=(i,))
+        thread.start()
+        thread.join()
+    elapsed.sort()
+    return sum(elapsed) / count, elapsed[count // 2], server.counts['connections'] - connections
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    server = start_mock_server(delay=0.0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 기존 코드가 찾는 상대 경로(./../../../../) 에 key 파일을 두고 그 아래에서 실행
+        work_dir = os.path.join(tmp, 'a', 'b', 'c', 'd')
+        os.makedirs(work_dir)
+        key_path = os.path.join(tmp, KEY_FILE_NAME)
+        with open(key_path, "w", encoding="utf-8") as f:
+            f.write("mock")
+        os.chdir(work_dir)
+
+        openai.api_base = server.base_url
+        before = run(complete_before, count, server)
+
+        os.environ[API_KEY_FILE_ENV] = key_path
+        openai_client.configure(api_base=server.base_url)
+        after = run(comments_summarizer.openai_complete, count, server)
+
+    print(f"before: mean {before[0]:.2f} ms, p50 {before[1]:.2f} ms, {before[2]} connections for {count} requests")
+    print(f"after : mean {after[0]:.2f} ms, p50 {after[1]:.2f} ms, {after[2]} connections for {count} requests")
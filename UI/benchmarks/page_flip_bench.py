@@ -0,0 +1,100 @@
+"""
+순위 테이블 페이지 이동 지연시간/응답 크기 비교
+
+before: 페이지 이동마다 필터/정렬/video_id 추출과 산점도까지 다시 하던 기존 콜백 (테이블 + 산점도 + 페이지 정보)
+after : keyset 커서로 한 페이지만 잘라 보내는 update_rank_page
+
+실행: python benchmarks/page_flip_bench.py [반복 횟수]
+"""
+import os
+import sys
+import json
+import time
+import plotly.express as px
+from plotly.utils import PlotlyJSONEncoder
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+
+
+def payload_size(outputs):
+    return len(json.dumps(outputs, cls=PlotlyJSONEncoder).encode('utf-8'))
+
+
+def build_scatter_before(filtered_df):
+    # 기존 콜백의 산점도 생성 (그림 캐시 없이 매번 새로 만듦)
+    fig = px.scatter(
+        filtered_df.head(50),
+        x='views',
+        y='likes',
+        color='category',
+        hover_data=['title', 'channel'],
+        log_x=True,
+        log_y=True,
+        labels={'views': '조회수', 'likes': '좋아요 수', 'category': '카테고리'}
+    )
+    fig.update_layout(
+        plot_bgcolor='#1f1f1f',
+        paper_bgcolor='#1f1f1f',
+        font=dict(color='#ffffff', size=14),
+        xaxis=dict(gridcolor='#272727', zerolinecolor='#272727', tickfont=dict(color='#ffffff'), title='조회수'),
+        yaxis=dict(gridcolor='#272727', zerolinecolor='#272727', tickfont=dict(color='#ffffff'), title='좋아요 수'),
+        legend=dict(bgcolor='#1f1f1f', bordercolor='#272727', borderwidth=1, font=dict(color='#ffffff')),
+    )
+    for trace in fig.data:
+        trace.update(marker=dict(color='#ff4444', size=8))
+    return fig
+
+
+def flip_before(country, category, page_current):
+    # 기존 update_table_and_graph 재현: 전역 필터 캐시는 키가 하나뿐이라 다른 세션이 필터를 바꾸면
+    # 페이지 이동마다 필터/정렬/url.apply 를 다시 하고, 산점도도 매번 다시 생성해 함께 반환
+    df = main.dataset.current().df
+    csv_category = main.category_mapping.get(category, 'all')
+    filtered_df = df[df['category'] == csv_category]
+    if country != '전체':
+        filtered_df = filtered_df[filtered_df['country_name'] == country]
+    filtered_df = filtered_df.sort_values('views', ascending=False)
+    filtered_df['rank'] = range(1, len(filtered_df) + 1)
+    filtered_df['video_id'] = filtered_df['url'].apply(lambda x: x.split('v=')[-1])
+
+    page_size = 10
+    total_pages = (len(filtered_df) + page_size - 1) // page_size
+    start_idx = page_current * page_size
+    table_data = filtered_df.iloc[start_idx:start_idx + page_size][
+        ['rank', 'title', 'channel', 'views', 'likes', 'category', 'video_id']].to_dict('records')
+    page_info = f'{page_current + 1} 페이지 / {total_pages} 페이지'
+
+    category_text = main.category_names[category]
+    if category_text == '전체':
+        category_text = ''
+    title = f"{country} {category_text} 인기 동영상 순위"
+    fig = build_scatter_before(filtered_df)
+    return [table_data, fig, title, category, None, page_info, total_pages]
+
+
+def flip_after(country, category, cursor_request):
+    return list(main.update_rank_page(cursor_request, country, category))
+
+
+def run(flip, country, category, request, repeat):
+    outputs = flip(country, category, request)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        flip(country, category, request)
+    elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+    return elapsed_ms, payload_size(outputs)
+
+
+if __name__ == '__main__':
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for country, category in [('전체', 'all'), ('한국', 'music'), ('미국', 'news')]:
+        # 두 번째 페이지로 이동 (before 는 페이지 번호, after 는 첫 페이지 마지막 행의 커서)
+        first_page = main.update_rank_page(None, country, category)[0]
+        cursor_request = {'country': country, 'category': category, 'after': main.row_cursor(first_page[-1])}
+        before_ms, before_bytes = run(flip_before, country, category, 1, repeat)
+        after_ms, after_bytes = run(flip_after, country, category, cursor_request, repeat)
+        print(f"[{country}/{category}] before {before_ms:.3f} ms, {before_bytes:,} bytes"
+              f" -> after {after_ms:.3f} ms, {after_bytes:,} bytes"
+              f" ({before_ms / after_ms:.1f}x faster, {before_bytes / after_bytes:.1f}x smaller)")
@@ -0,0 +1,36 @@
+"""
+일괄 요약 처리량 측정 (로컬 모의 completion 서버 사용, 실제 API 는 호출하지 않음)
+
+모의 서버는 요청마다 delay 초가 걸리고 초당 rate_limit 개를 넘으면 429 를 돌려주므로
+동시성/토큰 버킷/재시도가 함께 동작하는지 확인할 수 있다
+
+실행: python benchmarks/presummarize_bench.py [지연(초)] [동시 요청 수] [초당 요청 수]
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Library.bulk_summarizer import presummarize_snapshot
+from Library.summary_cache import SummaryStore
+from Library.openai_client import openai_client
+from benchmarks.mock_completion_server import start_mock_server
+
+
+if __name__ == '__main__':
+    delay = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    rate = float(sys.argv[3]) if len(sys.argv) > 3 else 20.0
+
+    # 클라이언트 속도 제한보다 조금 빡빡한 서버 제한 + 무작위 429 로 재시도 경로도 거치게 함
+    server = start_mock_server(delay=delay, rate_limit=int(rate), fail_rate=0.05)
+    openai_client.configure(api_key='mock', api_base=server.base_url)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SummaryStore(os.path.join(tmp, 'summaries.sqlite'))
+        first = presummarize_snapshot(concurrency=concurrency, rate=rate, store=store)
+        print(f"first run : {first['summarized']} videos in {first['elapsed_sec']} s"
+              f" -> {first['videos_per_min']} videos/min ({first['retries']} retries, {first['failed']} failed)")
+        second = presummarize_snapshot(concurrency=concurrency, rate=rate, store=store)
+        print(f"second run: {second['cached']} already stored, {second['summarized']} summarized")
+        print(f"mock server: {server.counts}")
@@ -0,0 +1,59 @@
+"""
+욕설 필터 판정/정제 속도 비교
+
+before: better_profanity 기본 인스턴스 + 패턴별 re.search + 단어마다 전체 판정하던 기존 방식
+after : Library.profanity_filter (컴파일된 단어 집합, 합친 정규식, Aho-Corasick, 단어 판정 캐시, 배치 API)
+
+스냅샷의 실제 댓글을 반복해 N 건을 만들고, 두 방식의 판정/정제 결과가 모두 같은지 함께 확인
+실행: python benchmarks/profanity_bench.py [댓글 수]
+"""
+import os
+import re
+import sys
+import time
+from better_profanity import profanity as reference_profanity
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Library import profanity_filter
+from Library.snapshot_store import list_entries, read_entry
+
+
+def reference_is_abusive(text):
+    lowered = text.lower()
+    return (
+        reference_profanity.contains_profanity(lowered) or
+        any(re.search(pattern, lowered.lower()) for pattern in profanity_filter.BADWORD_PATTERNS) or
+        any(bad in lowered for bad in profanity_filter.BANWORD_SET)
+    )
+
+
+def reference_clean(sentence):
+    if not reference_is_abusive(sentence):
+        return sentence
+    return " ".join(word if not reference_is_abusive(word) else "" for word in sentence.split()).strip()
+
+
+def comment_corpus(count):
+    texts = []
+    for entry in list_entries('comments'):
+        texts += read_entry(entry)['comment_text'].astype(str).tolist()
+    return (texts * (count // len(texts) + 1))[:count]
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    texts = comment_corpus(count)
+
+    start = time.perf_counter()
+    before = [(reference_is_abusive(text), reference_clean(text)) for text in texts]
+    before_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = list(zip(profanity_filter.is_abusive_batch(texts), profanity_filter.clean_abusive_words_batch(texts)))
+    after_sec = time.perf_counter() - start
+
+    identical = before == after
+    print(f"[{count:,} comments] before {before_sec:.2f} s -> after {after_sec:.2f} s"
+          f" ({before_sec / after_sec:.1f}x faster), flagged {sum(verdict for verdict, _ in after)},"
+          f" identical: {identical}")
+    sys.exit(0 if identical else 1)
@@ -0,0 +1,192 @@
+"""
+운영 서버(gunicorn 워커 여러 개)와 기존 개발 서버(run_simple)의 초당 처리 요청 수 비교
+
+before: python main.py (werkzeug run_simple + 리로더, 요청을 한 번에 하나씩 처리)
+after : gunicorn -c gunicorn.conf.py wsgi:application (preload 후 워커 fork)
+
+서버를 각각 별도 프로세스 그룹으로 띄우고, 클라이언트 스레드 여러 개가 정해진 시간 동안
+순위 페이지 API / 순위 테이블 콜백 / 대시보드 첫 페이지를 섞어서 요청한 뒤
+서버 프로세스별 메모리(rss, pss, uss)를 함께 출력한다
+
+실행: python benchmarks/serving_load_test.py [측정 시간(초)] [동시 클라이언트 수] [gunicorn 워커 수]
+"""
+import os
+import sys
+import time
+import signal
+import random
+import socket
+import tempfile
+import threading
+import subprocess
+import psutil
+import requests
+
+UI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, UI_DIR)
+from Library.process_memory import process_memory
+
+# main.py 의 run_simple 은 8050 포트로 고정
+PORT = 8050
+BASE = f"http://127.0.0.1:{PORT}"
+COUNTRIES = ['전체', '한국', '미국']
+CATEGORIES = ['all', 'music', 'sports', 'comedy', 'people', 'entertainment', 'news']
+# 서버가 띄우는 보조 프로세스 (미리 렌더링/일괄 요약), 메모리 합계에서 제외
+HELPER_SCRIPTS = ('comment_wordcloud_store.py', 'bulk_summarizer.py')
+RANK_PAGE_OUTPUT = ('..rank-table.data...rank-table.active_cell...page-info.children...total-pages.data'
+                    '...dataset-generation.data..')
+
+
+def rank_page_callback_body(country, category):
+    cursor = {'country': country, 'category': category}
+    return {
+        'output': RANK_PAGE_OUTPUT,
+        'outputs': [{'id': part.rsplit('.', 1)[0], 'property': part.rsplit('.', 1)[1]}
+                    for part in RANK_PAGE_OUTPUT.strip('.').split('...')],
+        'inputs': [{'id': 'page-cursor', 'property': 'data', 'value': cursor}],
+        'state': [{'id': 'country-dropdown', 'property': 'value', 'value': country},
+                  {'id': 'category-dropdown', 'property': 'value', 'value': category},
+                  {'id': 'dataset-generation', 'property': 'data', 'value': None}],
+        'changedPropIds': ['page-cursor.data'],
+    }
+
+
+def send_request(session, kind, country, category):
+    if kind == 'rank-api':
+        response = session.get(f"{BASE}/api/rank-page", params={'country': country, 'category': category})
+    elif kind == 'rank-callback':
+        response = session.post(f"{BASE}/_dash-update-component", json=rank_page_callback_body(country, category))
+    else:
+        response = session.get(f"{BASE}/")
+    response.raise_for_status()
+
+
+def start_server(mode, workers, log):
+    env = dict(os.environ, PYTHONUNBUFFERED='1', DASH_HOST='127.0.0.1', DASH_PORT=str(PORT),
+               WEB_CONCURRENCY=str(workers))
+    if mode == 'before':
+        command = [sys.executable, 'main.py']
+    else:
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:application']
+    return subprocess.Popen(command, cwd=UI_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+                            start_new_session=True)
+
+
+def wait_ready(process, timeout=300):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with {process.returncode}")
+        try:
+            requests.get(f"{BASE}/api/rank-page", timeout=5).raise_for_status()
+            return
+        except requests.RequestException:
+            time.sleep(0.5)
+    raise TimeoutError('server did not start')
+
+
+def server_processes(process):
+    """서버 프로세스와 자식 프로세스 (보조 프로세스와 그 하위는 제외)"""
+    processes = [process]
+    for child in process.children():
+        try:
+            if any(arg.endswith(HELPER_SCRIPTS) for arg in child.cmdline()):
+                continue
+        except psutil.NoSuchProcess:
+            continue
+        processes += server_processes(child)
+    return processes
+
+
+def wait_helpers(root, timeout=600):
+    """보조 프로세스(미리 렌더링 등)가 CPU 를 쓰는 동안에는 측정하지 않음"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        helpers = [child for child in root.children(recursive=True)
+                   if any(arg.endswith(HELPER_SCRIPTS) for arg in child.cmdline())]
+        if not helpers:
+            return
+        time.sleep(1)
+
+
+def run_load(duration, clients):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop = time.perf_counter() + duration
+
+    def client(seed):
+        rng = random.Random(seed)
+        session = requests.Session()
+        while time.perf_counter() < stop:
+            kind = rng.choice(('rank-api', 'rank-callback', 'rank-callback', 'index'))
+            start = time.perf_counter()
+            try:
+                send_request(session, kind, rng.choice(COUNTRIES), rng.choice(CATEGORIES))
+            except requests.RequestException:
+                with lock:
+                    errors[0] += 1
+                continue
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=client, args=(seed,)) for seed in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] if latencies else 0.0
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+    return len(latencies) / elapsed, p50, p95, errors[0]
+
+
+def run_mode(mode, duration, clients, workers):
+    with tempfile.TemporaryFile() as log:
+        process = start_server(mode, workers, log)
+        try:
+            wait_ready(process)
+            root = psutil.Process(process.pid)
+            wait_helpers(root)
+            # 첫 요청에서 만드는 캐시는 측정에서 제외
+            session = requests.Session()
+            for country in COUNTRIES:
+                for category in CATEGORIES:
+                    for kind in ('rank-api', 'rank-callback', 'index'):
+                        send_request(session, kind, country, category)
+
+            rps, p50, p95, errors = run_load(duration, clients)
+            memory = [process_memory(child.pid) for child in server_processes(root)]
+        finally:
+            os.killpg(process.pid, signal.SIGTERM)
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+                process.wait()
+
+    print(f"{mode:6s}: {rps:8.1f} req/s  p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  errors {errors}")
+    for info in memory:
+        print(f"        pid {info['pid']:>7}: rss {info['rss_mb']} MB, pss {info['pss_mb']} MB, uss {info['uss_mb']} MB")
+    pss = [info['pss_mb'] for info in memory if info['pss_mb'] is not None]
+    if pss:
+        print(f"        total pss {round(sum(pss), 1)} MB ({len(memory)} processes)")
+    return rps
+
+
+if __name__ == '__main__':
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else max(2, os.cpu_count())
+
+    with socket.socket() as sock:
+        if sock.connect_ex(('127.0.0.1', PORT)) == 0:
+            sys.exit(f"port {PORT} is already in use")
+
+    print(f"{clients} clients, {duration} s, gunicorn {workers} workers, {os.cpu_count()} cpu")
+    before = run_mode('before', duration, clients, workers)
+    after = run_mode('after', duration, clients, workers)
+    print(f"speedup: x{after / before:.2f}")
@@ -0,0 +1,99 @@
+"""
+댓글 요약 캐시 지연시간 / 동시 요청 합치기 확인 (OpenAI 대신 로컬 스텁 사용)
+
+cold     : 저장된 요약이 없을 때 (스텁 호출 지연 포함)
+warm     : SQLite 에 저장된 요약을 읽을 때
+restart  : 새 캐시 객체(프로세스 재시작과 같은 상태)로 같은 파일을 열었을 때
+coalesce : 같은 영상 요약을 여러 스레드가 동시에 요청했을 때 스텁 호출 횟수
+
+실행: python benchmarks/summary_cache_bench.py [스텁 지연(초)] [동시 요청 수]
+"""
+import os
+import sys
+import time
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Library import comments_summarizer
+from Library.snapshot_store import list_entries, comment_video_ids
+from Library.summary_cache import SummaryCache, SummaryStore
+
+
+class StubCompletion:
+    """지정한 시간만큼 기다렸다가 고정된 형식의 응답을 돌려주는 completion 스텁"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, video_id, model, comments):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        content = f"- {video_id} 댓글 {len(comments)}개 요약\n(긍정: 70 / 부정: 30)"
+        return comments_summarizer.parse_summary(content)
+
+
+def timed_ms(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def sample_videos(count=20):
+    videos = []
+    for entry in list_entries('comments'):
+        for video_id in comment_video_ids(entry):
+            videos.append((entry['country'], entry['category'], video_id))
+            if len(videos) >= count:
+                return videos
+    return videos
+
+
+if __name__ == '__main__':
+    delay = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'summaries.sqlite')
+        stub = StubCompletion(delay)
+        comments_summarizer.summary_cache = SummaryCache(
+            stub, comments_summarizer.PROMPT_VERSION, SummaryStore(db_path))
+
+        videos = sample_videos()
+        cold, warm = [], []
+        for country, category, video_id in videos:
+            cold_ms, summary = timed_ms(comments_summarizer.summarize_youtube_comments_by_id, video_id, country, category)
+            warm_ms, cached = timed_ms(comments_summarizer.summarize_youtube_comments_by_id, video_id, country, category)
+            assert cached == summary, (summary, cached)
+            cold.append(cold_ms)
+            warm.append(warm_ms)
+        print(f"{len(videos)} videos: cold {sum(cold) / len(cold):.1f} ms, warm {sum(warm) / len(warm):.2f} ms"
+              f" (stub calls {stub.calls})")
+
+        # 새 캐시 객체로 같은 SQLite 파일을 열어도 스텁을 다시 부르지 않아야 함
+        restarted = StubCompletion(delay)
+        comments_summarizer.summary_cache = SummaryCache(
+            restarted, comments_summarizer.PROMPT_VERSION, SummaryStore(db_path))
+        country, category, video_id = videos[0]
+        restart_ms, _ = timed_ms(comments_summarizer.summarize_youtube_comments_by_id, video_id, country, category)
+        print(f"restart: {restart_ms:.2f} ms (stub calls {restarted.calls})")
+
+        # 저장되지 않은 키에 동시 요청 -> 스텁 호출 1번
+        stub = StubCompletion(delay)
+        cache = SummaryCache(stub, comments_summarizer.PROMPT_VERSION, SummaryStore(db_path))
+        comments = [f"동시 요청 확인용 댓글 {i}" for i in range(10)]
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.summarize('coalesce', comments, 'stub')))
+                   for _ in range(concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        assert len(set(results)) == 1
+        print(f"coalesce: {concurrency} concurrent requests -> {stub.calls} stub call(s) in {elapsed:.2f} s,"
+              f" stats {cache.stats()}")
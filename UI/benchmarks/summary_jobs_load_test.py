@@ -0,0 +1,136 @@
+"""
+요약 클릭이 몰릴 때 다른 요청(순위 페이지)의 응답 지연 비교 (느린 completion 스텁 사용)
+
+main.py 와 같은 단일 스레드 run_simple 서버를 띄우고, 요약 클릭 여러 개를 동시에 보내는 동안
+/api/rank-page 를 주기적으로 호출해 응답 시간을 잰다
+
+before: 클릭 요청 안에서 요약 API 응답까지 기다리던 기존 방식 (벤치마크용 /_bench/summary-sync 경로로 재현)
+after : 클릭은 작업만 등록하고 summary-poll 이 상태를 조회하는 현재 콜백
+
+실행: python benchmarks/summary_jobs_load_test.py [스텁 지연(초)] [동시 클릭 수]
+"""
+import os
+import sys
+import time
+import socket
+import tempfile
+import threading
+import requests
+from flask import request, jsonify
+from werkzeug.serving import run_simple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+from new_tab import video_app
+from Library import comments_summarizer
+from Library.summary_cache import SummaryCache, SummaryStore
+from benchmarks.summary_cache_bench import StubCompletion, sample_videos
+
+PROBE_INTERVAL = 0.1
+
+
+@video_app.server.route('/_bench/summary-sync')
+def summary_sync():
+    args = request.args
+    return jsonify(comments_summarizer.summarize_youtube_comments_by_id(args['video_id'], args['country'], args['category']))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def summary_callback_body(trigger, video, job_id=None):
+    output_key = next(key for key in video_app.callback_map if 'summary-textbox.children' in key)
+    country, category, video_id = video
+    inputs = [{'id': 'show-summary-btn', 'property': 'n_clicks', 'value': 1},
+              {'id': 'summary-poll', 'property': 'n_intervals', 'value': 1}]
+    state = [{'id': 'videoId-value', 'property': 'children', 'value': video_id},
+             {'id': 'country_code', 'property': 'children', 'value': country},
+             {'id': 'category-value', 'property': 'children', 'value': category},
+             {'id': 'summary-job', 'property': 'data', 'value': job_id}]
+    return {
+        'output': output_key,
+        'outputs': [{'id': part.rsplit('.', 1)[0], 'property': part.rsplit('.', 1)[1]}
+                    for part in output_key.strip('.').split('...')],
+        'inputs': inputs,
+        'state': state,
+        'changedPropIds': [trigger],
+    }
+
+
+def click_before(base, video):
+    country, category, video_id = video
+    requests.get(f"{base}/new_tab/_bench/summary-sync",
+                 params={'video_id': video_id, 'country': country, 'category': category}).raise_for_status()
+
+
+def click_after(base, video):
+    url = f"{base}/new_tab/_dash-update-component"
+    response = requests.post(url, json=summary_callback_body('show-summary-btn.n_clicks', video))
+    response.raise_for_status()
+    job_id = response.json()['response']['summary-job']['data']
+    while job_id is not None:
+        time.sleep(PROBE_INTERVAL)
+        response = requests.post(url, json=summary_callback_body('summary-poll.n_intervals', video, job_id))
+        response.raise_for_status()
+        job_id = response.json()['response'].get('summary-job', {}).get('data', job_id)
+
+
+def run_scenario(base, click, videos):
+    latencies = []
+    clicking = threading.Event()
+    clicking.set()
+
+    def probe():
+        while clicking.is_set():
+            start = time.perf_counter()
+            requests.get(f"{base}/api/rank-page", params={'country': '전체', 'category': 'all'}).raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(PROBE_INTERVAL)
+
+    prober = threading.Thread(target=probe)
+    prober.start()
+    start = time.perf_counter()
+    clickers = [threading.Thread(target=click, args=(base, video)) for video in videos]
+    for thread in clickers:
+        thread.start()
+    for thread in clickers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    clicking.clear()
+    prober.join()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return elapsed, p50, p95, latencies[-1], len(latencies)
+
+
+if __name__ == '__main__':
+    delay = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    clicks = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    port = free_port()
+    server = threading.Thread(target=run_simple, args=('127.0.0.1', port, main.application), daemon=True)
+    server.start()
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(50):
+        try:
+            requests.get(f"{base}/api/rank-page", timeout=1)
+            break
+        except requests.ConnectionError:
+            time.sleep(0.1)
+
+    videos = sample_videos(clicks * 2)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, click, batch in [('before', click_before, videos[:clicks]), ('after', click_after, videos[clicks:])]:
+            # 매번 빈 저장소로 시작해서 모든 클릭이 스텁 호출까지 가게 함
+            comments_summarizer.summary_cache = SummaryCache(
+                StubCompletion(delay), comments_summarizer.PROMPT_VERSION,
+                SummaryStore(os.path.join(tmp, f'{name}.sqlite')))
+            elapsed, p50, p95, worst, count = run_scenario(base, click, batch)
+            print(f"[{name}] {len(batch)} clicks done in {elapsed:.2f} s;"
+                  f" rank-page p50 {p50:.1f} ms, p95 {p95:.1f} ms, max {worst:.1f} ms ({count} probes)")
+        print(f"summary jobs: {comments_summarizer.summary_jobs.stats()}")
@@ -0,0 +1,99 @@
+"""
+워드클라우드 토큰 가중치 집계 비교 (제목 100k 건, 댓글 1M 건)
+
+before: iterrows + 행마다 re.sub / int() / Counter 갱신하던 기존 루프
+after : word_visualization 의 배치 집계 (title_word_frequencies / comment_word_frequencies 와 같은 경로)
+
+두 결과의 Counter 가 키 순서까지 같은지 함께 확인
+댓글은 욕설 필터(clean_abusive_words) 비용이 양쪽에 똑같이 들어가므로 측정에서 제외하고 토큰 집계만 비교
+
+실행: python benchmarks/word_frequency_bench.py [제목 수] [댓글 수]
+"""
+import os
+import re
+import sys
+import time
+import numpy as np
+import pandas as pd
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Library.word_visualization import STOPWORDS, int_values, weighted_token_frequencies
+
+WORDS = ["뮤직비디오", "official", "MV", "Live", "무대", "영상", "the", "팬미팅", "highlights", "뉴스", "속보",
+         "a", "Game", "경기", "요약", "인터뷰", "Trailer", "예고편", "ㅋㅋ", "진짜", "love", "song", "완전", "최고"]
+DECORATIONS = ["", "!", " [4K]", " #shorts", " (Official Video)", " | EP.12", " 😂", " 2025"]
+
+
+def synthetic_texts(count, seed):
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS, dtype=object)
+    decorations = np.array(DECORATIONS, dtype=object)
+    lengths = rng.integers(1, 12, size=count)
+    picks = words[rng.integers(0, len(words), size=lengths.sum())]
+    texts, offset = [], 0
+    for length, decoration in zip(lengths, decorations[rng.integers(0, len(decorations), size=count)]):
+        texts.append(" ".join(picks[offset:offset + length]) + decoration)
+        offset += length
+    return texts
+
+
+def synthetic_titles(count, seed=0):
+    rng = np.random.default_rng(seed)
+    views = rng.integers(0, 50_000_000, size=count).astype('float64')
+    views[rng.random(count) < 0.01] = np.nan  # 조회수 누락 행
+    titles = pd.Series(synthetic_texts(count, seed), dtype=object)
+    titles[rng.random(count) < 0.001] = None  # 제목 누락 행 (str() 하면 'None')
+    return pd.DataFrame({'title': titles, 'viewCount': views})
+
+
+def synthetic_comments(count, seed=1):
+    rng = np.random.default_rng(seed)
+    likes = rng.integers(0, 5_000, size=count).astype('float64')
+    likes[rng.random(count) < 0.01] = np.nan
+    return pd.DataFrame({'comment_text': synthetic_texts(count, seed), 'comment_likes': likes})
+
+
+def loop_frequencies(df, text_column, weight_column, weight):
+    word_freq = Counter()
+    for _, row in df.iterrows():
+        text = str(row[text_column])
+        try:
+            value = int(row[weight_column])
+        except ValueError:
+            continue
+        for token in re.sub(r"[^가-힣a-zA-Z\s]", " ", text).lower().split():
+            if token not in STOPWORDS and len(token) > 1:
+                word_freq[token] += weight(value)
+    return word_freq
+
+
+def batch_frequencies(df, text_column, weight_column, weight):
+    values = int_values(df[weight_column])
+    valid = values.notna()
+    return weighted_token_frequencies(df.loc[valid, text_column].astype(str), weight(values[valid]))
+
+
+def compare(name, df, text_column, weight_column, loop_weight, batch_weight):
+    start = time.perf_counter()
+    before = loop_frequencies(df, text_column, weight_column, loop_weight)
+    before_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = batch_frequencies(df, text_column, weight_column, batch_weight)
+    after_sec = time.perf_counter() - start
+
+    identical = before == after and list(before) == list(after)
+    print(f"[{name} {len(df):,}] before {before_sec:.2f} s -> after {after_sec:.2f} s"
+          f" ({before_sec / after_sec:.1f}x faster), identical: {identical}")
+    return identical
+
+
+if __name__ == '__main__':
+    title_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    comment_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    ok = compare('titles', synthetic_titles(title_count), 'title', 'viewCount',
+                 lambda view: int(view * 0.001), lambda views: np.trunc(views * 0.001))
+    ok &= compare('comments', synthetic_comments(comment_count), 'comment_text', 'comment_likes',
+                  lambda like: int(1 + like * 0.01), lambda likes: np.trunc(1 + likes * 0.01))
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,70 @@
+"""
+드롭다운 변경 시 유튜버 순위 갱신 처리량 비교 (여러 세션이 동시에 선택을 바꾸는 상황)
+
+before: 선택마다 순위 테이블을 다시 읽어 iterrows 로 dict 목록을 만들고 DataFrame 으로 되돌려
+        전역 crawled_df 를 덮어쓰던 update_crwaled_data
+after : 세대별 공유 목록을 참조해 세션의 dcc.Store 로 보내는 update_youtuber_rotation
+
+실행: python benchmarks/youtuber_rotation_bench.py [세션 수] [세션당 선택 변경 수]
+"""
+import os
+import sys
+import time
+import itertools
+import threading
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+from Library.snapshot_store import read_table
+
+COUNTRY_TYPE = {"전체": "US", "한국": "KR", "미국": "US"}
+SELECTIONS = list(itertools.product(main.country_options, ['all', 'entertainment', 'news', 'people', 'music', 'comedy', 'sports']))
+
+
+def update_before(selected_country, selected_category):
+    # 기존 get_youtuber_Ranking + load_crawled_data (카테고리 매핑 없이 드롭다운 값을 그대로 사용)
+    df = read_table(COUNTRY_TYPE[selected_country], 'all' if selected_category == 'lge' else selected_category, "youtuber")
+    if df is None:
+        raise FileNotFoundError(selected_category)
+    results = []
+    for _, row in df.iterrows():
+        results.append({
+            'rank': row['rank'],
+            'channel_name': row['channelName'],
+            'channel_link': row['channelLink'],
+            'channel_image': row['channelImage'],
+            'video_link': row['videoLink'],
+            'thumbnail_url': row['thumbnailUrl']
+        })
+    return pd.DataFrame(results)
+
+
+def run(update, sessions, changes):
+    errors = []
+
+    def session(offset):
+        for i in range(changes):
+            try:
+                update(*SELECTIONS[(offset + i) % len(SELECTIONS)])
+            except FileNotFoundError:
+                errors.append(1)
+
+    threads = [threading.Thread(target=session, args=(offset,)) for offset in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return sessions * changes / elapsed, len(errors)
+
+
+if __name__ == '__main__':
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    before, before_errors = run(update_before, sessions, changes)
+    after, after_errors = run(main.update_youtuber_rotation, sessions, changes)
+    print(f"before: {before:,.0f} changes/s ({before_errors} failed: 'people' has no youtuber table)")
+    print(f"after : {after:,.0f} changes/s ({after_errors} failed)  ({after / before:.0f}x)")
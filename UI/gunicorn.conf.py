@@ -0,0 +1,48 @@
+"""
+gunicorn 설정 (실행: gunicorn -c gunicorn.conf.py wsgi:application)
+
+환경변수
+    DASH_HOST / DASH_PORT : 바인드 주소 (기본값 0.0.0.0:8050)
+    WEB_CONCURRENCY       : 워커 프로세스 수 (기본값 CPU 코어 수, 최소 2)
+    GUNICORN_THREADS      : 워커당 요청 처리 스레드 수 (기본값 8)
+
+preload 로 워커가 마스터의 첫 세대를 공유하는 것은 첫 /refresh 전까지만이고, 그 뒤에는 워커마다
+새 세대(데이터프레임, 순위 파티션, 워드클라우드 캐시)를 따로 만들어서 메모리/CPU 가 워커 수에 비례해 늘어남.
+그래서 워커는 적게, 워커당 스레드는 많게 두고, 워커를 늘릴 때는 워커 하나의 pss(/metrics/memory) 를 보고 정함
+"""
+import os
+import gc
+import multiprocessing
+
+from Library.process_memory import process_memory
+from Library.comment_wordcloud_store import prerender_async
+
+bind = f"{os.environ.get('DASH_HOST', '0.0.0.0')}:{os.environ.get('DASH_PORT', '8050')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', max(2, multiprocessing.cpu_count())))
+# 요약 상태 조회처럼 짧은 요청이 긴 콜백 뒤에서 기다리지 않도록 워커마다 스레드 몇 개로 처리
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+# 마스터에서 데이터셋을 한 번 만든 뒤 fork (첫 refresh 전까지 워커가 CSV/Arrow 를 다시 읽지 않고 메모리 페이지를 공유)
+preload_app = True
+# 첫 렌더링이 느린 차트 콜백이 있으므로 기본값(30초)보다 길게
+timeout = 120
+graceful_timeout = 30
+accesslog = None
+errorlog = '-'
+
+
+def when_ready(server):
+    # 시작 시 댓글 워드클라우드 미리 렌더링은 마스터에서 한 번만 (워커는 /refresh 를 받았을 때만 다시 실행)
+    prerender_async()
+    # preload 로 만든 객체를 GC 대상에서 빼서, 워커의 GC 가 공유 페이지의 객체 헤더를 건드려 복사되지 않게 함
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"[gunicorn] master memory: {process_memory()}")
+
+
+def post_worker_init(worker):
+    worker.log.info(f"[gunicorn] worker {worker.pid} ready: {process_memory()}")
+
+
+def worker_exit(server, worker):
+    server.log.info(f"[gunicorn] worker {worker.pid} exit: {process_memory()}")
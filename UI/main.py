@@ -3,16 +3,30 @@ from dash import html, dcc, Input, Output, dash_table, State, ctx
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-import os
-import glob
+import numpy as np
 import urllib.parse
-from Library.web_crawl import get_youtuber_Ranking
+from Library.web_crawl import get_youtuber_Ranking, load_ranking_tables, ranking_table_key
+from Library.snapshot_store import (ingest_snapshot, list_entries, read_entry, manifest_generation, snapshot_lock,
+                                    snapshot_path)
+from Library.dataset_holder import DatasetHolder, FileStatusStore
+from Library.lru_cache import LRUCache
+from Library.rank_pages import RankPartition, PAGE_SIZE, row_cursor
+from Library.figure_cache import FigureCache
+from Library.video_index import get_video_index
 from werkzeug.middleware.dispatcher import DispatcherMiddleware
-from werkzeug.serving import run_simple
-from Library.word_visualization import generate_Title_WC
+from werkzeug.serving import run_simple, is_running_from_reloader
+from flask import jsonify, request
+from Library.wordcloud_cache import WordCloudCache
+from Library.comment_wordcloud_store import prerender_async
 from new_tab import video_app
+from Library.comments_summarizer import summary_cache, summary_jobs
+from Library.bulk_summarizer import presummarize_async
+from Library.process_memory import process_memory
 import traceback
 
+# 세대 프레임은 모든 세션이 공유하므로 copy-on-write 로 필터 결과가 원본 데이터를 복사/수정하지 않게 함
+pd.set_option('mode.copy_on_write', True)
+
 # 카테고리 한글 이름 매핑
 category_names = {
     'all': '전체',
@@ -25,55 +39,104 @@ category_names = {
     'lge': 'LG전자'
 }
 
+# 드롭다운 카테고리 -> 데이터의 category 값 매핑
+category_mapping = {
+    'all': 'all',
+    'entertainment': 'entertainment',
+    'news': 'news',
+    'people': 'people_blogs',
+    'music': 'music',
+    'comedy': 'comedy',
+    'sports': 'sports',
+    'lge': 'lge'
+}
+
+country_options = ['전체', '한국', '미국']
+
+# 스냅샷 테이블(Arrow 파일명)별로 가공해 둔 파티션, 파일명에 내용 해시가 들어가므로
+# 이름이 같으면 내용도 같음 -> 바뀐 파일만 다시 가공
+video_partitions = {}
+# 마지막으로 합친 결과 (파티션 구성이 같으면 그대로 재사용)
+combined_cache = {'key': None, 'frames': None}
+
+# 히트맵 시간대 구간 크기(시간)와 구간 이름 ("00:00~03:00" ...)
+TIME_SLOT_HOURS = 3
+TIME_SLOT_LABELS = [f"{hour:02d}:00~{hour + TIME_SLOT_HOURS:02d}:00" for hour in range(0, 24, TIME_SLOT_HOURS)]
+
+# 발행 시각(hour)을 시간대 이름으로 변환 (정수 나눗셈으로 한 번에 계산)
+def to_time_slot(hours):
+    # 시간 정보가 없는 행은 기존과 같이 마지막 시간대로 집계
+    codes = (hours // TIME_SLOT_HOURS).fillna(len(TIME_SLOT_LABELS) - 1).astype('int64')
+    return pd.Categorical.from_codes(codes, categories=TIME_SLOT_LABELS)
+
+# 게시 시각을 한 번만 파싱해 차트가 쓰는 시간 컬럼을 미리 계산
+def add_time_columns(df):
+    published_at = pd.to_datetime(df['published_at'], utc=True, errors='coerce')
+    df['published_at'] = published_at
+    df['hour'] = published_at.dt.hour.astype('Int8')
+    df['time_slot'] = to_time_slot(df['hour'])
+    df['weekday'] = published_at.dt.weekday.astype('Int8')  # 0 = 월요일
+    df['date'] = published_at.dt.normalize()
+    return df
+
+# 스냅샷 테이블 하나를 대시보드용 프레임으로 가공
+def prepare_video_partition(entry):
+    df = read_entry(entry)
+    
+    # 컬럼 이름 변경 및 매핑
+    df = df.rename(columns={
+        'id': 'video_id',
+        'channelTitle': 'channel',
+        'viewCount': 'views',
+        'likeCount': 'likes',
+        'publishedAt': 'published_at'
+    })
+    
+    # 필요한 컬럼만 선택
+    df = df[['video_id', 'title', 'channel', 'category', 'views', 'likes', 'description', 'url', 'published_at', 'country']]
+    
+    # manifest 에서 국가와 카테고리 추출
+    country = entry['country']  # KR 또는 US
+    df['category_name'] = entry['category']  # 주간 데이터는 'weekly'
+    df['country_name'] = '한국' if country == 'KR' else '미국'
+    return add_time_columns(df)
+
 # 데이터 로드
 def load_data():
-    # 현재 스크립트의 디렉토리 경로를 가져옴
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(current_dir, 'youtube_data')
+    # 배치가 새로 떨어뜨린 CSV 만 Arrow 스냅샷으로 변환 (이후에는 CSV 를 다시 파싱하지 않음)
+    manifest = ingest_snapshot()
+    entries = list_entries('video')
+    print(f"Snapshot generation {manifest['generation']}: {len(entries)} video tables")
     
-    print(f"Looking for data files in: {data_dir}")
-    data_files = glob.glob(os.path.join(data_dir, '*_video.csv'))
-    print(f"Found {len(data_files)} data files")
+    partitions = {}
+    for entry in entries:
+        df = video_partitions.get(entry['file'])
+        if df is None:
+            try:
+                df = prepare_video_partition(entry)
+                print(f"Loaded {len(df)} rows from {entry['file']}")
+            except Exception as e:
+                print(f"Error processing table {entry['file']}: {str(e)}")
+                continue
+        partitions[entry['file']] = (entry['category'], df)
     
-    all_data = []
-    weekly_data = []
+    reused = len(set(partitions) & set(video_partitions))
+    print(f"Partitions: {len(partitions) - reused} rebuilt, {reused} reused")
+    video_partitions.clear()
+    video_partitions.update({name: df for name, (_, df) in partitions.items()})
     
-    for file in data_files:
-        print(f"Processing file: {file}")
-        try:
-            df = pd.read_csv(file, encoding='utf-8-sig')
-            print(f"Successfully loaded {len(df)} rows from {file}")
-            
-            # 컬럼 이름 변경 및 매핑
-            df = df.rename(columns={
-                'id': 'video_id',
-                'channelTitle': 'channel',
-                'viewCount': 'views',
-                'likeCount': 'likes',
-                'publishedAt': 'published_at'
-            })
-            
-            # 필요한 컬럼만 선택
-            df = df[['video_id', 'title', 'channel', 'category', 'views', 'likes', 'description', 'url', 'published_at', 'country']]
-            
-            # 파일명에서 국가와 카테고리 추출
-            file_name = os.path.basename(file)  # 파일 이름만 추출
-            country = file_name.split('_')[0]  # KR 또는 US
-            category = file_name.split('_')[1] if len(file_name.split('_')) > 1 else 'weekly'
-            
-            if 'weekly' in file_name:
-                df['category_name'] = 'weekly'
-                df['country_name'] = '한국' if country == 'KR' else '미국'
-                weekly_data.append(df)
-                print(f"Added to weekly data: {len(df)} rows")
-            else: 
-                df['category_name'] = category
-                df['country_name'] = '한국' if country == 'KR' else '미국'
-                all_data.append(df)
-                print(f"Added to all data: {len(df)} rows")
-                
-        except Exception as e:
-            print(f"Error processing file {file}: {str(e)}")
+    # 제목 워드클라우드가 현재 manifest 가 아니라 이 세대와 같은 테이블을 읽도록 원본 테이블도 함께 반환
+    # (read_entry 캐시의 공유 객체라 추가로 읽지 않음)
+    video_tables = {(entry['country'], entry['category']): read_entry(entry)
+                    for entry in entries if entry['file'] in partitions}
+    
+    # 파티션 구성이 그대로면 이전에 합친 프레임을 그대로 반환
+    key = tuple(partitions)
+    if combined_cache['key'] == key:
+        return combined_cache['frames'], video_tables
+    
+    all_data = [df for category, df in partitions.values() if category != 'weekly']
+    weekly_data = [df for category, df in partitions.values() if category == 'weekly']
     
     print(f"Total all_data rows: {sum(len(df) for df in all_data)}")
     print(f"Total weekly_data rows: {sum(len(df) for df in weekly_data)}")
@@ -81,17 +144,140 @@ def load_data():
     if not all_data and not weekly_data:
         raise ValueError("No data was loaded from any files")
     
-    return pd.concat(all_data, ignore_index=True).drop_duplicates(subset='title') if all_data else pd.DataFrame(), pd.concat(weekly_data, ignore_index=True) if weekly_data else pd.DataFrame()
+    frames = (pd.concat(all_data, ignore_index=True).drop_duplicates(subset='title') if all_data else pd.DataFrame(), pd.concat(weekly_data, ignore_index=True) if weekly_data else pd.DataFrame())
+    combined_cache.update(key=key, frames=frames)
+    return frames, video_tables
+
+# 세션에 저장해 비교하는 세대 키 (워커마다 세대 id 가 다르므로 워커와 상관없이 같은 원본 버전(manifest generation)을 사용)
+def dataset_generation_key(generation):
+    return generation.source_version if generation.source_version is not None else generation.generation_id
 
 # 크롤링 데이터 로드 함수 추가
-def load_crawled_data(country, category):
-    crawled_data = get_youtuber_Ranking(country, category)
-    return pd.DataFrame(crawled_data)
+# 유튜버 순위 테이블은 세대를 만들 때 한 번만 읽으므로 드롭다운 변경은 디스크를 읽지 않고 공유 테이블을 참조만 함
+def load_crawled_data(country, category, generation=None):
+    generation = generation or dataset.current()
+    return get_youtuber_Ranking(country, category_mapping.get(category, 'all'), generation.ranking_tables)
 
-# 데이터 로드
-df, weekly_df = load_data()
+# 데이터셋 세대 구성 (refresh 시 백그라운드에서 새로 만들어 통째로 교체)
+def build_dataset():
+    (df, weekly_df), video_tables = load_data()
+    ranking_tables = load_ranking_tables()
+    return {
+        'df': df,
+        'weekly_df': weekly_df,
+        'video_tables': video_tables,
+        'ranking_tables': ranking_tables,
+        # 영상 화면이 쓰는 video_id 인덱스를 세대를 만들 때 미리 준비 (새 탭 앱도 get_video_index 로 같은 객체를 받음)
+        'video_index': get_video_index(),
+    }
 
-crawled_df = load_crawled_data("전체", "all")
+# 발행 전 검증 (실패하면 이전 세대를 그대로 유지)
+def validate_dataset(generation):
+    required_columns = {'video_id', 'title', 'views', 'likes', 'category', 'url', 'published_at', 'category_name', 'country_name',
+                        'hour', 'time_slot'}
+    if generation.df.empty:
+        raise ValueError("video data is empty")
+    missing_columns = required_columns - set(generation.df.columns)
+    if missing_columns:
+        raise ValueError(f"missing columns: {sorted(missing_columns)}")
+    if get_youtuber_Ranking("전체", "all", generation.ranking_tables).empty:
+        raise ValueError("youtuber ranking data is empty")
+
+# 순위 테이블 파티션: (세대, 국가, 카테고리) -> 조회수 내림차순 정렬 + rank/video_id 계산 완료 프레임
+# 세션끼리 공유하므로 드롭다운/페이지 이동은 캐시 조회와 O(page_size) 슬라이스만 수행
+rank_partition_cache = LRUCache(max_entries=64)
+
+def build_rank_partition(df, selected_country, selected_category):
+    category = category_mapping.get(selected_category, 'all')
+    
+    # 데이터 필터링
+    mask = df['category'] == category
+    if selected_country != '전체':
+        mask &= df['country_name'] == selected_country
+    
+    # video_id 는 적재할 때 원본 'id' 컬럼에서 가져온 값을 그대로 사용
+    partition = df.loc[mask, ['title', 'channel', 'views', 'likes', 'category', 'video_id']]
+    
+    # 순위 계산 (video_id 를 보조 키로 써서 keyset 커서가 가리키는 순서를 고정)
+    partition = partition.sort_values(['views', 'video_id'], ascending=[False, True], na_position='last')
+    partition.insert(0, 'rank', range(1, len(partition) + 1))
+    return RankPartition(partition.reset_index(drop=True))
+
+def get_rank_partition(data, selected_country, selected_category):
+    return rank_partition_cache.get_or_create(
+        (data.generation_id, selected_country, selected_category),
+        lambda: build_rank_partition(data.df, selected_country, selected_category)
+    )
+
+# 새 세대 발행 시 이전 세대 파티션을 버리고 모든 (국가, 카테고리) 파티션을 미리 생성
+def warm_rank_partitions(generation):
+    rank_partition_cache.discard_where(lambda key: key[0] != generation.generation_id)
+    for selected_country in country_options:
+        for selected_category in category_names:
+            get_rank_partition(generation, selected_country, selected_category)
+
+# 유튜버 순위 회전 목록: (세대, 순위 테이블 국가 코드, 카테고리) -> 순위 순으로 렌더링을 끝낸 표 행 목록
+# 세션끼리 공유하는 읽기 전용 목록이고, 세션별 선택과 목록은 각 브라우저의 dcc.Store 에만 있음
+# 목록 전체를 클라이언트로 한 번 보내고, 회전은 브라우저에서 배열 인덱스로 처리
+youtuber_rows_cache = LRUCache(max_entries=64)
+
+def render_youtuber_rows(table):
+    return [{
+        'rank': row['rank'],
+        'channel_name': f"[{row['channel_name']}]({row['channel_link']})",
+        'channel_image': f"[![{row['channel_name']}]({row['channel_image']})]({row['channel_link']})",
+        'channel_link': row['channel_link']
+    } for row in table.to_dict('records')]
+
+def get_youtuber_rows(generation, selected_country, selected_category):
+    # '전체'와 '미국'처럼 같은 순위 테이블을 보는 선택은 같은 목록을 공유
+    key = ranking_table_key(selected_country, category_mapping.get(selected_category, 'all'))
+    return youtuber_rows_cache.get_or_create(
+        (generation.generation_id,) + key,
+        lambda: render_youtuber_rows(load_crawled_data(selected_country, selected_category, generation))
+    )
+
+# 차트 figure 캐시: (차트, 세대, 입력값) -> figure JSON
+figure_cache = FigureCache()
+
+# 워드클라우드 캐시: (세대, 국가, 카테고리) -> 토큰 가중치, (가중치, 크기, 단어 수) -> PNG
+wordcloud_cache = WordCloudCache()
+WORDCLOUD_SIZE = (350, 250)
+# 워드클라우드는 국가별 제목 테이블을 쓰므로 '전체'는 한국 데이터로 표시
+wordcloud_country_mapping = {
+    '한국': 'KR',
+    '미국': 'US',
+    '전체': 'KR'  # 기본값
+}
+
+def on_dataset_published(generation):
+    warm_rank_partitions(generation)
+    youtuber_rows_cache.discard_where(lambda key: key[0] != generation.generation_id)
+    # 이전 세대로 만든 figure 는 더 이상 쓰지 않음
+    figure_cache.clear()
+    # 워드클라우드는 렌더링이 느리므로 발행을 막지 않고 백그라운드에서 미리 생성
+    wordcloud_cache.warm_async(
+        generation.generation_id,
+        [(country, category) for country in ('KR', 'US') for category in dict.fromkeys(category_mapping.values())],
+        WORDCLOUD_SIZE,
+        tables=generation.video_tables
+    )
+
+# /refresh 를 받은 프로세스가 새 세대를 발행했을 때만 실행 (다른 워커가 따라 만든 세대에서는 실행하지 않음)
+def on_dataset_refreshed(generation):
+    # 새 스냅샷의 영상별 댓글 워드클라우드를 별도 프로세스에서 미리 렌더링 (새 탭은 저장된 이미지를 바로 사용)
+    # 시작 시 첫 렌더링은 import 가 아니라 gunicorn when_ready / 개발 서버 시작에서 실행
+    prerender_async()
+
+# 데이터 로드
+# gunicorn 워커 여러 개로 띄우면 /refresh 를 받은 워커만 새 세대를 만들므로
+# 나머지 워커는 스냅샷 manifest generation 이 바뀐 것을 보고 각자 새 세대를 만듦 (refresh_if_changed)
+# refresh 상태는 manifest generation 을 키로 스냅샷 폴더의 파일에 기록해서 어느 워커에서나 조회됨
+dataset = DatasetHolder(build_dataset, validate_dataset, on_publish=on_dataset_published,
+                        on_refresh=on_dataset_refreshed, version=manifest_generation,
+                        status_store=FileStatusStore(snapshot_path('dataset_status.json'),
+                                                     lambda: snapshot_lock('dataset-status')))
+dataset.load()
 
 # Dash 앱 생성
 app = dash.Dash(__name__, 
@@ -648,8 +834,9 @@ app.layout = html.Div([
                 html.Button('다음', id='next-page', style=styles['paginationButton'])
             ], style=styles['pagination']),
             
-            dcc.Store(id='current-page', data=0),  # 현재 페이지 저장
+            dcc.Store(id='page-cursor'),  # 요청할 페이지의 keyset 커서 저장
             dcc.Store(id='total-pages', data=0),  # 총 페이지 수 저장
+            dcc.Store(id='dataset-generation'),  # 마지막 순위 페이지 응답의 데이터셋 세대 (바뀌었을 때만 갱신)
             dcc.Store(id='clicked-url'),
             
             # 실시간 인기 유튜버 테이블과 카테고리별 통계 차트를 포함하는 컨테이너
@@ -672,11 +859,7 @@ app.layout = html.Div([
                                 {'name': '채널명', 'id': 'channel_name', 'width': '200px', 'presentation': 'markdown'},
                                 {'name': '채널 이미지', 'id': 'channel_image', 'presentation': 'markdown', 'width': '200px'}
                             ],
-                            data=[{
-                                'rank': row['rank'],
-                                'channel_name': f"[{row['channel_name']}]({row['channel_link']})",
-                                'channel_image': f"[![{row['channel_name']}]({row['channel_image']})]({row['channel_link']})"
-                            } for row in crawled_df.to_dict('records')],
+                            data=get_youtuber_rows(dataset.current(), '전체', 'all'),
                             markdown_options={'html': True, 'link_target': '_blank'},
                             style_table={
                                 'border': 'none',
@@ -764,6 +947,7 @@ app.layout = html.Div([
                         interval=1700,
                         n_intervals=0
                     ),
+                    dcc.Store(id='youtuber-rotation'),  # 이 세션이 선택한 국가/카테고리와 유튜버 순위 회전 목록
                     # 시간대별 조회수 분석 그래프 추가
                     html.Div([
                         html.H3("시간대별 평균 조회수", style={
@@ -897,7 +1081,7 @@ app.layout = html.Div([
                                 ], style=styles['videoCard'])
                             ]
                         )
-                        for _, row in weekly_df.iterrows()
+                        for _, row in dataset.current().weekly_df.iterrows()
                     ], style=styles['videoGrid'])
                 ], style={**styles['videoGridContainer'], 'height': '680px'}),
             ], style=styles['videoList'])
@@ -977,8 +1161,7 @@ app.layout = html.Div([
         'borderRadius': '15px',
         'marginTop': '15px'
     }),
-    html.Div(id='dummy-output', style={'display': 'none'}),
-    html.Div(id='dummy-output-2', style={'display': 'none'})
+    html.Div(id='dummy-output', style={'display': 'none'})
 ], style=styles['container'])
 
 # 새탭 열기
@@ -998,134 +1181,76 @@ def open_new_tab(active_cell, table_data, selected_country, selected_category):
     if row >= len(table_data):
         return dash.no_update
         
-    title = table_data[row].get('title')
-    if not title:
+    # 순위 테이블 행에 들어 있는 video_id 를 그대로 사용 (데이터프레임 조회 없음)
+    video_id = table_data[row].get('video_id')
+    if not video_id:
         return dash.no_update
-        
-    # 해당 title에 맞는 URL을 가져오되, 여러 값이 있을 경우 첫 번째 값만 선택
-    url_series = df[df['title'] == title]['url']
-    if url_series.empty:
-        return dash.no_update
-        
-    video_id = url_series.iloc[0].split('v=')[-1]
+    title = table_data[row].get('title') or ''
     # 새 탭에서 열릴 Dash 앱의 URL을 생성
     new_tab_url = f'/new_tab?video_id={video_id}&country={selected_country}&category={selected_category}&video_title={urllib.parse.quote(title)}'
     return {'url': new_tab_url}
 
-# 드롭다운 변경 시 페이지 초기화를 위한 콜백
+# 드롭다운 변경/페이지 이동 시 요청할 페이지의 keyset 커서 생성
 @app.callback(
-    Output('current-page', 'data'),
+    Output('page-cursor', 'data'),
     [Input('country-dropdown', 'value'),
      Input('category-dropdown', 'value'),
      Input('prev-page', 'n_clicks'),
      Input('next-page', 'n_clicks')],
-    [State('current-page', 'data'),
-     State('rank-table', 'data'),
+    [State('rank-table', 'data'),
      State('total-pages', 'data')],
     prevent_initial_call=True
 )
-def update_pagination(country, category, prev_clicks, next_clicks, current_page, data, total_pages):
+def update_pagination(country, category, prev_clicks, next_clicks, data, total_pages):
     triggered_id = ctx.triggered_id
+    cursor_request = {'country': country, 'category': category}
     
-    # 드롭다운이 변경된 경우
-    if triggered_id in ['country-dropdown', 'category-dropdown']:
-        return 0  # 1페이지(인덱스 0)로 초기화
+    # 드롭다운이 변경된 경우 1페이지로 초기화
+    if triggered_id in ['country-dropdown', 'category-dropdown'] or not data:
+        return cursor_request
     
-    # 페이지 이동 버튼이 클릭된 경우
-    if not data:
-        return 0
-        
+    # 현재 페이지의 첫/마지막 행을 커서로 사용
+    current_page = (int(data[0]['rank']) - 1) // PAGE_SIZE
     if triggered_id == 'prev-page' and current_page > 0:
-        current_page -= 1
+        cursor_request['before'] = row_cursor(data[0])
     elif triggered_id == 'next-page' and current_page < total_pages - 1:
-        current_page += 1
+        cursor_request['after'] = row_cursor(data[-1])
+    else:
+        return dash.no_update
     
-    return current_page
+    return cursor_request
 
-current_filtered_df = None
-current_filter_key = None
-# 테이블 업데이트 콜백
+# 순위 테이블 페이지 콜백 (산점도는 다시 만들지 않음)
 @app.callback(
     [Output('rank-table', 'data'),
-     Output('scatter-plot', 'figure'),
-     Output('table-title', 'children'),
-     Output('category-dropdown', 'value'),
      Output('rank-table', 'active_cell'),
      Output('page-info', 'children'),
-     Output('total-pages', 'data')],
-    [Input('country-dropdown', 'value'),
-     Input('category-dropdown', 'value'),
-     Input('rank-table', 'active_cell'),
-     Input('current-page', 'data')]
+     Output('total-pages', 'data'),
+     Output('dataset-generation', 'data')],
+    [Input('page-cursor', 'data')],
+    [State('country-dropdown', 'value'),
+     State('category-dropdown', 'value'),
+     State('dataset-generation', 'data')]
 )
-def update_table_and_graph(selected_country, selected_category, active_cell, page_current):
-    global current_filtered_df, current_filter_key
-    
-    # 현재 필터 키 생성
-    filter_key = f"{selected_country}_{selected_category}"
-    
-    # 필터가 변경되었거나 페이지가 변경된 경우 active_cell을 None으로 설정
-    triggered_id = ctx.triggered_id
-    if triggered_id in ['country-dropdown', 'category-dropdown'] or triggered_id == 'current-page':
-        active_cell = None
-    
-    # 필터가 변경된 경우에만 데이터 재계산
-    if current_filter_key != filter_key:
-        category_mapping = {
-            'all': 'all',
-            'entertainment': 'entertainment',
-            'news': 'news',
-            'people': 'people_blogs',
-            'music': 'music',
-            'comedy': 'comedy',
-            'sports': 'sports',
-            'lge': 'lge'
-        }
-
-        category = category_mapping.get(selected_category, 'all')
-        
-        # 데이터 필터링
-        if category=='all':
-            filtered_df = df[df['category'] == 'all']
-            if selected_country != '전체':
-                filtered_df = filtered_df[filtered_df['country_name'] == selected_country]
-        elif category != 'all':
-            filtered_df = df[df['category'] == category]
-            if selected_country != '전체':
-                filtered_df = filtered_df[filtered_df['country_name'] == selected_country]
-        
-        # 순위 계산
-        filtered_df = filtered_df.sort_values('views', ascending=False)
-        filtered_df['rank'] = range(1, len(filtered_df) + 1)
-        
-        # video_id 추가
-        filtered_df['video_id'] = filtered_df['url'].apply(lambda x: x.split('v=')[-1])
-        
-        # 전역 변수 업데이트
-        current_filtered_df = filtered_df
-        current_filter_key = filter_key
-    else:
-        filtered_df = current_filtered_df
-    
-    # 페이지 정보 계산
-    page_size = 10
-    total_pages = (len(filtered_df) + page_size - 1) // page_size
+def update_rank_page(cursor_request, selected_country, selected_category, known_generation=None):
+    cursor_request = cursor_request or {}
+    selected_country = cursor_request.get('country', selected_country)
+    selected_category = cursor_request.get('category', selected_category)
     
-    # 테이블 데이터 준비 (페이지네이션 적용)
-    start_idx = page_current * page_size
-    end_idx = start_idx + page_size
-    table_data = filtered_df[['rank', 'title', 'channel', 'views', 'likes', 'category', 'video_id']].iloc[start_idx:end_idx].to_dict('records')
+    data = dataset.current()
+    partition = get_rank_partition(data, selected_country, selected_category)
+    table_data, start = partition.page(after=cursor_request.get('after'), before=cursor_request.get('before'))
     
     # 페이지 정보 업데이트
-    current_page_display = page_current + 1
-    page_info = f'{current_page_display} 페이지 / {total_pages} 페이지'
-    
-    # 테이블 제목 설정
-    category_text = category_names[selected_category]
-    if category_text == '전체':
-        category_text = ''
-    table_title = f"{selected_country} {category_text} 인기 동영상 순위"
+    total_pages = partition.total_pages
+    page_info = f'{start // PAGE_SIZE + 1} 페이지 / {total_pages} 페이지'
     
+    # 세대가 바뀐 경우에만 내려보내서 유튜버 순위 회전 목록 콜백을 다시 실행시킴 (페이지 이동은 추가 요청 없음)
+    generation = dataset_generation_key(data)
+    return table_data, None, page_info, total_pages, dash.no_update if generation == known_generation else generation
+
+# 산점도 생성 (순위 파티션 상위 50개)
+def build_scatter_figure(filtered_df):
     # 산점도 생성
     fig = px.scatter(
         filtered_df.head(50),
@@ -1176,100 +1301,86 @@ def update_table_and_graph(selected_country, selected_category, active_cell, pag
             )
         )
     
-    return (table_data, fig, table_title, 
-            selected_category, active_cell, page_info, total_pages)
-
-# 유튜버 테이블 자동 순환 콜백
-@app.callback(
-    Output('youtuber-table', 'data'),
-    [Input('interval-component', 'n_intervals')],
-    [State('youtuber-table', 'data')]
-)
-def update_youtuber_table(n_intervals, current_data):
-    if not current_data:
-        return []
-    
-    current_rank = int(current_data[0]['rank'])
-    next_rank = (current_rank % len(crawled_df)) + 1
-    next_data = [row for row in crawled_df.to_dict('records') if int(row['rank']) == next_rank]
-    
-    if next_data:
-        return [{
-            'rank': next_data[0]['rank'],
-            'channel_name': f"[{next_data[0]['channel_name']}]({next_data[0]['channel_link']})",
-            'channel_image': f"[![{next_data[0]['channel_name']}]({next_data[0]['channel_image']})]({next_data[0]['channel_link']})"
-        }]
-    
-    return current_data
+    return fig
 
-# 콜백 함수
+# 산점도/테이블 제목 업데이트 콜백 (드롭다운 변경 시에만 실행)
 @app.callback(
-    Output('category-pie-chart', 'figure'),
+    [Output('scatter-plot', 'figure'),
+     Output('table-title', 'children')],
     [Input('country-dropdown', 'value'),
      Input('category-dropdown', 'value')]
 )
-def update_pie_chart(selected_country, selected_category):
-    # 데이터 필터링
-    filtered_df = df.copy()
-    if selected_country != '전체':
-        filtered_df = filtered_df[filtered_df['country_name'] == selected_country]
+def update_graph_and_title(selected_country, selected_category):
+    data = dataset.current()
     
-    # '전체'와 'LG전자' 카테고리 제외
-    filtered_df = filtered_df[~filtered_df['category_name'].isin(['all', 'lge'])]
-    
-    # 시간대를 3시간 단위로 그룹화
-    def get_time_slot(hour):
-        if 0 <= hour < 3:
-            return "00:00~03:00"
-        elif 3 <= hour < 6:
-            return "03:00~06:00"
-        elif 6 <= hour < 9:
-            return "06:00~09:00"
-        elif 9 <= hour < 12:
-            return "09:00~12:00"
-        elif 12 <= hour < 15:
-            return "12:00~15:00"
-        elif 15 <= hour < 18:
-            return "15:00~18:00"
-        elif 18 <= hour < 21:
-            return "18:00~21:00"
-        else:
-            return "21:00~24:00"
-    
-    # 시간대 그룹화
-    filtered_df['hour'] = pd.to_datetime(filtered_df['published_at']).dt.hour
-    filtered_df['time_slot'] = filtered_df['hour'].apply(get_time_slot)
-    
-    # 시간대별 카테고리별 동영상 수 계산
-    heatmap_data = filtered_df.groupby(['time_slot', 'category_name']).size().unstack(fill_value=0)
+    # 테이블 제목 설정
+    category_text = category_names[selected_category]
+    if category_text == '전체':
+        category_text = ''
+    table_title = f"{selected_country} {category_text} 인기 동영상 순위"
     
-    # 카테고리 이름을 한글로 변환
-    heatmap_data.columns = [category_names.get(category, category) for category in heatmap_data.columns]
+    # 공유 파티션 캐시에서 정렬/순위 계산이 끝난 프레임으로 산점도 생성
+    fig = figure_cache.get_or_build(
+        'scatter', (data.generation_id, selected_country, selected_category),
+        lambda: build_scatter_figure(get_rank_partition(data, selected_country, selected_category).frame)
+    )
+    return fig, table_title
+
+# 유튜버 테이블 자동 순환 콜백 (브라우저에서 회전 목록의 다음 행을 고르므로 주기적인 서버 요청이 없음)
+app.clientside_callback(
+    """
+    function(n_intervals, rotation) {
+        var rows = rotation && rotation.rows;
+        if (!rows || rows.length === 0) {
+            return window.dash_clientside.no_update;
+        }
+        return [rows[(n_intervals || 0) % rows.length]];
+    }
+    """,
+    Output('youtuber-table', 'data'),
+    Input('interval-component', 'n_intervals'),
+    Input('youtuber-rotation', 'data')
+)
+
+# 콜백 함수
+# 시간대 x 카테고리 동영상 수 표로 히트맵 생성
+def build_time_category_heatmap(heatmap_data):
+    counts = heatmap_data.to_numpy()
     
     # 데이터 정규화 (0-1 사이의 값으로 변환)
-    max_val = heatmap_data.values.max()
-    normalized_data = heatmap_data.values / max_val if max_val > 0 else heatmap_data.values
+    max_val = counts.max() if counts.size else 0
+    normalized_data = counts / max_val if max_val > 0 else counts
     
     # 히트맵 생성
     fig = go.Figure()
     
     # 히트맵 트레이스 추가
     fig.add_trace(go.Heatmap(
-        z=heatmap_data.values,
-        x=heatmap_data.columns,
-        y=heatmap_data.index,
+        z=counts,
+        x=list(heatmap_data.columns),
+        y=list(heatmap_data.index),
         colorscale=[
             [0, '#1f1f1f'],
             [0.4, '#ff0000'],
             [0.6, '#ff4444'],
             [1, '#ffffff']
         ],
-        text=heatmap_data.values,
+        text=counts,
         texttemplate='%{text}',
         textfont={'size': 12},
         hovertemplate='시간대: %{y}<br>카테고리: %{x}<br>동영상 수: %{z}<extra></extra>'
     ))
     
+    # 텍스트 색상 조정: 밝은 칸은 검정, 어두운 칸은 흰색 글자
+    # 칸마다 add_annotation 을 부르면 매번 레이아웃 검증이 돌기 때문에 한 번에 설정
+    rows, cols = np.indices(counts.shape)
+    colors = np.where(normalized_data > 0.6, 'black', 'white')
+    annotations = [
+        dict(x=j, y=i, text=str(value), showarrow=False, font=dict(color=color, size=12))
+        for i, j, value, color in zip(rows.ravel().tolist(), cols.ravel().tolist(),
+                                      counts.astype('int64').ravel().tolist(), colors.ravel().tolist())
+    ]
+    
     # 레이아웃 설정
     fig.update_layout(
         plot_bgcolor='#1f1f1f',
@@ -1291,38 +1402,37 @@ def update_pie_chart(selected_country, selected_category):
             zerolinecolor='#272727',
             tickfont=dict(color='#ffffff', size=12),
             title_font=dict(size=14)
-        )
+        ),
+        annotations=annotations
     )
     
-    # 텍스트 색상 조정
-    for i in range(len(heatmap_data.index)):
-        for j in range(len(heatmap_data.columns)):
-            value = normalized_data[i][j]
-            if value > 0.6:  # 밝은 색상일 때
-                fig.add_annotation(
-                    x=j,
-                    y=i,
-                    text=str(int(heatmap_data.values[i][j])),
-                    showarrow=False,
-                    font=dict(
-                        color='black',
-                        size=12,
+    return fig
 
-                    )
-                )
-            else:  # 어두운 색상일 때
-                fig.add_annotation(
-                    x=j,
-                    y=i,
-                    text=str(int(heatmap_data.values[i][j])),
-                    showarrow=False,
-                    font=dict(
-                        color='white',
-                        size=12,
-                    )
-                )
+def build_pie_chart(df, selected_country):
+    # 데이터 필터링 ('전체'와 'LG전자' 카테고리 제외)
+    mask = ~df['category_name'].isin(['all', 'lge'])
+    if selected_country != '전체':
+        mask &= df['country_name'] == selected_country
+    filtered_df = df.loc[mask, ['time_slot', 'category_name']]
     
-    return fig
+    # 시간대별 카테고리별 동영상 수 계산 (시간대는 로드 시 계산, 데이터가 있는 시간대만)
+    heatmap_data = filtered_df.groupby(['time_slot', 'category_name'], observed=True).size().unstack(fill_value=0)
+    heatmap_data.index = heatmap_data.index.astype(str)
+    
+    # 카테고리 이름을 한글로 변환
+    heatmap_data.columns = [category_names.get(category, category) for category in heatmap_data.columns]
+    
+    return build_time_category_heatmap(heatmap_data)
+
+@app.callback(
+    Output('category-pie-chart', 'figure'),
+    [Input('country-dropdown', 'value'),
+     Input('category-dropdown', 'value')]
+)
+def update_pie_chart(selected_country, selected_category):
+    data = dataset.current()
+    return figure_cache.get_or_build('pie', (data.generation_id, selected_country),
+                                     lambda: build_pie_chart(data.df, selected_country))
 
 # 주간 인기 동영상 업데이트 콜백
 @app.callback(
@@ -1330,12 +1440,13 @@ def update_pie_chart(selected_country, selected_category):
     [Input('country-dropdown', 'value')]
 )
 def update_weekly_videos(selected_country):
+    weekly_df = dataset.current().weekly_df
     if weekly_df is None:
         return []
     
-    filtered_df = weekly_df.copy()
+    filtered_df = weekly_df[['url', 'video_id', 'title', 'channel']]
     if selected_country != '전체':
-        filtered_df = filtered_df[filtered_df['country_name'] == selected_country]
+        filtered_df = filtered_df[weekly_df['country_name'] == selected_country]
     
     return [
         html.A(
@@ -1353,7 +1464,7 @@ def update_weekly_videos(selected_country):
                 ], style=styles['videoCard'])
             ]
         )
-        for _, row in filtered_df.iterrows()  # 모든 행을 표시
+        for row in filtered_df.to_dict('records')  # 모든 행을 표시
     ]
 
 # 워드클라우드 업데이트 콜백
@@ -1365,35 +1476,17 @@ def update_weekly_videos(selected_country):
 def update_word_cloud(selected_country, selected_category):
     try:
         # 국가와 카테고리 매핑
-        country_mapping = {
-            '한국': 'KR',
-            '미국': 'US',
-            '전체': 'KR'  # 기본값
-        }
-        
-        category_mapping = {
-            'all': 'all',
-            'entertainment': 'entertainment',
-            'news': 'news',
-            'people': 'people_blogs',
-            'music': 'music',
-            'comedy': 'comedy',
-            'sports': 'sports',
-            'lge': 'lge'
-        }
-        
-        country = country_mapping.get(selected_country, 'KR')
+        country = wordcloud_country_mapping.get(selected_country, 'KR')
         category = category_mapping.get(selected_category, 'all')
         
-        print(f"Generating word cloud for country: {country}, category: {category}")
-        
-        # 워드클라우드 이미지 생성
-        img_base64 = generate_Title_WC(country, category, (350,250))  # 크기 조정
+        # 워드클라우드 이미지 조회 (캐시가 데워져 있으면 딕셔너리 조회만 수행)
+        data = dataset.current()
+        img_base64 = wordcloud_cache.title_cloud(data.generation_id, country, category, WORDCLOUD_SIZE,
+                                                 tables=data.video_tables)
         if img_base64 is None:
-            print("Word cloud generation returned None")
+            print(f"Word cloud generation returned None: {country}_{category}")
             return None
         
-        print("Word cloud generated successfully")
         return img_base64  # 이미 base64 URL이 포함되어 있으므로 그대로 반환
     except Exception as e:
         print(f"Error in update_word_cloud: {str(e)}")
@@ -1431,19 +1524,12 @@ def open_channel_link(active_cell, table_data):
     return dash.no_update
 
 # 카테고리별 통계 차트 업데이트 콜백
-@app.callback(
-    Output('category-stats-chart', 'figure'),
-    [Input('country-dropdown', 'value'),
-     Input('category-dropdown', 'value')]
-)
-def update_category_stats_chart(selected_country, selected_category):
-    # 데이터 필터링
-    filtered_df = df.copy()
+def build_category_stats_chart(df, selected_country):
+    # 데이터 필터링 (LG 전자 데이터 제외)
+    mask = df['category_name'] != 'lge'
     if selected_country != '전체':
-        filtered_df = filtered_df[filtered_df['country_name'] == selected_country]
-    
-    # LG 전자 데이터 제외
-    filtered_df = filtered_df[filtered_df['category_name'] != 'lge']
+        mask &= df['country_name'] == selected_country
+    filtered_df = df.loc[mask, ['category_name', 'views', 'likes']]
     
     # 카테고리별 통계 계산
     stats = filtered_df.groupby('category_name').agg({
@@ -1529,20 +1615,22 @@ def update_category_stats_chart(selected_country, selected_category):
     
     return fig
 
-# 시간대별 조회수 분석 그래프 업데이트 콜백 추가
 @app.callback(
-    Output('hourly-views-chart', 'figure'),
-    [Input('country-dropdown', 'value')]
+    Output('category-stats-chart', 'figure'),
+    [Input('country-dropdown', 'value'),
+     Input('category-dropdown', 'value')]
 )
-def update_hourly_views_chart(selected_country):
-    # 데이터 필터링
-    filtered_df = df.copy()
+def update_category_stats_chart(selected_country, selected_category):
+    data = dataset.current()
+    return figure_cache.get_or_build('category_stats', (data.generation_id, selected_country),
+                                     lambda: build_category_stats_chart(data.df, selected_country))
+
+# 시간대별 조회수 분석 그래프 업데이트 콜백 추가
+def build_hourly_views_chart(df, selected_country):
+    # 데이터 필터링 (게시 시간대는 로드 시 계산한 hour 컬럼 사용)
+    filtered_df = df[['hour', 'views']]
     if selected_country != '전체':
-        filtered_df = filtered_df[filtered_df['country_name'] == selected_country]
-    
-    # 게시 시간을 시간대별로 분류
-    filtered_df['published_at'] = pd.to_datetime(filtered_df['published_at'])
-    filtered_df['hour'] = filtered_df['published_at'].dt.hour
+        filtered_df = filtered_df[df['country_name'] == selected_country]
     
     # 시간대별 평균 조회수 계산
     hourly_views = filtered_df.groupby('hour')['views'].mean().reset_index()
@@ -1587,44 +1675,128 @@ def update_hourly_views_chart(selected_country):
     
     return fig
 
-
+@app.callback(
+    Output('hourly-views-chart', 'figure'),
+    [Input('country-dropdown', 'value')]
+)
+def update_hourly_views_chart(selected_country):
+    data = dataset.current()
+    return figure_cache.get_or_build('hourly_views', (data.generation_id, selected_country),
+                                     lambda: build_hourly_views_chart(data.df, selected_country))
 
 # Dash 및 Flask 구성
 server = app.server
 
-# Refresh 엔드포인트 정의
+# 다른 워커가 스냅샷을 갱신했으면 이 워커도 새 세대 빌드 예약 (확인은 몇 초에 한 번 stat 만 수행)
+@server.before_request
+def follow_snapshot():
+    dataset.refresh_if_changed()
+
+# Refresh 엔드포인트 정의 (새 세대는 백그라운드에서 빌드 후 발행)
 @server.route('/refresh', methods=['GET'])
 def refresh_data():
     print("[GET/refresh] request received")
-    global df, weekly_df, crawled_df
     try:
-        df, weekly_df = load_data()
-        crawled_df = load_crawled_data("전체", "all")
-        return "success", 200
+        dataset.refresh_async()
+        return jsonify(dataset.status()), 202
     except Exception as e:
         traceback.print_exc()
         return f"Error occurred: {str(e)}", 500
 
+# 현재 스냅샷의 모든 영상 댓글을 별도 프로세스에서 미리 요약 (/refresh 로 새 스냅샷이 발행된 뒤 호출)
+@server.route('/refresh/summaries', methods=['GET'])
+def refresh_summaries():
+    print("[GET/refresh/summaries] request received")
+    started = presummarize_async()
+    return jsonify({'started': started}), 202 if started else 409
+
+# 순위 테이블 페이지 API (keyset 커서: after_views + after_id)
+@server.route('/api/rank-page', methods=['GET'])
+def rank_page_api():
+    selected_country = request.args.get('country', '전체')
+    selected_category = request.args.get('category', 'all')
+    after_id = request.args.get('after_id')
+    after = [request.args.get('after_views', type=float), after_id] if after_id else None
+    limit = min(request.args.get('limit', PAGE_SIZE, type=int), 100)
+    
+    data = dataset.current()
+    partition = get_rank_partition(data, selected_country, selected_category)
+    rows, start = partition.page(after=after, limit=limit)
+    next_cursor = row_cursor(rows[-1]) if rows and start + len(rows) < len(partition) else None
+    return jsonify({
+        'generation': data.generation_id,
+        'start': start,
+        'total': len(partition),
+        'rows': rows,
+        'next_cursor': next_cursor
+    }), 200
+
+# 차트 figure 캐시 적중률/절약 시간 조회
+@server.route('/metrics/figure-cache', methods=['GET'])
+def figure_cache_metrics():
+    return jsonify(figure_cache.stats()), 200
+
+# 워드클라우드 캐시 적중률 조회
+@server.route('/metrics/wordcloud-cache', methods=['GET'])
+def wordcloud_cache_metrics():
+    return jsonify(wordcloud_cache.stats()), 200
+
+# 댓글 요약 작업 큐 깊이 / 요약 캐시 적중률 조회
+@server.route('/metrics/summary-jobs', methods=['GET'])
+def summary_job_metrics():
+    return jsonify({'jobs': summary_jobs.stats(), 'cache': summary_cache.stats()}), 200
+
+# 이 요청을 처리한 프로세스(워커)의 메모리 사용량 조회
+@server.route('/metrics/memory', methods=['GET'])
+def memory_metrics():
+    return jsonify(process_memory()), 200
+
+# Refresh 진행 상태 조회 (?generation=<스냅샷 manifest generation>, 생략 시 빌드 중인 요청 또는 가장 최근 요청)
+@server.route('/refresh/status', methods=['GET'])
+def refresh_status():
+    generation_id = request.args.get('generation', type=int)
+    return jsonify(dataset.status(generation_id)), 200
+
 # 서버 설정
 application = DispatcherMiddleware(app.server, {
     '/new_tab': video_app.server
 })
 
 
-# 크롤링 데이터 업데이트용 콜백
+# 유튜버 순위 회전 목록 선택 콜백 (선택 결과는 이 세션의 dcc.Store 에만 저장되므로 다른 세션에 영향 없음)
+# 새 세대는 주기적으로 확인하지 않고, 순위 페이지 응답(드롭다운 변경/페이지 이동)이 dataset-generation 을 갱신할 때 반영
 @app.callback(
-    Output('dummy-output-2', 'children'),
+    Output('youtuber-rotation', 'data'),
     [Input('country-dropdown', 'value'),
-     Input('category-dropdown', 'value')]
+     Input('category-dropdown', 'value'),
+     Input('dataset-generation', 'data')],
+    [State('youtuber-rotation', 'data')]
 )
-def update_crwaled_data(selected_country, selected_category):
-    global crawled_df
-    crawled_df = load_crawled_data(selected_country, selected_category)
-    return None
+def update_youtuber_rotation(selected_country, selected_category, known_generation, rotation):
+    data = dataset.current()
+    generation = dataset_generation_key(data)
+    if (rotation and rotation.get('generation') == generation
+            and rotation.get('country') == selected_country and rotation.get('category') == selected_category):
+        return dash.no_update
+    try:
+        rows = get_youtuber_rows(data, selected_country, selected_category)
+    except FileNotFoundError as e:
+        print(f"Error in update_youtuber_rotation: {str(e)}")
+        return dash.no_update
+    return {
+        'country': selected_country,
+        'category': selected_category,
+        'generation': generation,
+        'rows': rows
+    }
 
 
+# 개발용 서버 (운영 환경은 gunicorn -c gunicorn.conf.py wsgi:application)
 if __name__ == '__main__':
     print("[dash server] run")
+    # 리로더 부모 프로세스는 요청을 받지 않으므로 실제 서버 프로세스에서만 댓글 워드클라우드 미리 렌더링 시작
+    if is_running_from_reloader():
+        prerender_async()
     try:
         run_simple('0.0.0.0', 8050, application, use_reloader=True) 
     except Exception as e:
@@ -1,15 +1,18 @@
 import dash
-from dash import html, dcc
+from dash import html, dcc, ctx
 import dash_bootstrap_components as dbc
 from dash.dependencies import Input, Output, State
 import urllib.parse
 import pandas as pd
 import os
-import glob
 from Library.word_visualization import generate_Comments_WC
+from Library.snapshot_store import read_comments
+from Library.video_index import get_video_index
+from Library.comment_wordcloud_store import load_comment_cloud
 import math
 import base64
-from Library.comments_summarizer import summarize_youtube_comments_by_id
+from Library.comments_summarizer import cached_summary, summary_jobs
+from Library.summary_jobs import QueueFullError
 
 # 현재 스크립트의 디렉토리 경로를 가져옴
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -404,7 +407,9 @@ video_app.layout = html.Div([
                         'border': '1px solid #444',
                         'overflow': 'auto',
                         'whiteSpace': 'pre-wrap'
-                    })
+                    }),
+                    dcc.Store(id='summary-job'),  # 진행 중인 요약 작업 id
+                    dcc.Interval(id='summary-poll', interval=1000, disabled=True),  # 요약 작업 상태 조회
                 ]),
                 ],id='comments-summary', style={
                 'width': '1510px',
@@ -616,8 +621,7 @@ video_app.layout = html.Div([
         ], style={'display': 'flex', 'flexDirection': 'row', 'justifyContent': 'space-between'})
     ], style=youtube_styles['commentsTable']),
     
-    dcc.Location(id='url', refresh=False),
-    dcc.Interval(id='init-callback-trigger', interval=1000, n_intervals=0, max_intervals=1)
+    dcc.Location(id='url', refresh=False)
 ], style=youtube_styles['container'])
 
 # URL 파라미터에서 정보를 추출하고 동영상을 표시하는 콜백
@@ -670,92 +674,38 @@ def display_video(search):
             embed_url = f'https://www.youtube.com/embed/{video_id}'
 
             try:
-                # CSV 파일 경로 생성
+                # video_id 인덱스로 영상 위치를 찾고 해당 행만 읽기
+                video_index = get_video_index()
                 if country != 'all':
-                    video_file_path = os.path.join(DATA_DIR, f'{country}_{mapped_category}_video.csv')
-                    comments_file_path = os.path.join(DATA_DIR, f'{country}_{mapped_category}_comments.csv')
                     country_code = country  # country_code 초기화
                     print(f"country: {country}, category: {category}, mapped_category: {mapped_category}")  # 디버깅용
-                    print(f"video_file_path: {video_file_path}")  # 디버깅용
+                    # 비디오 테이블이 존재하는지 확인
+                    if not video_index.has_table(country_code, mapped_category):
+                        print(f"비디오 테이블이 존재하지 않습니다: {country_code}_{mapped_category}_video")  # 디버깅용
+                        return "", f"파일을 찾을 수 없습니다: {country_code}_{mapped_category}_video", country, category, "", "", "", "", "", [], "", ""
+                    record = video_index.find(video_id, country_code, mapped_category)
                 else:
-                    # 와일드카드 패턴으로 모든 국가의 비디오 파일 찾기
-                    if mapped_category == 'all':
-                        # 미국과 한국의 all_video.csv 파일을 모두 찾기
-                        video_file_paths = []
-                        for country_code in ['US', 'KR']:
-                            file_path = os.path.join(DATA_DIR, f'{country_code}_all_video.csv')
-                            if os.path.exists(file_path):
-                                video_file_paths.append(file_path)
-                    else:
-                        # 미국과 한국의 해당 카테고리 파일을 모두 찾기
-                        video_file_paths = []
-                        for country_code in ['US', 'KR']:
-                            file_path = os.path.join(DATA_DIR, f'{country_code}_{mapped_category}_video.csv')
-                            if os.path.exists(file_path):
-                                video_file_paths.append(file_path)
-                    matching_files = None
-                    
-                    # video_id와 일치하는 파일 찾기
-                    for file_path in video_file_paths:
-                        try:
-                            df = pd.read_csv(file_path)
-                            if 'id' in df.columns:
-                                matching_rows = df[df['id'] == video_id]
-                                if not matching_rows.empty:
-                                    matching_files = file_path
-                                    country_code = os.path.basename(file_path).split('_')[0]  # 파일명에서 국가 코드 추출
-                                    print(f"일치하는 파일 찾음: {matching_files}, country_code: {country_code}")  # 디버깅용
-                                    break
-                            else:
-                                print(f"'id' 컬럼이 없음: {file_path}")  # 디버깅용
-                        except Exception as e:
-                            print(f"파일 읽기 오류 {file_path}: {str(e)}")
-                            continue
-                    
-                    if not matching_files:
-                        return "", f"해당 video_id({video_id})를 찾을 수 없습니다.", country, category, "", "", "", "", "", [], "", ""
+                    # 미국과 한국의 해당 카테고리 테이블에서 video_id 찾기
+                    record = video_index.find(video_id, 'US', mapped_category) or video_index.find(video_id, 'KR', mapped_category)
+                    if record is not None:
+                        country_code = record.country
+                        print(f"일치하는 테이블 찾음: {country_code}_{mapped_category}_video, country_code: {country_code}")  # 디버깅용
 
-                    # 매칭된 파일의 국가 코드 추출 (파일명에서)
-                    video_file_path = matching_files
-                    comments_file_path = os.path.join(DATA_DIR, f'{country_code}_{mapped_category}_comments.csv')
-                
-                # 비디오 CSV 파일이 존재하는지 확인
-                if not os.path.exists(video_file_path):
-                    print(f"비디오 파일이 존재하지 않습니다: {video_file_path}")  # 디버깅용
-                    return "", f"파일을 찾을 수 없습니다: {video_file_path}", country, category, "", "", "", "", "", [], "", ""
-                    
-                # 비디오 CSV 파일 읽기
-                video_df = pd.read_csv(video_file_path)
-                # video_id와 일치하는 행 찾기
-                matching_video = video_df[video_df['id'] == video_id]
-                if matching_video.empty:
+                if record is None:
                     print(f"video_id({video_id})와 일치하는 비디오가 없습니다.")  # 디버깅용
                     return "", f"해당 video_id({video_id})를 찾을 수 없습니다.", country, category, "", "", "", "", "", [], "", ""
+                matching_video = video_index.fetch(record)
                 
-                # 댓글 CSV 파일이 존재하는지 확인
-                if not os.path.exists(comments_file_path):
-                    print(f"댓글 파일이 존재하지 않습니다: {comments_file_path}")  # 디버깅용
+                # video_id 인덱스로 해당 영상의 댓글만 읽기
+                matching_comments = read_comments(country_code, mapped_category, video_id)
+                if matching_comments is None:
+                    print(f"댓글 테이블이 존재하지 않습니다: {country_code}_{mapped_category}_comments")  # 디버깅용
                     comments_data = []
                 else:
-                    # 댓글 CSV 파일 읽기
-                    comments_df = pd.read_csv(comments_file_path,
-                        sep=None,
-                        engine='python',
-                        encoding='utf-8',
-                        on_bad_lines='skip'
-                    )
-                    
-                    print(f"댓글 CSV 컬럼: {comments_df.columns.tolist()}")  # 디버깅용
-                    print(f"댓글 데이터 샘플: {comments_df.head()}")  # 디버깅용
-                    
-                    # video_id와 일치하는 댓글 찾기
-                    matching_comments = comments_df[comments_df['video_id'] == video_id]
                     print(f"일치하는 댓글 개수: {len(matching_comments)}")  # 디버깅용
-                    print(f"매칭된 댓글 데이터: {matching_comments.head()}")  # 디버깅용
                     
                     if not matching_comments.empty:
                         comments_data = matching_comments[['comment_author', 'comment_text', 'comment_likes']].to_dict('records')
-                        print(f"최종 댓글 데이터: {comments_data[:2]}")  # 디버깅용
                     else:
                         comments_data = []
                 
@@ -809,16 +759,16 @@ def display_video(search):
     
     return "", "동영상을 찾을 수 없습니다.", "", "", "", "", "", "", "", [], "", ""
 
-# 워드 클라우드 생성용 콜백
+# 워드 클라우드 표시용 콜백 (영상 정보가 채워지면 바로 실행, 미리 렌더링된 이미지가 있으면 그대로 사용)
 @video_app.callback(
     Output('word-cloud-img', 'src'),
-    [Input('init-callback-trigger', 'n_intervals')],
-    [State('videoId-value', 'children'),
-     State('country_code', 'children'),
+    [Input('videoId-value', 'children')],
+    [State('country_code', 'children'),
      State('category-value', 'children')]
 )
-def update_word_cloud(n, video_id, selected_country , selected_category):
-    print("Update Word Cloud ", video_id, selected_country , selected_category)
+def update_word_cloud(video_id, selected_country , selected_category):
+    if not video_id:
+        return None
     try:
         category_mapping = {
             'all': 'all',
@@ -833,9 +783,14 @@ def update_word_cloud(n, video_id, selected_country , selected_category):
         
         category = category_mapping.get(selected_category, 'all')
         
+        # 배치 후 미리 렌더링해 둔 이미지 조회
+        prerendered, img_base64 = load_comment_cloud(selected_country, category, video_id)
+        if prerendered:
+            return img_base64
+        
         print(f"Generating word cloud for country: {selected_country}, category: {category}")
         
-        # 워드클라우드 이미지 생성
+        # 아직 렌더링 전이면 직접 생성
         img_base64 = generate_Comments_WC(video_id, selected_country, category)
         if img_base64 is None:
             print("Word cloud generation returned None")
@@ -857,38 +812,78 @@ def hide_button_and_fix_gauge(n_clicks):
     
     return {'display': 'none'}
 
+SUMMARY_DIV_STYLE = {
+    'display': 'block',
+    'width': '1480px',
+    'height': '50px',
+    'backgroundColor': '#1e1e1e',
+    'color': '#cccccc',
+    'fontSize': '17px',
+    'padding': '10px',
+    'borderRadius': '10px',
+    'border': '1px solid #444',
+    'overflow': 'auto',
+    'whiteSpace': 'pre-wrap'
+}
+
+def render_summary(summary, pos_score, neg_score):
+    """요약 결과를 요약문/게이지 출력값으로 변환"""
+    # 기본 스타일에서 width만 업데이트
+    red_style = gauge_styles['red-gauge'].copy()
+    blue_style = gauge_styles['blue-gauge'].copy()
+
+    # Error가 뜨는 경우는 50, 50으로 보이도록 설정
+    if pos_score == -1:
+        red_style['width'] = '50%'
+        blue_style['width'] = '50%'
+    else:
+        red_style['width']  = f'{neg_score}%'
+        blue_style['width'] = f'{pos_score}%'
+    
+    if pos_score == 50 or pos_score == -1:
+        predict_text = "중립적인 반응!"
+    elif pos_score > 50:
+        predict_text = "긍정적인 반응!"
+    else:
+        predict_text = "부정적인 반응!"
+
+    return summary, SUMMARY_DIV_STYLE, 'fixed-gauge', red_style, blue_style, predict_text
+
 # GPT 요약용 콜백
+# 클릭은 요약 작업만 등록하고 바로 반환 (API 응답을 기다리며 서버 스레드를 붙잡지 않음),
+# 이후 summary-poll 이 주기적으로 작업 상태를 조회해서 끝나면 결과를 표시하고 폴링을 멈춤
 @video_app.callback(
     [Output('summary-textbox', 'children'),
      Output('summary-textbox', 'style'),
-
      Output('sentiment-gauge', 'className'),
      Output('red-gauge', 'style'),
      Output('blue-gauge', 'style'),
-     Output('predict_percentage', 'children')],
+     Output('predict_percentage', 'children'),
+     Output('summary-job', 'data'),
+     Output('summary-poll', 'disabled')],
 
-    Input('show-summary-btn', 'n_clicks'),
+    [Input('show-summary-btn', 'n_clicks'),
+     Input('summary-poll', 'n_intervals')],
     [State('videoId-value', 'children'),
      State('country_code', 'children'),
-     State('category-value', 'children')],
+     State('category-value', 'children'),
+     State('summary-job', 'data')],
     prevent_initial_call=True
 )
-def show_summary(n_clicks, vidoe_id, country, selected_category):
+def show_summary(n_clicks, n_intervals, vidoe_id, country, selected_category, job_id):
+    pending = ("- 댓글을 요약하는 중입니다...", SUMMARY_DIV_STYLE) + (dash.no_update,) * 4
+
+    if ctx.triggered_id == 'summary-poll':
+        if job_id is None:
+            return (dash.no_update,) * 7 + (True,)
+        status = summary_jobs.status(job_id)
+        if status['state'] in ('queued', 'running'):
+            return pending + (dash.no_update, False)
+        if status['state'] == 'done':
+            return render_summary(*status['result']) + (None, True)
+        return render_summary("- 요약 실패: 작업 결과를 찾을 수 없습니다.", -1, -1) + (None, True)
+
     print("클릭 입력 감지 확인")
-    
-    div_style = {
-        'display': 'block',
-        'width': '1480px',
-        'height': '50px',
-        'backgroundColor': '#1e1e1e',
-        'color': '#cccccc',
-        'fontSize': '17px',
-        'padding': '10px',
-        'borderRadius': '10px',
-        'border': '1px solid #444',
-        'overflow': 'auto',
-        'whiteSpace': 'pre-wrap'
-    }
 
     category_mapping = {
         'all': 'all',
@@ -903,32 +898,18 @@ def show_summary(n_clicks, vidoe_id, country, selected_category):
         
     category = category_mapping.get(selected_category, 'all')
 
+    # 저장된 요약이 있으면 작업 없이 바로 표시
+    cached = cached_summary(vidoe_id, country, category)
+    if cached is not None:
+        return render_summary(*cached) + (None, True)
 
-    # 기본 스타일에서 width만 업데이트
-    red_style = gauge_styles['red-gauge'].copy()
-    blue_style = gauge_styles['blue-gauge'].copy()
-    
-    # 비율을 80:20으로 설정
-    red_style['width'] = '80%'
-    blue_style['width'] = '20%'
-    summary, pos_score, neg_score = summarize_youtube_comments_by_id(vidoe_id, country, category)
-
-    # Error가 뜨는 경우는 50, 50으로 보이도록 설정
-    if pos_score == -1:
-        red_style['width'] = '50%'
-        blue_style['width'] = '50%'
-    else:
-        red_style['width']  = f'{neg_score}%'
-        blue_style['width'] = f'{pos_score}%'
-    
-    if pos_score == 50 or pos_score == -1:
-        predict_text = "중립적인 반응!"
-    elif pos_score > 50:
-        predict_text = "긍정적인 반응!"
-    else:
-        predict_text = "부정적인 반응!"
+    try:
+        job_id = summary_jobs.submit(vidoe_id, country, category)
+    except QueueFullError as e:
+        print(f"[summary job] {e}")
+        return render_summary("- 요약 요청이 많습니다. 잠시 후 다시 시도해 주세요.", -1, -1) + (None, True)
 
-    return summary, div_style, 'fixed-gauge', red_style, blue_style, predict_text
+    return pending + (job_id, False)
 
 if __name__ == '__main__':
     video_app.run(debug=True)
\ No newline at end of file
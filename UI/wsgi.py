@@ -0,0 +1,14 @@
+"""
+운영용 WSGI 진입점 (메인 대시보드 + /new_tab 앱을 묶은 DispatcherMiddleware)
+
+실행: gunicorn -c gunicorn.conf.py wsgi:application
+
+gunicorn.conf.py 의 preload_app 으로 마스터 프로세스에서 한 번만 import 하므로
+첫 데이터셋 세대, 순위 파티션, 워드클라우드 캐시를 만든 뒤 워커를 fork 해서 copy-on-write 로 같이 씀
+(공유는 첫 /refresh 전까지, 그 뒤에는 워커마다 새 세대를 만듦 - gunicorn.conf.py 참고)
+"""
+from main import application, wordcloud_cache
+
+# 워드클라우드 미리 생성 스레드가 끝난 뒤 fork 해야 워커가 완성된 캐시를 물려받고,
+# 캐시 락을 잡은 상태로 fork 되는 일도 없음
+wordcloud_cache.wait()
@@ -6,7 +6,7 @@ import io.ktor.client.engine.cio.CIO
 import io.ktor.client.request.get
 import io.ktor.client.statement.HttpResponse
 import io.ktor.client.statement.bodyAsText
-import io.ktor.http.HttpStatusCode
+import io.ktor.http.isSuccess
 import org.slf4j.LoggerFactory
 import org.springframework.stereotype.Service
 
@@ -22,8 +22,8 @@ class HttpService {
         val client = HttpClient(CIO)
         try {
             val response: HttpResponse = client.get(dashUrl)
-            // Check if the response status is 200 OK
-            if (response.status != HttpStatusCode.OK) {
+            // Dash 는 리프레시를 백그라운드에서 처리하고 202 Accepted 를 반환
+            if (!response.status.isSuccess()) {
                 throw Exception("Unexpected response status: ${response.status}")
             }
             log.info("✅ Dash 리프레시 요청 성공: {}", response.bodyAsText())